@@ -1,9 +1,10 @@
 # app.py
 import streamlit as st
-from datetime import datetime, timedelta, timezone
+import time
 import logging
-from streamlit_gsheets import GSheetsConnection
-import pandas as pd
+from utils.game_time import kst_now, server_now
+from utils.metrics import METRICS
+from utils.startup import import_page, record_render
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
@@ -17,37 +18,26 @@ st.set_page_config(
     page_icon="⚔️"
 )
 
-# 한국 시간대
-KST = timezone(timedelta(hours=9))
-def get_kst_now():
-    return datetime.now(timezone.utc).astimezone(KST)
+# pandas/gspread 등 무거운 모듈은 페이지가 처음 필요로 할 때 import
+def load_sheet(worksheet: str, refresh: bool = False, date_range=None):
+    """워크시트 데이터 로드 (스냅샷 즉시 반환, 만료 시 백그라운드 갱신, date_range 지정 시 해당 구간만)"""
+    from utils.sheet_store import get_sheet_store
+    return get_sheet_store().get(worksheet, refresh=refresh, date_range=date_range)
 
-# Google Sheets 연결 객체 (캐시됨)
-@st.cache_resource
-def get_gsheets_conn():
-    """Google Sheets 연결 객체 반환 (싱글톤)"""
-    try:
-        return st.connection("gsheets", type=GSheetsConnection)
-    except Exception as e:
-        logger.error(f"Google Sheets 연결 실패: {e}")
-        st.error("Google Sheets 연결에 실패했습니다. 설정을 확인해주세요.")
-        return None
+def load_sheets(worksheets: list[str], refresh: bool = False, date_range=None) -> dict:
+    """여러 워크시트를 같은 시점의 데이터로 로드 (date_range 지정 시 daily는 해당 구간만)"""
+    from utils.sheet_store import get_sheet_store
+    return get_sheet_store().get_many(worksheets, refresh=refresh, date_range=date_range)
 
-# 워크시트 로드 (15분 캐시)
-@st.cache_data(ttl=900, max_entries=10, show_spinner=False)
-def load_sheet(worksheet: str) -> pd.DataFrame:
-    """워크시트 데이터 로드 (캐시됨)"""
-    try:
-        conn = get_gsheets_conn()
-        if conn is None:
-            return pd.DataFrame()
-        return conn.read(worksheet=worksheet)
-    except Exception as e:
-        logger.error(f"워크시트 '{worksheet}' 로드 실패: {e}")
-        return pd.DataFrame()
+# 메뉴 → (페이지 모듈, render 인자). 모듈은 처음 선택될 때 import
+PAGES = {
+    "대시보드": ("pages.Dashboard", (load_sheets,)),
+    "참고자료/계산기": ("pages.Calculator", (load_sheet,)),
+    "일정관리(R4)": ("pages.R4", ()),
+}
 
 # 헤더
-kst_now = get_kst_now()
+now = kst_now()
 st.title("⚔️ LAST WAR:SURVIVAL PZTK #777")
 st.markdown("**라스트워:서바이벌 PZTK #777 연맹 홈페이지** ")
 st.markdown("아직 문제가 많습니다.")
@@ -55,27 +45,22 @@ st.markdown("이용 중 문제가 있거나, 원하시는 기능이 있으시면
 col1, col2 = st.columns(2)
 
 with col1:
-    st.info(f"🕐 한국시간: {kst_now:%Y-%m-%d %H:%M:%S}")
+    st.info(f"🕐 한국시간: {now:%Y-%m-%d %H:%M:%S}")
 with col2:
-    server_now = kst_now - timedelta(hours=11)
-    st.info(f"🕐 서버시간: {server_now:%Y-%m-%d %H:%M:%S}")
+    st.info(f"🕐 서버시간: {server_now(now):%Y-%m-%d %H:%M:%S}")
 
 st.divider()
 
 # 사이드바 메뉴
-selection = st.sidebar.radio("메뉴 선택", ["대시보드", "참고자료/계산기", "일정관리(R4)"])
+selection = st.sidebar.radio("메뉴 선택", list(PAGES))
 
 # 페이지 렌더링
 try:
-    if selection == "대시보드":
-        import pages.Dashboard as dash
-        dash.render(load_sheet)
-    elif selection == "참고자료/계산기":
-        import pages.Calculator as calc
-        calc.render(load_sheet)
-    elif selection == "일정관리(R4)":
-        import pages.R4 as admin
-        admin.render()
+    module, args = PAGES[selection]
+    started = time.perf_counter()
+    with METRICS.timer("render_seconds", page=selection):
+        import_page(module).render(*args)
+    record_render(selection, time.perf_counter() - started)
 except Exception as e:
     logger.error(f"페이지 렌더링 오류: {e}")
     st.error("페이지를 불러오는 중 오류가 발생했습니다.")
@@ -91,4 +76,7 @@ st.markdown(
     </div>
     """,
     unsafe_allow_html=True
-)
\ No newline at end of file
+)
+
+# 지표 텍스트 파일 갱신 (PZTK_METRICS_FILE 설정 시)
+METRICS.write_textfile()
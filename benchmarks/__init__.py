@@ -0,0 +1,7 @@
+# benchmarks/__init__.py
+"""
+오프라인 성능 측정 모음 (Google Sheets / st.secrets 없이 실행)
+
+    python -m benchmarks.run --out bench.json
+    python -m benchmarks.compare base.json bench.json
+"""
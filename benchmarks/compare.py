@@ -0,0 +1,45 @@
+# benchmarks/compare.py
+"""
+두 벤치마크 결과 비교
+
+    python -m benchmarks.compare base.json new.json [--threshold 1.2]
+
+중앙값이 threshold배 이상 느려진 항목이 있으면 종료 코드 1.
+"""
+import argparse
+import json
+import sys
+from typing import Dict, List, Tuple
+
+def _key(result: dict) -> Tuple[str, str]:
+    params = ",".join(f"{k}={v}" for k, v in sorted(result.get("params", {}).items()))
+    return result["name"], params
+
+def _timings(path: str) -> Dict[Tuple[str, str], float]:
+    with open(path, encoding="utf-8") as f:
+        report = json.load(f)
+    return {_key(r): r["median_ms"] for r in report["results"] if "median_ms" in r}
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="벤치마크 결과 비교")
+    parser.add_argument("base")
+    parser.add_argument("new")
+    parser.add_argument("--threshold", type=float, default=1.2, help="회귀로 판단할 배율 (기본 1.2)")
+    args = parser.parse_args(argv)
+
+    base, new = _timings(args.base), _timings(args.new)
+    regressions = 0
+    print(f"{'항목':<34} {'조건':<32} {'기준(ms)':>10} {'현재(ms)':>10} {'배율':>7}")
+    for key in sorted(base.keys() | new.keys()):
+        old_ms, new_ms = base.get(key), new.get(key)
+        if old_ms is None or new_ms is None:
+            print(f"{key[0]:<34} {key[1]:<32} {old_ms or '-':>10} {new_ms or '-':>10} {'':>7}")
+            continue
+        ratio = new_ms / old_ms if old_ms > 0 else float("inf")
+        mark = " ⚠️" if ratio >= args.threshold else ""
+        regressions += bool(mark)
+        print(f"{key[0]:<34} {key[1]:<32} {old_ms:>10.2f} {new_ms:>10.2f} {ratio:>6.2f}x{mark}")
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,108 @@
+# benchmarks/fake_sheets.py
+import re
+import time
+from contextlib import contextmanager
+from typing import Dict, List
+from utils.sheets_client import SheetsClient
+
+_RANGE = re.compile(r"^'((?:[^']|'')*)'(?:!(.+))?$")
+
+def _split(a1: str):
+    """A1 범위 끝점 → (행, 열) (행/열만 있는 경우 None)"""
+    m = re.fullmatch(r"([A-Z]*)(\d*)", a1)
+    col = None
+    for ch in m[1]:
+        col = (col or 0) * 26 + ord(ch) - ord("A") + 1
+    row = int(m[2]) if m[2] else None
+    return row, col
+
+class FakeSpreadsheet:
+    """
+    values batchGet/batchUpdate와 수정 시각 조회만 흉내 내는 메모리 스프레드시트
+
+    워크시트는 헤더 포함 2차원 리스트로 보관하며 요청 수와 반환 셀 수를 기록한다.
+    revision은 쓰기마다 1씩 증가한다 (grids를 직접 고치면 touch() 호출).
+    latency(초)를 주면 요청마다 그만큼 기다린다 (동시 요청 재현용).
+    """
+
+    def __init__(self, grids: Dict[str, List[list]], latency: float = 0.0):
+        self.grids = grids
+        self.requests = 0
+        self.cells = 0
+        self.revision = 1
+        self.latency = latency
+
+    def _request(self):
+        self.requests += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    def touch(self):
+        self.revision += 1
+
+    def get_lastUpdateTime(self) -> str:
+        self._request()
+        return f"rev-{self.revision}"
+
+    def _get(self, rng: str) -> List[list]:
+        m = _RANGE.match(rng)
+        grid = self.grids.get(m[1].replace("''", "'"), [])
+        if not m[2]:
+            return grid
+        start, _, end = m[2].partition(":")
+        r1, c1 = _split(start)
+        r2, c2 = _split(end or start)
+        rows = grid[(r1 or 1) - 1:r2]
+        if c1 is None:
+            return rows
+        return [row[c1 - 1:c2] for row in rows]
+
+    def values_batch_get(self, ranges: List[str], params=None) -> dict:
+        self._request()
+        out = [self._get(rng) for rng in ranges]
+        self.cells += sum(len(row) for values in out for row in values)
+        return {"valueRanges": [{"values": values} for values in out]}
+
+    def values_batch_update(self, body: dict):
+        self._request()
+        self.touch()
+        for item in body["data"]:
+            m = _RANGE.match(item["range"])
+            grid = self.grids.setdefault(m[1].replace("''", "'"), [])
+            r1, c1 = _split(m[2].partition(":")[0])
+            for i, row in enumerate(item["values"]):
+                while len(grid) < r1 + i:
+                    grid.append([])
+                target = grid[r1 + i - 1]
+                target.extend([""] * (c1 - 1 + len(row) - len(target)))
+                target[c1 - 1:c1 - 1 + len(row)] = row
+
+class FakeSheetsClient(SheetsClient):
+    """SheetsClient와 같은 파싱 경로를 타되 원격 요청 대신 FakeSpreadsheet를 사용"""
+
+    def __init__(self, grids: Dict[str, List[list]]):
+        super().__init__({}, reads_per_minute=0, writes_per_minute=0)
+        self.sheet = FakeSpreadsheet(grids)
+
+    def spreadsheet(self):
+        return self.sheet
+
+    def write_values(self, worksheet: str, values: List[list]):
+        self.sheet.requests += 1
+        self.sheet.touch()
+        self.sheet.grids[worksheet] = [list(row) for row in values]
+
+@contextmanager
+def patched_client(client: SheetsClient):
+    """get_sheets_client를 가져다 쓰는 모듈들이 client를 사용하도록 교체"""
+    import utils.data_loader as data_loader
+    import utils.sheet_store as sheet_store
+    modules = [data_loader, sheet_store]
+    originals = [m.get_sheets_client for m in modules]
+    for m in modules:
+        m.get_sheets_client = lambda: client
+    try:
+        yield client
+    finally:
+        for m, orig in zip(modules, originals):
+            m.get_sheets_client = orig
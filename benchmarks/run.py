@@ -0,0 +1,361 @@
+# benchmarks/run.py
+"""
+오프라인 벤치마크 실행
+
+    python -m benchmarks.run --out bench.json [--quick] [--scales 1m,1y]
+
+임시 작업 폴더에서 실행하므로 저장소의 data/.cache를 건드리지 않는다.
+"""
+import argparse
+import io
+import json
+import logging
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from datetime import date, timedelta
+from typing import Callable, List
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+import pandas as pd
+import streamlit as st
+from benchmarks.fake_sheets import FakeSheetsClient, patched_client
+from benchmarks.synthetic import SCALES, schedule_grids, write_calc_workbook
+from utils.shared_cache import MemoryBackend, SharedCache
+
+CALC_SOURCE = os.path.join(REPO_ROOT, "data", "calc_data_250706.xlsx")
+CALC_FACTOR = 10
+BACKUP_SOURCE = os.path.join(REPO_ROOT, "data", "data_250628_1800.xlsx")
+# 동시 미스 재현: 세션 수와 요청당 지연 (초)
+STAMPEDE_SESSIONS = 20
+STAMPEDE_LATENCY = 0.05
+# 명단 일괄 계획 행 수
+ROSTER_ROWS = 10000
+# 공유 캐시 비교용 레플리카 수
+REPLICAS = 4
+
+class Bench:
+    """측정 결과 수집기"""
+
+    def __init__(self, repeat: int):
+        self.repeat = repeat
+        self.results: List[dict] = []
+
+    def measure(self, name: str, fn: Callable, params: dict = None, repeat: int = None, setup: Callable = None):
+        """fn을 repeat회 실행한 소요 시간(ms) 통계 기록 (setup은 매 실행 전 호출, 측정 제외)"""
+        times = []
+        for _ in range(repeat or self.repeat):
+            if setup is not None:
+                setup()
+            t0 = time.perf_counter()
+            fn()
+            times.append((time.perf_counter() - t0) * 1000)
+        result = {
+            "name": name,
+            "params": params or {},
+            "runs": len(times),
+            "min_ms": round(min(times), 3),
+            "median_ms": round(statistics.median(times), 3),
+            "mean_ms": round(statistics.fmean(times), 3),
+            "max_ms": round(max(times), 3),
+        }
+        self.results.append(result)
+        label = " ".join(f"{k}={v}" for k, v in result["params"].items())
+        print(f"{name:<32} {label:<28} median {result['median_ms']:>10.2f} ms", file=sys.stderr)
+        return result
+
+    def record(self, name: str, params: dict, **values):
+        """시간 외 지표 (요청 수, 셀 수 등) 기록"""
+        self.results.append({"name": name, "params": params, **values})
+
+@contextmanager
+def widgets(**values):
+    """bare 모드에서 위젯 값 지정 (라벨 → 값, 지정하지 않은 위젯은 기본값)"""
+    originals = {name: getattr(st, name) for name in ("selectbox", "date_input")}
+
+    def wrap(orig):
+        def widget(label, *args, **kwargs):
+            return values[label] if label in values else orig(label, *args, **kwargs)
+        return widget
+
+    for name, orig in originals.items():
+        setattr(st, name, wrap(orig))
+    try:
+        yield
+    finally:
+        for name, orig in originals.items():
+            setattr(st, name, orig)
+
+def _clear_dir(path: str):
+    shutil.rmtree(path, ignore_errors=True)
+
+def bench_dashboard(bench: Bench, scales: List[str]):
+    """Dashboard.render / 로더 / 섹션 추출 (규모별)"""
+    import pages.Dashboard as dashboard
+    from utils import data_loader, sheet_store
+    from utils import schedule_export
+    from utils.data_extract import extract_section, sort_content
+    from utils.schedule_index import SECTIONS
+
+    for scale in scales:
+        days = SCALES[scale]
+        grids = schedule_grids(days)
+        params = {"scale": scale, "rows": days}
+        today = date.today()
+        store_box = {}
+
+        def new_store():
+            _clear_dir(sheet_store.SNAPSHOT_DIR)
+            dashboard.get_schedule_index.clear()
+            dashboard.get_dashboard_view.clear()
+            store_box["store"] = sheet_store.SheetStore(
+                client.read, ttl=sheet_store.SHEET_TTL,
+                fetch_months=sheet_store._fetch_months, windowed=sheet_store.WINDOWED_SHEETS,
+                revision=client.revision
+            )
+
+        def render():
+            store = store_box["store"]
+            dashboard.render(lambda names, refresh=False, date_range=None: store.get_many(names, refresh, date_range))
+
+        client = FakeSheetsClient(grids)
+        with patched_client(client), widgets(**{"날짜 선택": today}):
+            bench.measure("dashboard.render", render, {**params, "cache": "cold"}, setup=new_store)
+            new_store()
+            render()
+            bench.measure("dashboard.render", render, {**params, "cache": "warm"})
+            # 데이터/인덱스는 캐시, 화면 데이터만 새로 계산 (다른 날짜를 처음 보는 세션)
+            bench.measure("dashboard.render", render, {**params, "cache": "view_miss"},
+                          setup=dashboard.get_dashboard_view.clear)
+
+            old_day = today - timedelta(days=days - 10)
+            with widgets(**{"날짜 선택": old_day}):
+                bench.measure("dashboard.render", render, {**params, "cache": "old_date"}, setup=new_store)
+
+            client.sheet.requests = client.sheet.cells = 0
+            new_store()
+            render()
+            bench.record("dashboard.fetch", params, requests=client.sheet.requests, cells=client.sheet.cells)
+
+            # 만료 후 갱신: 시트가 그대로면 수정 시각만 확인
+            view_range = (today, today + timedelta(days=7))
+            revalidate = lambda: store_box["store"].revalidate(dashboard.DASHBOARD_SHEETS, date_range=view_range)
+            client.sheet.requests = client.sheet.cells = 0
+            revalidate()
+            bench.record("store.revalidate", params, requests=client.sheet.requests, cells=client.sheet.cells)
+            bench.measure("store.revalidate", revalidate, {**params, "changed": "no"})
+            bench.measure("store.revalidate", revalidate, {**params, "changed": "yes"}, setup=client.sheet.touch)
+
+            # 캐시가 빈 상태에서 여러 세션이 동시에 요청 (원격 요청은 한 번으로 합쳐져야 함)
+            new_store()
+            client.sheet.requests = client.sheet.cells = 0
+            client.sheet.latency = STAMPEDE_LATENCY
+            sessions = [
+                threading.Thread(target=lambda: store_box["store"].get_many(dashboard.DASHBOARD_SHEETS, date_range=view_range))
+                for _ in range(STAMPEDE_SESSIONS)
+            ]
+            for t in sessions:
+                t.start()
+            for t in sessions:
+                t.join()
+            client.sheet.latency = 0.0
+            bench.record("store.stampede", {**params, "sessions": STAMPEDE_SESSIONS},
+                         requests=client.sheet.requests, cells=client.sheet.cells)
+
+            # 레플리카 여러 개가 동시에 콜드 스타트 (공유 캐시가 있으면 한 곳만 내려받음)
+            for backend in ("none", "memory"):
+                shared = SharedCache(MemoryBackend()) if backend == "memory" else None
+                _clear_dir(sheet_store.SNAPSHOT_DIR)
+                replicas = [
+                    sheet_store.SheetStore(client.read, ttl=sheet_store.SHEET_TTL, revision=client.revision, shared=shared)
+                    for _ in range(REPLICAS)
+                ]
+                client.sheet.requests = client.sheet.cells = 0
+                client.sheet.latency = STAMPEDE_LATENCY
+                starts = [threading.Thread(target=lambda r=r: r.get_many(dashboard.DASHBOARD_SHEETS)) for r in replicas]
+                for t in starts:
+                    t.start()
+                for t in starts:
+                    t.join()
+                client.sheet.latency = 0.0
+                bench.record("store.replicas", {**params, "replicas": REPLICAS, "shared": backend},
+                             requests=client.sheet.requests, cells=client.sheet.cells)
+
+            window = (today, today + timedelta(days=7))
+            bench.measure("data_loader.full", lambda: data_loader.load_dataframe_with_fallback("daily"), params)
+            bench.measure(
+                "data_loader.window",
+                lambda: data_loader.load_dataframe_with_fallback("daily", date_range=window),
+                params
+            )
+
+        daily = client.read_one("daily")
+        rows = [daily.iloc[[i]] for i in range(len(daily))]
+        cols = SECTIONS["event"]
+
+        def extract_all():
+            for row in rows:
+                extract_section({c: row for c in cols}, cols)
+
+        cells = [str(v) for v in daily.drop(columns="Date").to_numpy().ravel() if isinstance(v, str)]
+        bench.measure("extract_section.all_days", extract_all, params, repeat=max(1, bench.repeat // 2))
+        bench.measure("sort_content.all_cells", lambda: sort_content(cells), params)
+
+        # daily 전체 구간 내보내기 (펼치기 + ICS/CSV/채팅 텍스트)
+        frames = [daily] + [client.read_one(name) for name in ("weekly", "monthly", "note")]
+        dates = pd.to_datetime(daily["Date"]).dt.date
+        span = (dates.min(), dates.max())
+
+        def export_all():
+            expanded = schedule_export.expand_schedule(*frames, *span)
+            for write in (schedule_export.write_ics, schedule_export.write_csv):
+                write(expanded, io.StringIO())
+            schedule_export.write_digest(expanded, io.StringIO(), *span)
+
+        bench.measure("schedule_export.all_days", export_all, params)
+
+def bench_calculator(bench: Bench, workdir: str):
+    """load_calc_data / Calculator.render (모든 카테고리, 레벨 수 10배)"""
+    import pages.Calculator as calculator
+    from utils import workbook_cache
+
+    calc_dir = os.path.join(workdir, "calc")
+    os.makedirs(calc_dir, exist_ok=True)
+    write_calc_workbook(CALC_SOURCE, os.path.join(calc_dir, "calc_data_bench.xlsx"), CALC_FACTOR)
+    calculator.CALC_DATA_PATTERN = os.path.join(calc_dir, "calc_data_*.xlsx")
+    params = {"factor": CALC_FACTOR}
+
+    def warm():
+        calculator._shared_calc_data.clear()
+        calculator._calc_tables.clear()
+
+    def cold():
+        _clear_dir(workbook_cache.CACHE_DIR)
+        warm()
+
+    bench.measure("load_calc_data", calculator.load_calc_data, {**params, "cache": "cold"}, setup=cold)
+    bench.measure("load_calc_data", calculator.load_calc_data, {**params, "cache": "artifact"}, setup=warm)
+    bench.measure("load_calc_data", calculator.load_calc_data, {**params, "cache": "memory"})
+    bench.measure("load_calc_tables", calculator.load_calc_tables, {**params, "cache": "build"},
+                  setup=calculator._calc_tables.clear)
+
+    tables = calculator.load_calc_tables()
+    for choice, (key, _, _) in calculator.CATEGORIES.items():
+        values = {"카테고리 선택": choice}
+        table = tables.get(key)
+        if table is not None:
+            values.update({"현재": table.labels[0], "목표": table.labels[-1]})
+        with widgets(**values):
+            bench.measure("calculator.render", lambda: calculator.render(None), {**params, "category": key})
+
+    # 명단 일괄 계획: 멤버 100명 × 카테고리 순환, 현재/목표는 각 테이블 레벨 중 임의 구간
+    from utils.roster_plan import plan_roster, read_roster
+    rng = random.Random(0)
+    keys = list(tables)
+    rows = []
+    for i in range(ROSTER_ROWS):
+        table = tables[keys[i % len(keys)]]
+        a, b = sorted(rng.randrange(len(table.labels)) for _ in range(2))
+        rows.append((f"member{i % 100}", keys[i % len(keys)], table.labels[a], table.labels[b]))
+    roster_csv = pd.DataFrame(rows, columns=["member", "category", "current", "target"]).to_csv(index=False).encode()
+    bench.measure(
+        "roster_plan",
+        lambda: plan_roster(read_roster(roster_csv, "roster.csv"), tables, calculator.BULK_CATEGORIES),
+        {**params, "rows": ROSTER_ROWS}
+    )
+
+def bench_backup(bench: Bench):
+    """Excel 백업 폴백 (read_excel 전체 vs 스트리밍 리더)"""
+    from utils.excel_backup import ExcelBackup
+
+    sheets = ["daily", "weekly", "monthly", "note"]
+    params = {"file": os.path.basename(BACKUP_SOURCE)}
+    bench.measure(
+        "excel_backup.read",
+        lambda: [pd.read_excel(BACKUP_SOURCE, sheet_name=name) for name in sheets],
+        {**params, "reader": "read_excel"}, repeat=1
+    )
+    bench.measure(
+        "excel_backup.read",
+        lambda: [ExcelBackup(BACKUP_SOURCE).read(name) for name in sheets],
+        {**params, "reader": "stream"}
+    )
+    backup = ExcelBackup(BACKUP_SOURCE)
+    week = (date(2025, 7, 1), date(2025, 7, 7))
+    bench.measure(
+        "excel_backup.read",
+        lambda: backup.read("daily", date_col="Date", date_range=week),
+        {**params, "reader": "stream_window"}, repeat=1
+    )
+    bench.measure(
+        "excel_backup.read",
+        lambda: backup.read("daily", date_col="Date", date_range=week),
+        {**params, "reader": "memo"}
+    )
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT, stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except Exception:
+        return ""
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="PZTK 오프라인 벤치마크")
+    parser.add_argument("--out", default="-", help="결과 JSON 경로 (기본: 표준 출력)")
+    parser.add_argument("--scales", default=",".join(SCALES), help=f"daily 규모 ({', '.join(SCALES)})")
+    parser.add_argument("--repeat", type=int, default=5, help="항목별 반복 횟수")
+    parser.add_argument("--quick", action="store_true", help="1m,1y 규모만 3회씩")
+    args = parser.parse_args(argv)
+
+    scales = ["1m", "1y"] if args.quick else [s for s in args.scales.split(",") if s in SCALES]
+    bench = Bench(3 if args.quick else args.repeat)
+    out = os.path.abspath(args.out) if args.out != "-" else None
+
+    # bare 모드 경고(ScriptRunContext 누락, 폐기 예정 옵션 등) 숨김
+    logging.disable(logging.WARNING)
+
+    workdir = tempfile.mkdtemp(prefix="pztk-bench-")
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    try:
+        bench_dashboard(bench, scales)
+        bench_calculator(bench, workdir)
+        bench_backup(bench)
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "streamlit": st.__version__,
+            "repeat": bench.repeat,
+        },
+        "results": bench.results,
+    }
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if out:
+        with open(out, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        print(text)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
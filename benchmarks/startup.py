@@ -0,0 +1,119 @@
+# benchmarks/startup.py
+"""
+페이지별 콜드 스타트 측정 (페이지마다 새 인터프리터에서 import + 첫 렌더링)
+
+    python -m benchmarks.startup --out startup.json [--budget 3.0]
+
+프로세스 시작부터 첫 렌더링 완료까지의 시간이 예산을 넘는 페이지가 있으면 종료 코드 1.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from typing import List
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 측정할 진입 페이지 (app.PAGES와 같은 모듈)
+ENTRY_PAGES = ["pages.Dashboard", "pages.Calculator", "pages.R4"]
+# 페이지 import 시점에 불러오면 안 되는 모듈 (렌더링 중 실제로 필요할 때만)
+HEAVY_MODULES = ["gspread", "google.auth", "google.oauth2", "streamlit_gsheets", "openpyxl"]
+STARTUP_BUDGET = float(os.environ.get("PZTK_STARTUP_BUDGET", 3.0))
+
+def _child(module: str) -> dict:
+    """새 프로세스에서 실행: 페이지 import와 첫 렌더링 시간"""
+    import logging
+    logging.disable(logging.WARNING)
+    sys.path.insert(0, REPO_ROOT)
+
+    from utils.startup import import_page, process_age
+    base_modules = set(sys.modules)
+    t0 = time.perf_counter()
+    import streamlit  # noqa: F401  (streamlit run이 먼저 import하는 부분)
+    t1 = time.perf_counter()
+    page = import_page(module)
+    t2 = time.perf_counter()
+    at_import = set(sys.modules) - base_modules
+
+    if module == "pages.Dashboard":
+        from benchmarks.fake_sheets import FakeSheetsClient
+        from benchmarks.synthetic import schedule_grids
+        from utils.sheet_store import WINDOWED_SHEETS, SheetStore
+        client = FakeSheetsClient(schedule_grids(365))
+        store = SheetStore(
+            client.read,
+            fetch_months=lambda ws, months: client.read_months(ws, WINDOWED_SHEETS[ws], months),
+            windowed=WINDOWED_SHEETS
+        )
+        args = (lambda names, refresh=False, date_range=None: store.get_many(names, refresh, date_range),)
+    elif module == "pages.Calculator":
+        page.CALC_DATA_PATTERN = os.path.join(REPO_ROOT, page.CALC_DATA_PATTERN)
+        args = (None,)
+    else:
+        args = ()
+    page.render(*args)
+    t3 = time.perf_counter()
+
+    loaded = set(sys.modules) - base_modules
+    return {
+        "page": module,
+        "streamlit_import_s": round(t1 - t0, 4),
+        "page_import_s": round(t2 - t1, 4),
+        "first_render_s": round(t3 - t2, 4),
+        "time_to_first_render_s": round(process_age(), 4),
+        "heavy_at_import": [m for m in HEAVY_MODULES if m in at_import],
+        "heavy_at_render": [m for m in HEAVY_MODULES if m in loaded - at_import],
+        "modules_loaded": len(loaded),
+    }
+
+def measure(module: str) -> dict:
+    """페이지 하나를 새 인터프리터, 빈 작업 폴더(캐시 없음)에서 측정"""
+    with tempfile.TemporaryDirectory(prefix="pztk-startup-") as workdir:
+        out = subprocess.run(
+            [sys.executable, "-m", "benchmarks.startup", "--child", module],
+            cwd=workdir, capture_output=True, text=True,
+            env={**os.environ, "PYTHONPATH": REPO_ROOT, "PZTK_PREFETCH_INTERVAL": "0"},
+        )
+    if out.returncode != 0:
+        raise RuntimeError(f"{module} 측정 실패:\n{out.stderr[-2000:]}")
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="PZTK 페이지별 콜드 스타트 측정")
+    parser.add_argument("--out", default="-", help="결과 JSON 경로 (기본: 표준 출력)")
+    parser.add_argument("--budget", type=float, default=STARTUP_BUDGET, help="첫 렌더링까지 허용 시간(초)")
+    parser.add_argument("--repeat", type=int, default=3, help="페이지별 반복 횟수 (중앙값 사용)")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        print(json.dumps(_child(args.child)))
+        return 0
+
+    results = []
+    for module in ENTRY_PAGES:
+        runs = sorted((measure(module) for _ in range(args.repeat)), key=lambda r: r["time_to_first_render_s"])
+        result = {**runs[len(runs) // 2], "runs": len(runs), "budget_s": args.budget}
+        result["within_budget"] = result["time_to_first_render_s"] <= args.budget and not result["heavy_at_import"]
+        results.append(result)
+        print(
+            f"{module:<20} 첫 렌더링까지 {result['time_to_first_render_s']:.2f}s "
+            f"(import {result['page_import_s']:.2f}s, 렌더링 {result['first_render_s']:.2f}s) "
+            f"{'✅' if result['within_budget'] else '⚠️'} {','.join(result['heavy_at_import'])}",
+            file=sys.stderr
+        )
+
+    text = json.dumps({"meta": {"python": sys.version.split()[0], "budget_s": args.budget}, "results": results},
+                      ensure_ascii=False, indent=2)
+    if args.out != "-":
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        print(text)
+    return 0 if all(r["within_budget"] for r in results) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
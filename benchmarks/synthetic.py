@@ -0,0 +1,84 @@
+# benchmarks/synthetic.py
+import random
+from datetime import date, timedelta
+from typing import Dict, List
+import pandas as pd
+
+# 규모별 daily 행 수 (일)
+SCALES = {"1m": 30, "1y": 365, "3y": 1095, "10y": 3650}
+
+DAILY_COLS = [
+    "notice_daily", "schedule_daily", "train_daily", "excercise_daily",
+    "zombie_daily", "duel_daily", "event_daily", "pakage_daily",
+]
+WEEKLY_COLS = ["notice_weekly", "schedule_weekly", "duel_weekly", "event_weekly", "package_weekly", "R45_weekly"]
+MONTHLY_COLS = ["notice_monthly", "schedule_monthly", "duel_monthly", "event_monthly", "package_monthly", "manage_monthly"]
+NOTE_COLS = ["notice_contd", "schedule_contd", "duel_contd", "event_contd", "package_contd", "R45_contd"]
+
+_WORDS = ["열차", "좀비 공성", "군사훈련", "사막전", "연맹대결", "드론", "영웅", "패키지", "집결", "보상"]
+
+def _text(rng: random.Random, lines: int) -> str:
+    return "\n".join(
+        f"{rng.choice(_WORDS)} {rng.choice(_WORDS)} ({rng.randint(0, 23):02d}시)"
+        for _ in range(lines)
+    )
+
+def _cell(rng: random.Random, fill: float):
+    return _text(rng, rng.randint(1, 3)) if rng.random() < fill else ""
+
+def schedule_grids(days: int, end: date = None, seed: int = 777) -> Dict[str, List[list]]:
+    """
+    daily/weekly/monthly/note 워크시트 (values API 형식: 헤더 포함 2차원 리스트)
+
+    daily는 end(기본: 오늘 + 30일)까지 하루 1행, 셀 약 30%가 채워진다.
+    """
+    rng = random.Random(seed)
+    end = end or date.today() + timedelta(days=30)
+    start = end - timedelta(days=days - 1)
+    daily = [["Date"] + DAILY_COLS] + [
+        [(start + timedelta(days=i)).isoformat()] + [_cell(rng, 0.3) for _ in DAILY_COLS]
+        for i in range(days)
+    ]
+    weekly = [["weekday"] + WEEKLY_COLS] + [[d] + [_cell(rng, 0.8) for _ in WEEKLY_COLS] for d in range(1, 8)]
+    monthly = [["mod(weeknum,4)"] + MONTHLY_COLS] + [[w] + [_cell(rng, 0.5) for _ in MONTHLY_COLS] for w in range(4)]
+    note = [[""] + NOTE_COLS, ["변동사항"] + [_cell(rng, 0.5) for _ in NOTE_COLS]]
+    return {"daily": daily, "weekly": weekly, "monthly": monthly, "note": note}
+
+def _scale_sheet(df: pd.DataFrame, lvl_cols: List[str], factor: int) -> pd.DataFrame:
+    """헤더 행(0행)은 그대로 두고 데이터 행을 factor배로 늘림 (레벨은 이어지는 값/접미사로 구분)"""
+    header, body = df.iloc[:1], df.iloc[1:]
+    blocks = [header]
+    for b in range(factor):
+        block = body.copy()
+        for col in lvl_cols:
+            if col not in block.columns or b == 0:
+                continue
+            levels = pd.to_numeric(block[col], errors="coerce")
+            if levels.notna().all():
+                block[col] = levels + b * (int(levels.max()) + 1)
+            else:
+                block[col] = block[col].astype(str) + f"#{b}"
+        blocks.append(block)
+    return pd.concat(blocks, ignore_index=True)
+
+def write_calc_workbook(src: str, dst: str, factor: int = 10):
+    """계산기 워크북의 모든 시트를 레벨 수 factor배로 늘려 저장"""
+    from pages.Calculator import CATEGORIES
+    lvl_by_sheet: Dict[str, List[str]] = {}
+    with pd.ExcelFile(src) as xl:
+        sheets = {name: xl.parse(name) for name in xl.sheet_names}
+    for key, lvl_col, _ in CATEGORIES.values():
+        lvl_by_sheet.setdefault(key, []).append(lvl_col)
+
+    with pd.ExcelWriter(dst) as writer:
+        for name, df in sheets.items():
+            key = next((k for k in lvl_by_sheet if name == k or name.startswith(f"{k}_")), None)
+            lvl_cols = lvl_by_sheet.get(key, []) + [
+                c for c in df.columns if str(c).lower().endswith(("_lvl", "_level"))
+            ]
+            if key == "bdg":
+                lvl_cols = ["bdg_lvl"]
+            elif key == "hq":
+                lvl_cols = ["hq_lvl"]
+            scaled = _scale_sheet(df, list(dict.fromkeys(lvl_cols)), factor)
+            scaled.to_excel(writer, sheet_name=name, index=False)
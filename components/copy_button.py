@@ -1,7 +1,80 @@
 # components/copy_button.py
 
+import html
+import inspect
+import json
+import uuid
 import streamlit as st
 
-def render_copy_button(text: str):
-    """Copy to clipboard button"""
-    st.button("Copy All", on_click=lambda: st.experimental_set_query_params(_clipboard=text))
+COPY_BUTTON_HEIGHT = 48
+
+# st.html(unsafe_allow_javascript=True)가 있으면 iframe 없이 페이지에 바로 삽입 (components.v1.html은 제거 예정)
+_INLINE = "unsafe_allow_javascript" in inspect.signature(getattr(st, "html", lambda body: None)).parameters
+
+# 브라우저에서만 동작 (클릭해도 서버 rerun 없음). Clipboard API가 막힌 환경은 textarea + execCommand로 대체
+# iframe이 아니므로 스타일/요소 id는 버튼마다 고유하게, 스크립트는 전역 이름을 남기지 않도록 함수로 감쌈
+_TEMPLATE = """
+<style>
+  #{uid}-copy {{
+    padding: 0.4rem 0.9rem; border-radius: 0.5rem; cursor: pointer; font-size: 1rem;
+    font-family: "Source Sans Pro", sans-serif;
+    border: 1px solid rgba(49, 51, 63, 0.2); background: #fff; color: rgb(49, 51, 63);
+  }}
+  #{uid}-copy:hover {{ border-color: #ff4b4b; color: #ff4b4b; }}
+  #{uid}-status {{ margin-left: 0.6rem; font-size: 0.9rem; font-family: "Source Sans Pro", sans-serif; }}
+</style>
+<button id="{uid}-copy">{label}</button><span id="{uid}-status" role="status"></span>
+<script>
+(() => {{
+  const text = {text};
+  const button = document.getElementById("{uid}-copy");
+  const status = document.getElementById("{uid}-status");
+  if (!button || !status) return;
+
+  function fallback() {{
+    const area = document.createElement("textarea");
+    area.value = text;
+    area.style.position = "fixed";
+    area.style.opacity = "0";
+    document.body.appendChild(area);
+    area.select();
+    const ok = document.execCommand("copy");
+    document.body.removeChild(area);
+    return ok;
+  }}
+
+  function done(ok) {{
+    status.textContent = ok ? "{copied}" : "{failed}";
+    setTimeout(() => {{ status.textContent = ""; }}, 2000);
+  }}
+
+  button.addEventListener("click", () => {{
+    if (navigator.clipboard && window.isSecureContext) {{
+      navigator.clipboard.writeText(text).then(() => done(true), () => done(fallback()));
+    }} else {{
+      done(fallback());
+    }}
+  }});
+}})();
+</script>
+"""
+
+def render_copy_button(text: str, label: str = "Copy All"):
+    """
+    클립보드 복사 버튼 (텍스트는 렌더링 시 한 번 포함, 복사는 브라우저에서만 처리)
+    """
+    # JSON 문자열로 넣고 </script> 조기 종료를 막기 위해 '</'를 이스케이프
+    payload = json.dumps(text, ensure_ascii=False).replace("</", "<\\/")
+    body = _TEMPLATE.format(
+        uid=f"pztk-{uuid.uuid4().hex[:8]}",
+        label=html.escape(label),
+        text=payload,
+        copied="✅ 복사됨",
+        failed="⚠️ 복사 실패 - 미리보기에서 직접 복사하세요",
+    )
+    if _INLINE:
+        st.html(body, unsafe_allow_javascript=True)
+        return
+    # 구버전 Streamlit: iframe 컴포넌트로 표시
+    import streamlit.components.v1 as components
+    components.html(f"<style>body {{ margin: 0; }}</style>{body}", height=COPY_BUTTON_HEIGHT)
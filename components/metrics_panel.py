@@ -0,0 +1,59 @@
+# components/metrics_panel.py
+
+import streamlit as st
+import pandas as pd
+from utils.metrics import METRICS, RENDER_SLO_SECONDS
+
+def _table(df: pd.DataFrame, sort_by: str):
+    if df.empty:
+        st.caption("기록 없음")
+        return
+    st.dataframe(df.sort_values(sort_by, ascending=False).round(1), use_container_width=True, hide_index=True)
+
+def render_metrics_panel():
+    """성능 지표 패널 (R4 관리자 전용)"""
+    renders = METRICS.histograms("render_seconds")
+    if not renders.empty:
+        slo_ms = RENDER_SLO_SECONDS * 1000
+        renders["SLO"] = ["✅" if p95 <= slo_ms else "⚠️" for p95 in renders["p95_ms"]]
+    st.markdown(f"**페이지 렌더링** (p95 목표 {RENDER_SLO_SECONDS:g}초)")
+    _table(renders, "p95_ms")
+
+    st.markdown("**로더 호출**")
+    loads = METRICS.histograms("load_seconds")
+    if not loads.empty:
+        label_cols = ["loader", "sheet"]
+        for name, col in (("load_rows_total", "rows"), ("load_bytes_total", "bytes"), ("load_errors_total", "errors")):
+            values = METRICS.values(name)
+            if values.empty:
+                loads[col] = 0
+                continue
+            loads = loads.merge(values.rename(columns={"value": col}), on=label_cols, how="left")
+        loads[["rows", "bytes", "errors"]] = loads[["rows", "bytes", "errors"]].fillna(0).astype(int)
+    _table(loads, "p95_ms")
+
+    st.markdown("**캐시 조회**")
+    caches = METRICS.values("cache_requests_total")
+    if not caches.empty:
+        caches = caches.pivot_table(index=["cache", "key"], columns="result", values="value", fill_value=0).reset_index()
+        ages = METRICS.values("cache_age_seconds", gauge=True)
+        if not ages.empty:
+            caches = caches.merge(ages.rename(columns={"value": "age_s"}), on=["cache", "key"], how="left")
+        caches.columns.name = None
+    _table(caches, "cache")
+
+    st.markdown("**구간별 소요 시간**")
+    _table(METRICS.histograms("stage_seconds"), "p95_ms")
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.download_button(
+            "⬇️ Prometheus 텍스트",
+            METRICS.to_prometheus(),
+            file_name="pztk_metrics.prom",
+            mime="text/plain"
+        )
+    with col2:
+        if st.button("🧹 지표 초기화"):
+            METRICS.reset()
+            st.rerun()
@@ -1,14 +1,36 @@
 # pages/Calculator.py
 
+import os
 import streamlit as st  # type: ignore
 import pandas as pd
+from utils.calc_tables import RangeTable, build_range_table, range_cost
+from utils.fragments import panel
+from utils.metrics import METRICS, cache_probe, mark_miss
+from utils.shared_cache import get_shared_cache
+from utils.shared_frames import freeze_all, views
+from utils.workbook_cache import find_latest_workbook, load_workbook_sheets
 
-@st.cache_data(ttl=900)
-def load_calc_data() -> dict[str, pd.DataFrame]:
+CALC_DATA_PATTERN = "data/calc_data_*.xlsx"
+
+def calc_data_version() -> tuple:
+    """Newest calc workbook and its (mtime, size); changes whenever the file is replaced."""
+    file_path = find_latest_workbook(CALC_DATA_PATTERN)
+    if file_path is None:
+        return (None, 0, 0)
+    stat = os.stat(file_path)
+    return (file_path, stat.st_mtime_ns, stat.st_size)
+
+@st.cache_resource(max_entries=2, show_spinner=False)
+def _shared_calc_data(version: tuple) -> dict[str, pd.DataFrame]:
     """
-    Load all sheets from calc_data_250706.xlsx.
+    Load all sheets of one workbook version once per process.
+    Row 0 (Korean display names) moves to attrs['labels'] so level/resource
+    columns get compact numeric dtypes; the frames are frozen and shared.
+    Unchanged sheets come from the compiled artifact cache; the workbook is
+    parsed at most once, and only for the sheets whose source changed.
     """
-    file_path = "data/calc_data_250706.xlsx"
+    mark_miss("calc_data")
+    file_path = version[0]
     sheet_map = {
         "hq":                 "hq_requirements",
         "bdg":                "bdg",
@@ -22,22 +44,65 @@ def load_calc_data() -> dict[str, pd.DataFrame]:
         "overlord_skill":     "overlord_skill",
         "overlord_bond":      "overlord_bond",
     }
+    if file_path is None:
+        st.error(f"❌ 계산기 데이터 파일을 찾을 수 없습니다: {CALC_DATA_PATTERN}")
+        return {key: pd.DataFrame() for key in sheet_map}
+
+    frames, errors = load_workbook_sheets(
+        file_path,
+        sheet_map,
+        options={"bdg": {"converters": {"time_hms": str}}},
+        compact={"header_row": True, "categories": True},
+        shared=get_shared_cache()
+    )
     data: dict[str, pd.DataFrame] = {}
     for key, sheet in sheet_map.items():
+        if key in errors:
+            st.error(f"❌ '{sheet}' 시트 로드 실패: {errors[key]}")
+        data[key] = frames.get(key, pd.DataFrame())
+    return freeze_all(data)
+
+def load_calc_data() -> dict[str, pd.DataFrame]:
+    """
+    Zero-copy views of the shared calc data for the newest workbook.
+    Writing to a view copies only that column; the shared frames never change.
+    """
+    return views(_shared_calc_data(calc_data_version()))
+
+CATEGORIES: dict[str, tuple[str, str, list[str]]] = {
+    "🏰 본부 업그레이드 조건": ("hq",   "hq_lvl",                    []),
+    "🏗️ 건물 자원/시간":       ("bdg",  "bdg_lvl",                  []),
+    "⚙️ 장비 제작":            ("gear", "Gear_names",              ["coins","ores","ceramics","yellow_blueprint","red_blueprint"]),
+    "🚁 드론 업그레이드":       ("drone", "drone_level",             ["drone_parts"]),
+    "영웅 경험치":            ("hero_exp",          "hero_lvl",            ["hero_exp"]),
+    "영웅 스킬훈장":          ("hero_skill",        "hero_skill_lvl",      ["hero_skill_medal"]),
+    "영웅 전속무기":          ("hero_weapon",       "hero_weapon_lvl",     ["hero_weapon_shard"]),
+    "오버로드 특수훈련":       ("overlord_training","overlord_training_lvl",["guidebook","certificates"]),
+    "오버로드 레벨/조각":     ("overlord_exp",      "overlord_lvl",        ["overlord_shard"]),
+    "오버로드 스킬 메달":     ("overlord_skill",     "overlord_skill_lvl",  ["overlord_skill_medal"]),
+    "오버로드 친밀도 뱃지":   ("overlord_bond",     "overlord_bond_name",  ["overlord_bond_badge"]),
+}
+
+@st.cache_resource(max_entries=2, show_spinner=False)
+def _calc_tables(version: tuple) -> dict[str, RangeTable]:
+    mark_miss("calc_tables")
+    data = _shared_calc_data(version)
+    tables: dict[str, RangeTable] = {}
+    for key, lvl_col, val_cols in CATEGORIES.values():
+        df = data.get(key, pd.DataFrame())
+        if not val_cols or df.empty:
+            continue
         try:
-            if key == "bdg":
-                df = pd.read_excel(
-                    file_path,
-                    sheet_name=sheet,
-                    converters={"time_hms": str}
-                )
-            else:
-                df = pd.read_excel(file_path, sheet_name=sheet)
-            data[key] = df
+            tables[key] = build_range_table(df, lvl_col, val_cols)
         except Exception as e:
-            st.error(f"❌ '{sheet}' 시트 로드 실패: {e}")
-            data[key] = pd.DataFrame()
-    return data
+            st.error(f"❌ '{key}' 누적합 테이블 생성 실패: {e}")
+    return tables
+
+def load_calc_tables() -> dict[str, RangeTable]:
+    """
+    Prefix-sum tables for every level-range category in load_calc_data.
+    """
+    return _calc_tables(calc_data_version())
 
 def format_resource(val):
     try:
@@ -53,26 +118,161 @@ def format_resource(val):
     else:
         return f"{int(x):,}"
 
+# Display name → category key for every level-range category (bulk planner input)
+BULK_CATEGORIES: dict[str, str] = {name: key for name, (key, _, cols) in CATEGORIES.items() if cols}
+
+@st.cache_data(max_entries=4, show_spinner=False)
+def _bulk_plan(data: bytes, name: str, version: tuple):
+    """Plan one uploaded roster against one workbook version (reruns reuse the result)."""
+    from utils.roster_plan import plan_roster, read_roster
+    with METRICS.timer("stage_seconds", stage="roster_plan"):
+        return plan_roster(read_roster(data, name), _calc_tables(version), BULK_CATEGORIES)
+
+def render_bulk_planner(tables: dict[str, RangeTable]):
+    """
+    Alliance-wide planning: upload (member, category, current, target) rows,
+    get per-member and alliance totals in one vectorized pass, download the result.
+    """
+    from utils.roster_plan import STATUS_OK, roster_template, to_csv_bytes
+
+    st.caption(
+        "명단 파일(CSV/Excel)의 각 행: member(멤버), category(카테고리), current(현재), target(목표). "
+        "카테고리는 아래 키 또는 화면의 카테고리 이름을 사용합니다: "
+        + ", ".join(f"`{key}`" for key in tables)
+    )
+    st.download_button(
+        "📄 업로드 양식 받기", roster_template(tables),
+        file_name="roster_template.csv", mime="text/csv"
+    )
+    upload = st.file_uploader("명단 업로드", type=["csv", "xlsx"])
+    if upload is None:
+        return
+
+    try:
+        plan = _bulk_plan(upload.getvalue(), upload.name, calc_data_version())
+    except ValueError as e:
+        st.error(f"❌ 명단을 읽을 수 없습니다: {e}")
+        return
+    except Exception as e:
+        st.error(f"❌ 명단 계산 실패: {e}")
+        return
+
+    ok = int((plan.rows["status"] == STATUS_OK).sum())
+    st.write(f"전체 {len(plan.rows):,}행 중 {ok:,}행 계산 · 멤버 {len(plan.members):,}명")
+
+    st.subheader("🏰 연맹 전체 합계")
+    cols = st.columns(min(4, max(1, len(plan.resources))))
+    for i, res in enumerate(plan.resources):
+        cols[i % len(cols)].metric(res.replace("_", " ").title(), format_resource(plan.totals[res]))
+
+    st.subheader("👤 멤버별 합계")
+    st.dataframe(plan.members, use_container_width=True)
+
+    issues = plan.issues
+    if not issues.empty:
+        with st.expander(f"⚠️ 계산하지 못한 행 {len(issues):,}개"):
+            st.dataframe(issues[["member", "category", "current", "target", "status"]], use_container_width=True)
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.download_button(
+            "⬇️ 멤버별 합계 (CSV)", to_csv_bytes(plan.members, index=True),
+            file_name="roster_members.csv", mime="text/csv"
+        )
+    with col2:
+        st.download_button(
+            "⬇️ 행별 상세 (CSV)", to_csv_bytes(plan.rows),
+            file_name="roster_rows.csv", mime="text/csv"
+        )
+
+@panel("계산기/건물")
+def render_bdg(df: pd.DataFrame):
+    """Building cost/time panel; a slider or building change reruns only this panel."""
+    col1, col2 = st.columns(2)
+    with col1:
+        bld = st.selectbox("건물 종류", sorted(df["Buildings"].unique()))
+        lvls = sorted(df[df["Buildings"] == bld]["bdg_lvl"].astype(int).tolist())
+        lvl = st.selectbox("건물 레벨", lvls)
+    with col2:
+        rss_buff = st.slider("자원감소(%)", min_value=0.0, max_value=30.0, value=0.0, step=0.1)
+        time_buff = st.slider("건설가속(%)", min_value=100, max_value=400, value=100, step=1)
+
+    row = df[(df["Buildings"] == bld) & (df["bdg_lvl"] == lvl)].squeeze()
+    days = int(row["time_day"])
+    hms = row["time_hms"]
+
+    def parse_time(days, hms):
+        try:
+            h, m, s = map(int, hms.split(':'))
+        except Exception:
+            h, m, s = 0, 0, 0
+        total_minutes = days * 24 * 60 + h * 60 + m + s / 60
+        return int(total_minutes)
+
+    def format_time(total_minutes):
+        days = total_minutes // (24 * 60)
+        rem = total_minutes % (24 * 60)
+        hours = rem // 60
+        minutes = rem % 60
+        return f"{days}일 {hours}시간 {minutes}분"
+
+    min0 = parse_time(days, hms)
+    min1 = min0 / (time_buff * 0.01)
+    iron_buff = row['Iron'] * (1 - rss_buff * 0.01)
+    food_buff = row['Food'] * (1 - rss_buff * 0.01)
+    coins_buff = row['Coins'] * (1 - rss_buff * 0.01)
+
+    col3, col4 = st.columns(2)
+    with col3:
+        st.write("버프 미적용")
+        st.metric("철",   format_resource(row['Iron']))
+        st.metric("식량", format_resource(row['Food']))
+        st.metric("금화", format_resource(row['Coins']))
+        st.metric("소요 시간", format_time(min0))
+    with col4:
+        st.write("버프 적용 후")
+        st.metric("철",   format_resource(iron_buff))
+        st.metric("식량", format_resource(food_buff))
+        st.metric("금화", format_resource(coins_buff))
+        st.metric("소요 시간", format_time(int(min1)))
+
+@panel("계산기/구간")
+def render_range(key: str, table: RangeTable, val_cols: list[str]):
+    """Current → target cost panel; a level change reruns only this panel."""
+    options = table.labels
+    curr = st.selectbox("현재", options, index=0, key=f"{key}_curr")
+    tgt  = st.selectbox("목표", options, index=1, key=f"{key}_tgt")
+
+    # Positions in the prefix-sum table
+    i_curr = table.positions[curr]
+    i_tgt  = table.positions[tgt]
+    if i_tgt < i_curr:
+        st.error("목표 값이 현재 값보다 낮습니다." if table.ordinal else "목표 레벨이 현재 레벨보다 낮습니다.")
+        return
+
+    # Sum calculation: cumsum[tgt] - cumsum[curr], None if data is not ready
+    need = range_cost(table, i_curr, i_tgt)
+    if need is None:
+        st.error("해당 구간의 데이터가 준비되지 않았습니다")
+        return
+
+    for col in val_cols:
+        st.metric(col.replace("_"," ").title(), format_resource(need[col]))
+
 def render(_load_sheet):
     st.title("📊 참고자료/계산기")
-    data = load_calc_data()
-
-    categories: dict[str, tuple[str, str, list[str]]] = {
-        "🏰 본부 업그레이드 조건": ("hq",   "hq_lvl",                    []),
-        "🏗️ 건물 자원/시간":       ("bdg",  "bdg_lvl",                  []),
-        "⚙️ 장비 제작":            ("gear", "Gear_names",              ["coins","ores","ceramics","yellow_blueprint","red_blueprint"]),
-        "🚁 드론 업그레이드":       ("drone", "drone_level",             ["drone_parts"]),
-        "영웅 경험치":            ("hero_exp",          "hero_lvl",            ["hero_exp"]),
-        "영웅 스킬훈장":          ("hero_skill",        "hero_skill_lvl",      ["hero_skill_medal"]),
-        "영웅 전속무기":          ("hero_weapon",       "hero_weapon_lvl",     ["hero_weapon_shard"]),
-        "오버로드 특수훈련":       ("overlord_training","overlord_training_lvl",["guidebook","certificates"]),
-        "오버로드 레벨/조각":     ("overlord_exp",      "overlord_lvl",        ["overlord_shard"]),
-        "오버로드 스킬 메달":     ("overlord_skill",     "overlord_skill_lvl",  ["overlord_skill_medal"]),
-        "오버로드 친밀도 뱃지":   ("overlord_bond",     "overlord_bond_name",  ["overlord_bond_badge"]),
-    }
+    with cache_probe("calc_data"):
+        data = load_calc_data()
+    with cache_probe("calc_tables"):
+        tables = load_calc_tables()
 
-    choice = st.selectbox("카테고리 선택", list(categories.keys()))
-    key, lvl_col, val_cols = categories[choice]
+    mode = st.radio("계산 방식", ["개별 계산", "명단 일괄 계획"], horizontal=True)
+    if mode == "명단 일괄 계획":
+        render_bulk_planner(tables)
+        return
+
+    choice = st.selectbox("카테고리 선택", list(CATEGORIES.keys()))
+    key, lvl_col, val_cols = CATEGORIES[choice]
     df = data.get(key, pd.DataFrame())
 
     if df.empty:
@@ -82,92 +282,17 @@ def render(_load_sheet):
     # 1. HQ upgrade requirements
     if choice == "🏰 본부 업그레이드 조건":
         st.subheader("🏰 본부 업그레이드 조건 전체 데이터")
-        st.dataframe(df, use_container_width=True)
+        st.dataframe(df.rename(columns=df.attrs.get("labels", {})), use_container_width=True)
         return
 
     # 2. BDG (building resources/time)
     if choice == "🏗️ 건물 자원/시간":
-        col1, col2 = st.columns(2)
-        with col1:
-            bld = st.selectbox("건물 종류", sorted(df["Buildings"].unique()))
-            lvls = sorted(df[df["Buildings"] == bld]["bdg_lvl"].astype(int))
-            lvl = st.selectbox("건물 레벨", lvls)
-        with col2:
-            rss_buff = st.slider("자원감소(%)", min_value=0.0, max_value=30.0, value=0.0, step=0.1)
-            time_buff = st.slider("건설가속(%)", min_value=100, max_value=400, value=100, step=1)
-
-        row = df[(df["Buildings"] == bld) & (df["bdg_lvl"] == lvl)].squeeze()
-        days = int(row["time_day"])
-        hms = row["time_hms"]
-
-        def parse_time(days, hms):
-            try:
-                h, m, s = map(int, hms.split(':'))
-            except Exception:
-                h, m, s = 0, 0, 0
-            total_minutes = days * 24 * 60 + h * 60 + m + s / 60
-            return int(total_minutes)
-
-        def format_time(total_minutes):
-            days = total_minutes // (24 * 60)
-            rem = total_minutes % (24 * 60)
-            hours = rem // 60
-            minutes = rem % 60
-            return f"{days}일 {hours}시간 {minutes}분"
-
-        min0 = parse_time(days, hms)
-        min1 = min0 / (time_buff * 0.01)
-        iron_buff = row['Iron'] * (1 - rss_buff * 0.01)
-        food_buff = row['Food'] * (1 - rss_buff * 0.01)
-        coins_buff = row['Coins'] * (1 - rss_buff * 0.01)
-
-        col3, col4 = st.columns(2)
-        with col3:
-            st.write("버프 미적용")
-            st.metric("철",   format_resource(row['Iron']))
-            st.metric("식량", format_resource(row['Food']))
-            st.metric("금화", format_resource(row['Coins']))
-            st.metric("소요 시간", format_time(min0))
-        with col4:
-            st.write("버프 적용 후")
-            st.metric("철",   format_resource(iron_buff))
-            st.metric("식량", format_resource(food_buff))
-            st.metric("금화", format_resource(coins_buff))
-            st.metric("소요 시간", format_time(int(min1)))
+        render_bdg(df)
         return
 
     # 3. Gear upgrade or other level-sum categories
-    options = df[lvl_col].tolist()
-    curr = st.selectbox("현재", options, index=0, key=f"{key}_curr")
-    tgt  = st.selectbox("목표", options, index=1, key=f"{key}_tgt")
-
-    # Determine masks
-    if df[lvl_col].dtype == object:
-        i_curr = options.index(curr)
-        i_tgt  = options.index(tgt)
-        if i_tgt < i_curr:
-            st.error("목표 값이 현재 값보다 낮습니다.")
-            return
-        mask_curr   = df.index <= i_curr
-        mask_tgt    = df.index <= i_tgt
-        mask_between= df.index.isin(range(i_curr+1, i_tgt+1))
-    else:
-        c, t = int(curr), int(tgt)
-        if t < c:
-            st.error("목표 레벨이 현재 레벨보다 낮습니다.")
-            return
-        mask_curr   = df[lvl_col].astype(int) <= c
-        mask_tgt    = df[lvl_col].astype(int) <= t
-        mask_between= (df[lvl_col].astype(int) > c) & (df[lvl_col].astype(int) <= t)
-
-    # Check data readiness
-    if mask_between.sum() == 0 or df.loc[mask_between, val_cols].astype(str).isin(["-1",""]).any().any():
-        st.error("해당 구간의 데이터가 준비되지 않았습니다")
+    table = tables.get(key)
+    if table is None:
+        st.warning(f"{choice} 데이터가 없습니다.")
         return
-
-    # Sum calculation: sum(0~tgt) - sum(0~curr)
-    for col in val_cols:
-        sum_tgt  = df.loc[mask_tgt,   col].astype(float).sum()
-        sum_curr = df.loc[mask_curr,  col].astype(float).sum()
-        need     = sum_tgt - sum_curr
-        st.metric(col.replace("_"," ").title(), format_resource(need))
+    render_range(key, table, val_cols)
@@ -2,8 +2,15 @@
 
 import streamlit as st  # type: ignore
 import pandas as pd
-from datetime import datetime, timedelta, timezone
-from utils.data_extract import extract_section, format_content_display
+import time
+from datetime import date, timedelta
+from utils.dashboard_view import DashboardView, build_dashboard_view
+from utils.data_extract import frames_version
+from utils.fragments import panel
+from utils.game_time import game_day as current_game_day
+from utils.metrics import METRICS, cache_probe, mark_miss
+from utils.schedule_index import build_schedule_index
+from utils.sheet_store import format_age
 from components.copy_button import render_copy_button
 import logging
 
@@ -11,168 +18,111 @@ import logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# 한국 시간대
-KST = timezone(timedelta(hours=9))
-
-def kst_now() -> datetime:
-    return datetime.now(timezone.utc).astimezone(KST)
-
-def safe_extract_section(df_map: dict, cols: list, name: str) -> list:
-    """안전한 섹션 추출"""
-    try:
-        return extract_section(df_map, cols)
-    except Exception as e:
-        logger.error(f"{name} 추출 오류: {e}")
-        return [f"{name} 데이터 없음"]
-
-def render_section(title: str, lines: list, icon: str):
+@st.cache_resource(max_entries=4, show_spinner=False)
+def get_schedule_index(version: str, _daily, _weekly, _monthly, _note) -> dict:
+    """날짜별 일정 인덱스 (데이터 버전별 캐시)"""
+    mark_miss("schedule_index")
+    with METRICS.timer("stage_seconds", stage="schedule_index_build"):
+        return build_schedule_index(_daily, _weekly, _monthly, _note)
+
+# 세션 간 공유하는 화면 데이터 수 (선택일 × 데이터 버전, 오래 안 쓴 것부터 제거)
+DASHBOARD_VIEW_ENTRIES = 32
+
+@st.cache_resource(max_entries=DASHBOARD_VIEW_ENTRIES, show_spinner=False)
+def get_dashboard_view(version: str, game_day: date, _frames: tuple) -> DashboardView:
+    """
+    선택일의 대시보드 화면 데이터 ((데이터 버전, 날짜)별 캐시)
+
+    같은 날짜를 보는 세션은 계산 없이 조회만 하며, 동시에 처음 요청해도 한 번만 계산된다.
+    """
+    mark_miss("dashboard_view")
+    index = get_schedule_index(version, *_frames)
+    with METRICS.timer("stage_seconds", stage="dashboard_view_build"):
+        return build_dashboard_view(index, game_day)
+
+def render_section(view: DashboardView, key: str):
     """섹션 렌더링"""
+    title, icon, lines = view.sections[key]
     st.subheader(title)
-    if lines and "데이터 없음" not in lines[0]:
-        for line in format_content_display(lines, icon):
+    if lines is not None:
+        for line in lines:
             st.markdown(line)
     else:
         st.markdown(f"{icon} {title}이(가) 없습니다.")
 
-def render(load_sheet):
+DASHBOARD_SHEETS = ["daily", "weekly", "monthly", "note"]
+
+def render(load_sheets):
     """대시보드 페이지 렌더링"""
-    try:
-        st.title("🏠 대시보드")
+    st.title("🏠 대시보드")
+    render_day(load_sheets)
 
-        # 날짜 선택
-        now = kst_now()
-        default_day = (now - timedelta(days=1)).date() if now.hour < 11 else now.date()
-        game_day = st.date_input("날짜 선택", value=default_day, key="dashboard_date")
+@panel("대시보드/날짜")
+def render_day(load_sheets):
+    """날짜 선택 + 선택일 화면 (날짜 변경/새로고침은 이 영역만 다시 실행)"""
+    try:
+        # 날짜 선택 (기본: 현재 게임 날짜, KST 11시 전이면 전날)
+        game_day = st.date_input("날짜 선택", value=current_game_day(), key="dashboard_date")
 
-        # 데이터 로드
+        # 데이터 로드 (daily는 선택일 ~ 7일 후가 걸친 월만)
+        window = (game_day, game_day + timedelta(days=7))
         with st.spinner("📊 데이터 로딩 중..."):
-            daily = load_sheet("daily")
-            weekly = load_sheet("weekly")
-            monthly = load_sheet("monthly")
-            note = load_sheet("note")
+            sheets = load_sheets(DASHBOARD_SHEETS, date_range=window)
+            daily, weekly, monthly, note = (sheets[name] for name in DASHBOARD_SHEETS)
 
             if not any(df.empty for df in [daily, weekly, monthly, note]):
                 st.success("✅ 모든 데이터 로드 완료")
             else:
                 st.warning("⚠️ 일부 데이터 로드 실패 - 사용 가능한 데이터로 진행")
 
-        # 날짜 기반 필터링
-        daily["Date"] = pd.to_datetime(daily["Date"])
-        wd = game_day.isoweekday()
-        wi = (game_day.isocalendar().week - 1) % 4
-        d_daily = daily[daily["Date"] == pd.Timestamp(game_day)]
-        d_weekly = weekly[weekly["weekday"] == wd] if "weekday" in weekly.columns else pd.DataFrame()
-        d_monthly = monthly[monthly["mod(weeknum,4)"] == wi] if "mod(weeknum,4)" in monthly.columns else pd.DataFrame()
-
-        # 섹션별 데이터 추출
-        notice = safe_extract_section(
-            {"notice_weekly": d_weekly, "notice_daily": d_daily, "notice_contd": note},
-            ["notice_weekly", "notice_daily", "notice_contd"], "공지사항"
-        )
-        schedule = safe_extract_section(
-            {"schedule_weekly": d_weekly, "schedule_daily": d_daily, "schedule_contd": note},
-            ["schedule_weekly", "schedule_daily", "schedule_contd"], "일정"
-        )
-        duel = safe_extract_section(
-            {"duel_weekly": d_weekly, "duel_daily": d_daily, "duel_contd": note},
-            ["duel_weekly", "duel_daily", "duel_contd"], "연맹대결"
-        )
-        event = safe_extract_section(
-            {"event_weekly": d_weekly, "event_daily": d_daily, "event_contd": note, "event_monthly": d_monthly},
-            ["event_weekly", "event_daily", "event_contd", "event_monthly"], "이벤트"
-        )
-        package = safe_extract_section(
-            {"package_weekly": d_weekly, "package_daily": d_daily, "package_contd": note, "package_monthly": d_monthly},
-            ["package_weekly", "package_daily", "package_contd", "package_monthly"], "패키지"
-        )
+        # 데이터 기준 시각 (가장 오래된 워크시트 기준)
+        frames = [daily, weekly, monthly, note]
+        fetched = [df.attrs["fetched_at"] for df in frames if "fetched_at" in df.attrs]
+        if fetched:
+            sources = {df.attrs.get("source") for df in frames}
+            source = "Excel 백업" if "excel" in sources else "로컬 스냅샷" if "snapshot" in sources else "Google Sheets"
+            st.caption(f"🕒 데이터 기준: {format_age(time.time() - min(fetched))} ({source})")
+
+        # 선택일 화면 데이터 (인덱스/캘린더/복사 텍스트를 세션 간 공유)
+        with cache_probe("dashboard_view", str(game_day)):
+            view = get_dashboard_view(frames_version(daily, weekly, monthly, note), game_day, tuple(frames))
 
         # 2x2 그리드 레이아웃
         col1, col2 = st.columns(2)
         with col1:
-            render_section("📢 공지사항", notice, "📣")
+            render_section(view, "notice")
         with col2:
-            render_section("📅 오늘 일정", schedule, "⏰")
+            render_section(view, "schedule")
 
         col3, col4 = st.columns(2)
         with col3:
-            render_section("⚔️ 연맹대결", duel, "🏆")
+            render_section(view, "duel")
         with col4:
-            render_section("📜 이벤트", event, "🎯")
-            render_section("💰 패키지", package, "💰")
+            render_section(view, "event")
+            render_section(view, "package")
 
         st.divider()
 
         # 향후 7일 캘린더 
         st.subheader("📅 다음 7일 일정")
-        weekday_kr = ["월", "화", "수", "목", "금", "토", "일"]
-        dates = [game_day + timedelta(days=i) for i in range(1, 8)]
-
-        # 7일을 1행으로 배치
-        calendar_data = []
-        week_data = []
-        
-        for idx, fd in enumerate(dates):
-            df_f = daily[daily["Date"] == pd.Timestamp(fd)]
-            wd2 = fd.isoweekday()
-            wi2 = (fd.isocalendar().week - 1) % 4
-            df_w = weekly[weekly["weekday"] == wd2] if "weekday" in weekly.columns else pd.DataFrame()
-            df_m = monthly[monthly["mod(weeknum,4)"] == wi2] if "mod(weeknum,4)" in monthly.columns else pd.DataFrame()
-
-            items = []
-            def add_item(label, key, df_src):
-                lines = safe_extract_section({key: df_src}, [key], key)
-                if lines and "데이터 없음" not in lines[0]:
-                    items.extend(f"{label}: {line}" for line in lines if line.strip())
-
-            # 한글 라벨로 출력
-            add_item("일정", "schedule_daily", df_f)
-            add_item("일정", "schedule_weekly", df_w)
-            add_item("일정", "schedule_monthly", df_m)
-            add_item("공지", "notice_daily", df_f)
-            add_item("열차", "train_daily", df_f)
-            add_item("훈련", "excercise_daily", df_f)
-
-            header = f"{fd:%m/%d}({weekday_kr[fd.weekday()]})"
-            content = "\n".join(items) if items else "-"
-            week_data.append(f"**{header}**\n{content}")
-
-        calendar_data.append(week_data)
-
-        # DataFrame으로 표 생성
-        cal_df = pd.DataFrame(
-            calendar_data,
-            index=weekday_kr,
-            columns=["다음 주"]
-        )
-        st.dataframe(cal_df, use_container_width=True)
-        st.divider()
-
-
+        st.dataframe(view.calendar, use_container_width=True)
         st.divider()
 
         # 전체 내용 복사
         st.subheader("📋 전체 내용 복사")
-        all_parts = []
-        for title, lines, icon in [
-            ("공지사항", notice, "📢"),
-            ("오늘 일정", schedule, "📅"),
-            ("연맹대결", duel, "⚔️"),
-            ("이벤트", event, "📜"),
-            ("패키지", package, "💰")
-        ]:
-            if lines and "데이터 없음" not in lines[0]:
-                all_parts += [f"{icon} {title}"] + lines + [""]
-
-        all_text = "\n".join(all_parts) or "복사할 내용이 없습니다."
-        render_copy_button(all_text)
+        render_copy_button(view.all_text)
 
         with st.expander("📄 복사 내용 미리보기"):
-            st.text(all_text)
+            st.text(view.all_text)
 
-        # 새로고침 버튼
-        if st.button("🔄 데이터 새로고침"):
-            st.cache_data.clear()
-            st.rerun()
+        # 새로고침 버튼 (선택한 워크시트만 다시 로드, 다른 캐시는 유지)
+        col5, col6 = st.columns([1, 3])
+        with col5:
+            target = st.selectbox("새로고침 대상", ["전체"] + DASHBOARD_SHEETS, key="dashboard_refresh_target")
+        with col6:
+            if st.button("🔄 데이터 새로고침"):
+                load_sheets(DASHBOARD_SHEETS if target == "전체" else [target], refresh=True, date_range=window)
+                st.rerun(scope="fragment")
 
     except Exception as e:
         logger.error(f"Dashboard 렌더링 오류: {e}")
@@ -181,5 +131,5 @@ def render(load_sheet):
             st.code(str(e))
 
 if __name__ == "__main__":
-    render(lambda x: pd.DataFrame())
+    render(lambda names, refresh=False, date_range=None: {name: pd.DataFrame() for name in names})
 
@@ -6,7 +6,8 @@ import hashlib
 import time
 import logging
 from datetime import datetime, timedelta, timezone
-from streamlit_gsheets import GSheetsConnection # type: ignore
+from utils.sheets_client import get_sheets_client
+from components.metrics_panel import render_metrics_panel
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -19,16 +20,6 @@ def verify_password(password: str, hashed: str) -> bool:
     """입력 비밀번호와 해시 비교"""
     return hash_password(password) == hashed
 
-@st.cache_resource
-def get_gsheets_conn():
-    """st.connection으로 GSheetsConnection 객체 반환"""
-    try:
-        return st.connection("gsheets", type=GSheetsConnection)
-    except Exception as e:
-        logger.error(f"Google Sheets 연결 실패: {e}")
-        st.error("Google Sheets 연결에 실패했습니다. 설정을 확인하세요.")
-        return None
-
 def check_session_timeout(minutes: int = 30) -> bool:
     """관리자 세션 타임아웃 검사"""
     if "r4_login_time" in st.session_state:
@@ -88,9 +79,18 @@ def render():
             st.session_state.pop("r4_login_time", None)
             st.rerun()
 
-    # Google Sheets 연결
-    conn = get_gsheets_conn()
-    if conn is None:
+    # 성능 지표 (프로세스 내 집계)
+    with st.expander("📈 성능 지표"):
+        render_metrics_panel()
+
+    # Google Sheets 연결 (공용 클라이언트, gspread는 로그인 후에만 import)
+    from utils.sheet_diff import plan_save, saved_frame
+    from utils.write_queue import get_write_queue
+    try:
+        client = get_sheets_client()
+    except Exception as e:
+        logger.error(f"Google Sheets 연결 실패: {e}")
+        st.error("Google Sheets 연결에 실패했습니다. 설정을 확인하세요.")
         return
 
     # 워크시트 선택
@@ -100,34 +100,213 @@ def render():
         index=1
     )
 
-    # 시트 로드
-    try:
-        df = conn.read(worksheet=worksheet)
-    except Exception as e:
-        st.error(f"워크시트 로드 실패: {e}")
-        logger.error(f"워크시트 '{worksheet}' 로드 오류: {e}")
-        return
-    if worksheet == "daily" and "Date" in df.columns:
-        # 어제 날짜 계산
-        game_day = (datetime.now() - timedelta(days=1)).date()
-        # 날짜 컬럼을 datetime으로 변환
-        df["Date"] = pd.to_datetime(df["Date"]).dt.date
-        # game_day(-1day) 행 추출
-        mask = df["Date"] == game_day
+    # 시트 로드 (편집 기준 버전은 저장/다시 불러오기 전까지 세션에 유지)
+    loaded_sheets = st.session_state.setdefault("r4_loaded", {})
+    queue = get_write_queue()
+    render_write_queue(queue)
+    waiting = queue.pending(worksheet)
+    if waiting:
+        st.caption(f"⏳ '{worksheet}' 저장 {waiting}건이 아직 반영 중입니다. 지금 다시 불러오면 반영 전 내용이 보일 수 있습니다.")
+    if st.button("🔄 다시 불러오기"):
+        loaded_sheets.pop(worksheet, None)
+    if worksheet not in loaded_sheets:
+        try:
+            loaded_sheets[worksheet] = (client.read_one(worksheet), time.time())
+        except Exception as e:
+            st.error(f"워크시트 로드 실패: {e}")
+            logger.error(f"워크시트 '{worksheet}' 로드 오류: {e}")
+            return
+    loaded, loaded_at = loaded_sheets[worksheet]
+    work = working_copy(worksheet, loaded, loaded_at)
 
     st.subheader(f"📋 '{worksheet}' 편집")
-    # 데이터프레임 편집 UI
-    edited_df = st.data_editor(
-        df,
+    # 필터/페이지는 서버에서 적용하고 편집기에는 현재 페이지만 전달
+    page_base = render_page_filters(worksheet, work)
+    edited_page = st.data_editor(
+        page_base,
         num_rows="dynamic",
         use_container_width=True,
-        key="gsheet_editor"
+        key=f"gsheet_editor_{worksheet}_{loaded_at}_{work['gen']}"
     )
-    # 변경사항 저장
+    # 페이지를 옮기거나 저장할 때 전체 작업본에 합침
+    work["page"] = (page_base, edited_page)
+
+    # 변경사항 저장 (모든 페이지의 편집을 합쳐 변경된 셀만 대기열에 접수, 반영은 백그라운드에서.
+    # 로드 이후 같은 행이 수정되었으면 반영 시점에 중단되고 대기열에 충돌로 표시)
     if st.button("✅ 변경사항 저장"):
         try:
-            conn.update(worksheet=worksheet, data=edited_df)
-            st.success("변경사항이 Google Sheets에 저장되었습니다!")
+            commit_page(worksheet)
+            df, edited_df = work["base"], work["frame"]
+            plan = plan_save(loaded, df, edited_df)
+            if plan.empty:
+                st.info("변경된 내용이 없습니다.")
+            else:
+                queue.submit(worksheet, plan.to_dict())
+                # 다음 편집은 이 저장이 반영된 내용을 기준으로 (대기열이 순서대로 반영).
+                # 낙관적 사본은 이 세션에만 두고, 대시보드 캐시는 시트 반영이 확정된 뒤 갱신됨
+                loaded_sheets[worksheet] = (saved_frame(loaded, df, edited_df), time.time())
+                st.toast("변경사항이 저장 대기열에 접수되었습니다. 잠시 후 Google Sheets에 반영됩니다.", icon="✅")
+                st.rerun()
         except Exception as e:
             st.error(f"저장 실패: {e}")
-            logger.error(f"Google Sheets 업데이트 오류: {e}")
+            logger.error(f"저장 접수 오류 ('{worksheet}'): {e}")
+
+PAGE_SIZES = [25, 50, 100, 200]
+# daily 기본 표시 기간 (게임 날짜부터 일수)
+DEFAULT_PERIOD_DAYS = 7
+
+def working_copy(worksheet: str, loaded: pd.DataFrame, loaded_at: float) -> dict:
+    """
+    워크시트 편집 작업본 (세션별, 다시 불러오거나 저장하면 새로 만듦)
+
+    base: 편집 기준 (daily는 Date를 날짜로 변환), frame: 모든 페이지 편집을 합친 전체,
+    gen: 합칠 때마다 증가 (편집기 키), page: 마지막으로 표시한 (페이지 원본, 편집 결과)
+    """
+    works = st.session_state.setdefault("r4_work", {})
+    work = works.get(worksheet)
+    if work is None or work["loaded_at"] != loaded_at:
+        base = loaded.copy()
+        if worksheet == "daily" and "Date" in base.columns:
+            base["Date"] = pd.to_datetime(base["Date"]).dt.date
+        work = works[worksheet] = {
+            "loaded_at": loaded_at, "base": base, "frame": base, "gen": 0, "page": None, "dates": None,
+        }
+    return work
+
+def commit_page(worksheet: str, first_page: bool = False):
+    """
+    마지막으로 표시한 페이지의 편집을 작업본에 합침 (필터/페이지 위젯 변경 시 콜백)
+
+    first_page=True면 첫 페이지로 이동 (필터가 바뀐 경우)
+    """
+    from utils.sheet_diff import merge_page
+    if first_page:
+        st.session_state[f"r4_page_{worksheet}"] = 1
+    work = st.session_state.get("r4_work", {}).get(worksheet)
+    if not work or work["page"] is None:
+        return
+    page_base, page_edited = work["page"]
+    work["page"] = None
+    if page_edited.equals(page_base):
+        return
+    work["frame"] = merge_page(work["frame"], page_base, page_edited)
+    work["dates"] = None
+    # 편집기 상태(행 위치 기준 변경분)를 새 입력에 다시 적용하지 않도록 키 교체
+    work["gen"] += 1
+
+def filter_rows(frame: pd.DataFrame, dates: pd.Series, period, keyword: str, columns: list) -> pd.Index:
+    """기간/검색어에 맞는 행 라벨 (기간은 (시작, 끝) 또는 None)"""
+    mask = pd.Series(True, index=frame.index)
+    if period is not None:
+        start, end = pd.Timestamp(period[0]), pd.Timestamp(period[-1])
+        mask &= dates.between(start, end)
+    if keyword:
+        hits = pd.Series(False, index=frame.index)
+        for col in columns:
+            hits |= frame[col].astype(str).str.contains(keyword, case=False, regex=False, na=False)
+        mask &= hits
+    return frame.index[mask.to_numpy()]
+
+def render_page_filters(worksheet: str, work: dict) -> pd.DataFrame:
+    """기간/검색어/컬럼/페이지 선택 후 편집기에 넘길 현재 페이지"""
+    frame = work["frame"]
+    all_cols = list(frame.columns)
+    has_date = worksheet == "daily" and "Date" in all_cols
+    changed = {"on_change": commit_page, "args": (worksheet,)}
+    refiltered = {"on_change": commit_page, "args": (worksheet, True)}
+
+    col1, col2, col3 = st.columns([2, 2, 3])
+    period = None
+    if has_date:
+        with col1:
+            game_day = (datetime.now() - timedelta(days=1)).date()
+            all_dates = st.checkbox("전체 기간", value=False, key=f"r4_all_{worksheet}", **refiltered)
+            picked = st.date_input(
+                "기간", value=(game_day, game_day + timedelta(days=DEFAULT_PERIOD_DAYS - 1)),
+                key=f"r4_period_{worksheet}", disabled=all_dates, **refiltered
+            )
+            if not all_dates and picked:
+                period = picked if isinstance(picked, (list, tuple)) else (picked,)
+    with col2:
+        keyword = st.text_input("검색어", key=f"r4_keyword_{worksheet}", **refiltered).strip()
+    with col3:
+        columns = st.multiselect("표시할 컬럼", all_cols, default=all_cols, key=f"r4_cols_{worksheet}", **changed)
+    columns = columns or all_cols
+
+    if has_date and work["dates"] is None:
+        work["dates"] = pd.to_datetime(frame["Date"], errors="coerce")
+    rows = filter_rows(frame, work["dates"], period, keyword, columns)
+
+    col4, col5, col6 = st.columns([1, 1, 3])
+    with col4:
+        size = st.selectbox("페이지 크기", PAGE_SIZES, index=1, key=f"r4_size_{worksheet}", **refiltered)
+    pages = max(1, -(-len(rows) // size))
+    page_key = f"r4_page_{worksheet}"
+    if st.session_state.setdefault(page_key, 1) > pages:
+        st.session_state[page_key] = pages
+    with col5:
+        page = st.number_input("페이지", min_value=1, max_value=pages, step=1, key=page_key, **changed)
+    start = (int(page) - 1) * size
+    shown = rows[start:start + size]
+    with col6:
+        st.caption(
+            f"전체 {len(frame):,}행 중 조건에 맞는 {len(rows):,}행 · "
+            f"{start + 1 if len(shown) else 0:,}–{start + len(shown):,}행 표시 · 페이지 {int(page)}/{pages}"
+        )
+    if work["gen"]:
+        st.caption("✏️ 저장하지 않은 편집이 있습니다. 다른 페이지의 편집도 저장할 때 함께 반영됩니다.")
+    return frame.loc[shown, columns]
+
+STATUS_LABELS = {
+    "pending": "⏳ 대기",
+    "retrying": "🔁 재시도 대기",
+    "conflict": "⚠️ 충돌",
+    "failed": "❌ 실패",
+    "held": "⏸️ 보류",
+}
+
+def render_write_queue(queue):
+    """저장 대기열 현황 (미반영/충돌/실패 저장과 최근 반영 내역)"""
+    jobs = queue.jobs()
+    stuck = [j for j in jobs if j.status in ("conflict", "failed")]
+    held = set(queue.blocked())
+    label = f"📤 저장 대기열 ({len(jobs)}건)" if jobs else "📤 저장 대기열"
+    with st.expander(label, expanded=bool(stuck)):
+        if not jobs:
+            st.caption("반영 대기 중인 저장이 없습니다.")
+        for job in jobs:
+            col1, col2, col3 = st.columns([6, 1, 1])
+            with col1:
+                created = time.strftime("%H:%M:%S", time.localtime(job.created_at))
+                kind = "전체" if job.full else f"{len(job.plan.get('updates', []))}개 범위"
+                status = "held" if job.id in held else job.status
+                line = f"{STATUS_LABELS.get(status, status)} · `{job.worksheet}` · {created} · {kind}"
+                if job.attempts:
+                    line += f" · 시도 {job.attempts}회"
+                st.markdown(line)
+                if job.status == "retrying":
+                    st.caption(f"다음 시도 {time.strftime('%H:%M:%S', time.localtime(job.next_try))} · {job.last_error}")
+                elif job.last_error:
+                    st.caption(job.last_error)
+                elif job.id in held:
+                    st.caption("앞선 저장이 충돌/실패해 반영을 멈췄습니다 (앞 저장을 처리하면 이어서 반영)")
+            if job.status in ("conflict", "failed"):
+                with col2:
+                    if st.button("다시 시도", key=f"wq_retry_{job.id}"):
+                        queue.retry(job.id)
+                        st.rerun()
+            if job.status in ("conflict", "failed") or job.id in held:
+                with col3:
+                    if st.button("취소", key=f"wq_discard_{job.id}"):
+                        queue.discard(job.id)
+                        st.rerun()
+        if stuck:
+            st.warning(
+                "충돌/실패한 저장은 Google Sheets에 반영되지 않았고, 같은 워크시트의 뒤 저장도 보류됩니다. "
+                "'다시 시도'하거나 '취소'한 뒤 '🔄 다시 불러오기'로 최신 내용을 확인하세요."
+            )
+        recent = queue.recent()
+        if recent:
+            st.caption("최근 반영: " + ", ".join(
+                f"{j.worksheet} {time.strftime('%H:%M:%S', time.localtime(j.done_at))}" for j in recent[:5]
+            ))
@@ -0,0 +1,115 @@
+# scripts/export_schedule.py
+"""
+일정 내보내기 (Streamlit 없이 실행)
+
+    python -m scripts.export_schedule --start 2025-06-01 --days 365 --format ics --out season.ics
+    python -m scripts.export_schedule --days 1 --format digest          # 오늘 채팅용 텍스트 (표준 출력)
+
+daily + weekly + monthly + note를 날짜 구간 전체에 한 번에 펼쳐 ICS/CSV/채팅 텍스트로 쓴다.
+데이터는 Google Sheets(.streamlit/secrets.toml) → 로컬 스냅샷 → Excel 백업 순으로 읽는다.
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+import tomllib
+from datetime import date, timedelta
+from typing import Dict, List
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+import pandas as pd
+from utils.excel_backup import BACKUP_EXCEL_PATH, read_backup
+from utils.game_time import game_day
+from utils.schedule_export import expand_schedule, write_csv, write_digest, write_ics
+from utils.sheet_store import load_snapshot
+from utils.sheets_client import SheetsClient
+
+SHEETS = ["daily", "weekly", "monthly", "note"]
+SOURCES = ["auto", "sheets", "snapshot", "excel"]
+FORMATS = {"ics": ".ics", "csv": ".csv", "digest": ".txt"}
+SECRETS_PATH = os.path.join(REPO_ROOT, ".streamlit", "secrets.toml")
+
+logger = logging.getLogger("export_schedule")
+
+def _from_sheets(secrets_path: str) -> Dict[str, pd.DataFrame]:
+    with open(secrets_path, "rb") as f:
+        config = tomllib.load(f)["connections"]["gsheets"]
+    return SheetsClient(config).read(SHEETS)
+
+def load_frames(source: str, secrets_path: str = SECRETS_PATH, backup_path: str = BACKUP_EXCEL_PATH) -> Dict[str, pd.DataFrame]:
+    """워크시트 4개 로드 (auto는 시트별로 Sheets → 스냅샷 → Excel 순 폴백)"""
+    frames: Dict[str, pd.DataFrame] = {}
+    if source in ("auto", "sheets"):
+        try:
+            frames = _from_sheets(secrets_path)
+        except Exception as e:
+            if source == "sheets":
+                raise
+            logger.warning(f"Google Sheets 로드 실패: {e}")
+
+    for name in SHEETS:
+        df = frames.get(name)
+        if (df is None or df.empty) and source in ("auto", "snapshot"):
+            df = load_snapshot(name)
+        if (df is None or df.empty) and source in ("auto", "excel"):
+            df = read_backup(name, path=backup_path)
+        if df is None:
+            raise FileNotFoundError(f"'{name}' 데이터를 찾을 수 없습니다 (source={source})")
+        frames[name] = df
+    return frames
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="PZTK 일정 내보내기 (ICS/CSV/채팅 텍스트)")
+    parser.add_argument("--start", type=date.fromisoformat, help="시작일 YYYY-MM-DD (기본: 오늘 게임일)")
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--end", type=date.fromisoformat, help="종료일 YYYY-MM-DD (포함)")
+    group.add_argument("--days", type=int, default=7, help="시작일부터 일 수 (기본 7)")
+    parser.add_argument("--format", choices=list(FORMATS), default="digest", help="출력 형식 (기본 digest)")
+    parser.add_argument("--out", default="-", help=f"출력 경로 (기본: 표준 출력, 확장자 예: {', '.join(FORMATS.values())})")
+    parser.add_argument("--source", choices=SOURCES, default="auto", help="데이터 출처 (기본 auto)")
+    parser.add_argument("--secrets", default=SECRETS_PATH, help="Google Sheets 설정 secrets.toml")
+    parser.add_argument("--backup", default=BACKUP_EXCEL_PATH, help="Excel 백업 경로")
+    parser.add_argument("--calendar-name", default="PZTK #777 일정", help="ICS 캘린더 이름")
+    parser.add_argument("--include-empty", action="store_true", help="digest: 일정이 없는 날도 출력")
+    args = parser.parse_args(argv)
+
+    # bare 모드 경고(ScriptRunContext 누락 등) 숨김
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    logging.getLogger("streamlit").setLevel(logging.ERROR)
+
+    start = args.start or game_day()
+    end = args.end or start + timedelta(days=max(1, args.days) - 1)
+    if end < start:
+        parser.error("종료일이 시작일보다 빠릅니다")
+
+    try:
+        frames = load_frames(args.source, args.secrets, args.backup)
+    except Exception as e:
+        logger.error(f"데이터 로드 실패: {e}")
+        return 1
+
+    t0 = time.perf_counter()
+    expanded = expand_schedule(*(frames[name] for name in SHEETS), start, end)
+
+    out = sys.stdout if args.out == "-" else open(args.out, "w", encoding="utf-8", newline="")
+    try:
+        if args.format == "ics":
+            count = f"{write_ics(expanded, out, name=args.calendar_name)}개 일정"
+        elif args.format == "csv":
+            write_csv(expanded, out)
+            count = f"{int(expanded['section'].ne('calendar').sum())}줄"
+        else:
+            count = f"{write_digest(expanded, out, start, end, skip_empty=not args.include_empty)}일"
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    logger.info(f"{start}~{end} {args.format} 내보내기 완료: {count} ({(time.perf_counter() - t0) * 1000:.0f} ms)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
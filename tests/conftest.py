@@ -0,0 +1,11 @@
+# tests/conftest.py
+import logging
+import os
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+# bare 모드 경고(ScriptRunContext 누락 등) 숨김
+logging.getLogger("streamlit").setLevel(logging.ERROR)
@@ -0,0 +1,71 @@
+# tests/test_calc_tables.py
+import itertools
+import numpy as np
+import pandas as pd
+import pytest
+from utils.calc_tables import MISSING_MARKERS, build_range_table, range_cost, range_costs
+
+VAL_COLS = ["coins", "ores"]
+
+def ordinal_sheet():
+    # 장비 이름처럼 시트 순서가 곧 레벨 순서 ("-1"/빈 문자열: 데이터 미준비, NaN: 빈 셀)
+    return pd.DataFrame({
+        "name": ["T1", "T2", "T3", "T4", "T5", "T6", "T7"],
+        "coins": [100, 200, "-1", 400, 500, np.nan, 700],
+        "ores": [10, 20, 30, "", 50, 60, 70],
+    })
+
+def numeric_sheet():
+    # 숫자 레벨: 시트 순서가 뒤섞여 있고 같은 레벨이 여러 행에 걸침
+    return pd.DataFrame({
+        "lvl": [3, 1, 2, 3, 5, 4, 6, 7],
+        "coins": [30, 10, 20, 35, 50, -1, 60, 70],
+        "ores": [3, 1, 2, 4, 5, 6, np.nan, 7],
+    })
+
+def baseline_cost(df, lvl_col, curr, tgt):
+    """기존 계산기: (현재, 목표] 행을 직접 잘라 합산. 계산할 수 없으면 None"""
+    levels = df[lvl_col]
+    if levels.dtype == object:
+        options = levels.tolist()
+        between = df.index.isin(range(options.index(curr) + 1, options.index(tgt) + 1))
+    else:
+        between = (levels > curr) & (levels <= tgt)
+    rows = df.loc[between, VAL_COLS]
+    if len(rows) == 0 or rows.astype(str).isin(MISSING_MARKERS).any().any():
+        return None
+    return {col: rows[col].astype(float).sum() for col in VAL_COLS}
+
+@pytest.mark.parametrize("sheet, lvl_col", [(ordinal_sheet, "name"), (numeric_sheet, "lvl")])
+def test_range_cost_matches_row_slice_sum(sheet, lvl_col):
+    df = sheet()
+    table = build_range_table(df, lvl_col, VAL_COLS)
+    assert table.ordinal == (lvl_col == "name")
+
+    for curr, tgt in itertools.product(table.labels, repeat=2):
+        expected = baseline_cost(df, lvl_col, curr, tgt)
+        got = range_cost(table, table.positions[curr], table.positions[tgt])
+        assert got == (pytest.approx(expected) if expected else None), (curr, tgt)
+
+def test_range_cost_flags_missing_rows_only_inside_range():
+    table = build_range_table(ordinal_sheet(), "name", VAL_COLS)
+    pos = table.positions
+    assert range_cost(table, pos["T2"], pos["T3"]) is None      # "-1"
+    assert range_cost(table, pos["T3"], pos["T4"]) is None      # 빈 문자열
+    assert range_cost(table, pos["T4"], pos["T6"]) == {"coins": 500.0, "ores": 110.0}
+
+def test_range_costs_matches_range_cost():
+    table = build_range_table(numeric_sheet(), "lvl", VAL_COLS)
+    pairs = list(itertools.product(table.positions.values(), repeat=2))
+    i_curr, i_tgt = (np.array(p) for p in zip(*pairs))
+
+    need, ok = range_costs(table, i_curr, i_tgt)
+
+    for (c, t), row, valid in zip(pairs, need, ok):
+        single = range_cost(table, c, t)
+        if c == t:
+            assert valid and not row.any()
+        elif single is None:
+            assert not valid and not row.any()
+        else:
+            assert valid and row.tolist() == [single[col] for col in VAL_COLS]
@@ -0,0 +1,29 @@
+# tests/test_game_time.py
+from datetime import date, datetime, timezone
+import pytest
+import utils.sheet_store as sheet_store
+from utils.game_time import KST, game_day
+from utils.sheet_store import SheetPrefetcher
+
+@pytest.mark.parametrize("now, day", [
+    (datetime(2025, 6, 1, 10, 59, tzinfo=KST), date(2025, 5, 31)),
+    (datetime(2025, 6, 1, 11, 0, tzinfo=KST), date(2025, 6, 1)),
+    # UTC 서버: 같은 시각을 KST로 바꿔 판단
+    (datetime(2025, 5, 31, 23, 30, tzinfo=timezone.utc), date(2025, 5, 31)),
+    (datetime(2025, 6, 1, 2, 30, tzinfo=timezone.utc), date(2025, 6, 1)),
+])
+def test_game_day_follows_kst_reset(now, day):
+    assert game_day(now) == day
+
+def test_prefetch_window_uses_game_day(monkeypatch):
+    calls = []
+
+    class Store:
+        def revalidate(self, worksheets, date_range=None):
+            calls.append(date_range)
+            prefetcher.stop(timeout=0)
+
+    monkeypatch.setattr(sheet_store, "game_day", lambda: date(2025, 5, 31))
+    prefetcher = SheetPrefetcher(Store(), ["daily"], interval=60, window=(-1, 8))
+    prefetcher._run()
+    assert calls == [(date(2025, 5, 30), date(2025, 6, 8))]
@@ -0,0 +1,103 @@
+# tests/test_roster_plan.py
+import numpy as np
+import pandas as pd
+import pytest
+from utils.calc_tables import build_range_table, range_cost
+from utils.roster_plan import (
+    STATUS_BELOW, STATUS_MISSING, STATUS_OK, STATUS_UNKNOWN_CATEGORY, STATUS_UNKNOWN_LEVEL,
+    plan_roster, read_roster, roster_template,
+)
+
+@pytest.fixture
+def tables():
+    gear = pd.DataFrame({
+        "Gear_names": ["T1", "T2", "T3", "T4"],
+        "coins": [100, 200, "-1", 400],
+        "ores": [10, 20, 30, 40],
+    })
+    drone = pd.DataFrame({"drone_level": [1, 2, 3, 4, 5], "drone_parts": [1, 2, 3, 4, 5]})
+    return {
+        "gear": build_range_table(gear, "Gear_names", ["coins", "ores"]),
+        "drone": build_range_table(drone, "drone_level", ["drone_parts"]),
+    }
+
+CATEGORIES = {"⚙️ 장비 제작": "gear", "🚁 드론 업그레이드": "drone"}
+
+CSV = "이름,항목,현재 레벨,목표레벨\n철수,⚙️ 장비 제작,T1,T2\n영희, Drone ,1,4\n"
+
+@pytest.mark.parametrize("encoding", ["utf-8-sig", "utf-8", "cp949"])
+def test_read_roster_decodes_csv_encodings(encoding):
+    roster = read_roster(CSV.replace("⚙️ ", "").encode(encoding), "roster.csv")
+
+    assert list(roster.columns) == ["member", "category", "current", "target"]
+    assert roster["member"].tolist() == ["철수", "영희"]
+    assert roster["category"].tolist() == ["장비 제작", "Drone "]
+    assert roster["target"].tolist() == ["T2", "4"]
+
+@pytest.mark.parametrize("header", [
+    "member,category,current,target",
+    "Name,Category,From,To",
+    " 닉네임 ,카테고리,현재,목표",
+    "MEMBER,CATEGORY,Current_,Target!",
+])
+def test_read_roster_accepts_column_aliases(header):
+    roster = read_roster(f"{header},memo\nA,gear,T1,T2,x\n".encode("utf-8"), "roster.csv")
+    assert roster.to_dict("records") == [{"member": "A", "category": "gear", "current": "T1", "target": "T2"}]
+
+def test_read_roster_reports_missing_columns():
+    with pytest.raises(ValueError, match="target"):
+        read_roster("member,category,current\nA,gear,T1\n".encode("utf-8"), "roster.csv")
+
+def test_read_roster_reads_excel(tmp_path):
+    path = tmp_path / "roster.xlsx"
+    pd.DataFrame({"멤버": ["A"], "카테고리": ["drone"], "현재": [1], "목표": [3]}).to_excel(path, index=False)
+    roster = read_roster(path.read_bytes(), path.name)
+    assert roster.loc[0, ["member", "current", "target"]].tolist() == ["A", 1, 3]
+
+def test_plan_roster_statuses_and_totals(tables):
+    roster = read_roster((
+        "member,category,current,target\n"
+        "A,⚙️ 장비 제작,T1,T2\n"
+        "A,drone,1,4\n"
+        "B,🚁드론업그레이드,2,5\n"
+        "B,gear,T2,T4\n"
+        "C,gear,T3,T1\n"
+        "C,drone,1,9\n"
+        "C,hero,1,2\n"
+    ).encode("utf-8"), "roster.csv")
+
+    plan = plan_roster(roster, tables, CATEGORIES)
+
+    assert plan.rows["status"].tolist() == [
+        STATUS_OK, STATUS_OK, STATUS_OK, STATUS_MISSING, STATUS_BELOW,
+        STATUS_UNKNOWN_LEVEL, STATUS_UNKNOWN_CATEGORY,
+    ]
+    assert plan.resources == ["coins", "ores", "drone_parts"]
+    assert plan.rows.loc[0, ["coins", "ores"]].tolist() == [200.0, 20.0]
+    assert plan.members.loc["A"].tolist() == [2, 200.0, 20.0, 9.0]
+    assert plan.members.loc["B"].tolist() == [1, 0.0, 0.0, 12.0]
+    assert plan.totals.tolist() == [200.0, 20.0, 21.0]
+    assert len(plan.issues) == 4
+
+def test_plan_roster_matches_range_cost(tables):
+    gear = tables["gear"]
+    roster = pd.DataFrame(
+        [("M", "gear", c, t) for c in gear.labels for t in gear.labels],
+        columns=["member", "category", "current", "target"],
+    )
+    plan = plan_roster(roster, tables, CATEGORIES)
+
+    for row in plan.rows.itertuples():
+        single = range_cost(gear, gear.positions[row.current], gear.positions[row.target])
+        if single is None:
+            assert row.status != STATUS_OK or row.current == row.target
+        else:
+            assert row.status == STATUS_OK
+            assert [row.coins, row.ores] == [single["coins"], single["ores"]]
+
+def test_roster_template_round_trips(tables):
+    roster = read_roster(roster_template(tables), "template.csv")
+    plan = plan_roster(roster, tables, CATEGORIES)
+    assert roster["category"].tolist() == ["gear", "drone"]
+    assert (plan.rows["status"] != STATUS_UNKNOWN_CATEGORY).all()
+    assert np.isfinite(plan.totals.to_numpy()).all()
@@ -0,0 +1,88 @@
+# tests/test_schedule_export.py
+import io
+import os
+import re
+from datetime import date
+import pandas as pd
+import pytest
+from utils.excel_backup import BACKUP_EXCEL_PATH, read_backup
+from utils.schedule_export import expand_schedule, iter_days, write_ics
+from utils.schedule_index import build_schedule_index, lookup_day, recurring_keys
+from utils.sheets_client import values_to_frame
+
+BACKUP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), BACKUP_EXCEL_PATH)
+
+def frames(notice: str, schedule: str = "회의\n정산"):
+    daily = values_to_frame([
+        ["Date", "schedule_daily", "notice_daily"],
+        ["2025-06-01", schedule, notice],
+        ["2025-06-02", "", notice],
+    ])
+    weekly = values_to_frame([["weekday", "schedule_weekly"], [1, "주간 점검"]])
+    monthly = values_to_frame([["mod(weeknum,4)", "schedule_monthly"]])
+    note = values_to_frame([["note_contd"], [""]])
+    return daily, weekly, monthly, note
+
+def events(daily, weekly, monthly, note):
+    expanded = expand_schedule(daily, weekly, monthly, note, date(2025, 6, 1), date(2025, 6, 2))
+    buf = io.StringIO()
+    count = write_ics(expanded, buf)
+    text = buf.getvalue().replace("\r\n ", "")
+    uids = re.findall(r"^UID:(.+)\r$", text, re.M)
+    assert len(uids) == count
+    return dict(zip(uids, re.findall(r"^SUMMARY:(.+)\r$", text, re.M)))
+
+def test_ics_uids_are_unique():
+    # 06/01(일): 회의, 정산, 집결 / 06/02(월): 집결, 주간 점검
+    uids = events(*frames("집결"))
+    assert len(uids) == 5
+
+def test_ics_uid_survives_text_edits():
+    before = events(*frames("집결"))
+    after = events(*frames("집결 (20시)", schedule="회의 취소\n정산"))
+
+    assert set(before) == set(after)
+    changed = {uid for uid in before if before[uid] != after[uid]}
+    assert sorted(after[uid] for uid in changed) == ["공지: 집결 (20시)", "공지: 집결 (20시)", "일정: 회의 취소"]
+
+def assert_expand_matches_lookup(sheets, start, end):
+    index = build_schedule_index(*sheets)
+    expanded = expand_schedule(*sheets, start, end)
+    assert not expanded.empty
+    mismatches = [
+        day for day, sections in iter_days(expanded, start, end)
+        if any(sections[name] != lines for name, lines in lookup_day(index, day).items())
+    ]
+    assert mismatches == []
+    return expanded
+
+def backup_sheets():
+    return [read_backup(name, path=BACKUP_PATH) for name in ("daily", "weekly", "monthly", "note")]
+
+def as_text(df, col, fmt):
+    """반복 일정 키를 Sheets를 거친 것처럼 텍스트로"""
+    out = df.copy()
+    out[col] = [fmt.format(v) if pd.notna(v) else "" for v in out[col]]
+    return out
+
+@pytest.mark.skipif(not os.path.exists(BACKUP_PATH), reason="Excel 백업 없음")
+def test_expand_matches_lookup_day_over_backup():
+    assert_expand_matches_lookup(backup_sheets(), date(2025, 1, 1), date(2026, 12, 31))
+
+@pytest.mark.skipif(not os.path.exists(BACKUP_PATH), reason="Excel 백업 없음")
+@pytest.mark.parametrize("fmt", ["{:.0f}", " {:.0f} ", "{:.1f}"])
+def test_text_recurring_keys_match_numeric_keys(fmt):
+    daily, weekly, monthly, note = backup_sheets()
+    start, end = date(2025, 6, 1), date(2025, 8, 31)
+    numeric = assert_expand_matches_lookup([daily, weekly, monthly, note], start, end)
+    text = assert_expand_matches_lookup([
+        daily,
+        as_text(weekly, "weekday", fmt),
+        as_text(monthly, "mod(weeknum,4)", fmt),
+        note,
+    ], start, end)
+    assert text.equals(numeric)
+
+def test_recurring_keys_normalise_text_and_reject_fractions():
+    df = pd.DataFrame({"weekday": [1, "2", " 3 ", "4.0", 5.5, "x", None]})
+    assert recurring_keys(df, "weekday").tolist() == [1, 2, 3, 4, pd.NA, pd.NA, pd.NA]
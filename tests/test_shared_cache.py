@@ -0,0 +1,30 @@
+# tests/test_shared_cache.py
+import os
+import pandas as pd
+import pytest
+from utils.shared_cache import SQLITE_DEFAULT_PATH, SharedCache, SQLiteBackend, open_backend, sqlite_path
+
+@pytest.mark.parametrize("url, path", [
+    ("sqlite:///data/.cache/shared.sqlite", "data/.cache/shared.sqlite"),
+    ("sqlite:////var/cache/pztk/shared.sqlite", "/var/cache/pztk/shared.sqlite"),
+    ("sqlite:", SQLITE_DEFAULT_PATH),
+    ("sqlite://", SQLITE_DEFAULT_PATH),
+    ("sqlite:///", SQLITE_DEFAULT_PATH),
+])
+def test_sqlite_path(url, path):
+    assert sqlite_path(url) == path
+
+def test_sqlite_path_rejects_host():
+    with pytest.raises(ValueError):
+        sqlite_path("sqlite://cache-host/shared.sqlite")
+
+def test_open_backend_relative_and_absolute(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    relative = open_backend("sqlite:///rel/shared.sqlite")
+    absolute = open_backend(f"sqlite:///{tmp_path}/abs/shared.sqlite")
+    assert isinstance(relative, SQLiteBackend) and isinstance(absolute, SQLiteBackend)
+
+    for backend in (relative, absolute):
+        SharedCache(backend).put_frame("k", pd.DataFrame({"a": [1]}), ttl=60)
+    assert os.path.exists(tmp_path / "rel" / "shared.sqlite")
+    assert os.path.exists(tmp_path / "abs" / "shared.sqlite")
@@ -0,0 +1,91 @@
+# tests/test_sheet_diff.py
+import numpy as np
+import pandas as pd
+import pytest
+from benchmarks.fake_sheets import FakeSheetsClient
+from utils.sheet_diff import SheetConflictError, apply_plan, merge_page, plan_save, saved_frame
+
+GRID = [["Date", "Title", "Body", "N"]] + [
+    [f"2025-06-{i % 28 + 1:02d}", f"t{i}", f"b{i}", i] for i in range(50)
+]
+
+@pytest.fixture
+def client():
+    return FakeSheetsClient({"daily": [list(row) for row in GRID]})
+
+def test_merge_page_edits_visible_columns_only(client):
+    full = client.read_one("daily")
+    page_base = full.loc[full.index[10:20], ["Title", "N"]]
+    page_edited = page_base.copy()
+    page_edited.loc[12, "Title"] = "EDIT"
+
+    out = merge_page(full, page_base, page_edited)
+
+    assert out.loc[12, "Title"] == "EDIT"
+    assert out.loc[12, "Body"] == "b12"
+    assert out.drop(index=12).equals(full.drop(index=12))
+    assert out.attrs == full.attrs
+
+def test_merge_page_appends_nan_labelled_rows_and_drops_deleted(client):
+    full = client.read_one("daily")
+    page_base = full.loc[full.index[10:20], ["Title", "N"]]
+    page_edited = page_base.drop(index=15)
+    # st.data_editor가 새로 추가한 행은 라벨이 NaN
+    added = pd.DataFrame({"Title": ["NEW1", "NEW2"], "N": [7, 8]}, index=[np.nan, np.nan])
+    page_edited = pd.concat([page_edited, added])
+
+    out = merge_page(full, page_base, page_edited)
+
+    assert 15 not in out.index
+    assert list(out.index[-2:]) == [50, 51]
+    assert out.loc[50, "Title"] == "NEW1" and pd.isna(out.loc[50, "Body"])
+    assert len(out) == len(full) + 1
+
+def test_merge_page_handles_dtype_change(client):
+    full = client.read_one("daily")
+    page_base = full.loc[full.index[40:45]]
+    page_edited = page_base.astype(object)
+    page_edited.loc[41, "N"] = "x"
+
+    out = merge_page(full, page_base, page_edited)
+
+    assert out.loc[41, "N"] == "x"
+    assert out.loc[42, "N"] == 42
+
+def test_paged_edits_save_and_read_back(client):
+    loaded = client.read_one("daily")
+    base = loaded.copy()
+    work = base
+
+    page_base = work.loc[work.index[10:20], ["Title", "N"]]
+    page_edited = page_base.drop(index=15)
+    page_edited.loc[12, "Title"] = "EDIT"
+    page_edited = pd.concat([page_edited, pd.DataFrame({"Title": ["NEW"], "N": [7]}, index=[np.nan])])
+    work = merge_page(work, page_base, page_edited)
+
+    page_base = work.loc[work.index[38:45]]
+    page_edited = page_base.astype(object)
+    page_edited.loc[41, "N"] = "x"
+    work = merge_page(work, page_base, page_edited)
+
+    plan = plan_save(loaded, base, work)
+    assert plan.full is None  # 셀 단위 저장
+    apply_plan(client, "daily", plan)
+
+    after = client.read_one("daily")
+    assert after.astype(str).equals(saved_frame(loaded, base, work).astype(str))
+    assert after.loc[12, "Title"] == "EDIT" and 15 not in after.index
+    assert after.loc[50, "Title"] == "NEW" and str(after.loc[41, "N"]) == "x"
+
+def test_apply_plan_detects_conflict(client):
+    loaded = client.read_one("daily")
+    base = loaded.copy()
+    page_base = base.loc[base.index[:5], ["Title"]]
+    page_edited = page_base.copy()
+    page_edited.loc[3, "Title"] = "mine"
+    plan = plan_save(loaded, base, merge_page(base, page_base, page_edited))
+
+    client.sheet.grids["daily"][4][1] = "theirs"
+    with pytest.raises(SheetConflictError) as err:
+        apply_plan(client, "daily", plan)
+    assert err.value.rows == [5]
@@ -0,0 +1,126 @@
+# tests/test_sheet_store.py
+import os
+import threading
+import time
+from types import SimpleNamespace
+import pandas as pd
+import pytest
+import utils.sheet_store as sheet_store
+import utils.write_queue as write_queue
+from utils.shared_cache import MemoryBackend, SharedCache
+from utils.sheet_store import SheetStore, _shared_key, _snapshot_path
+
+@pytest.fixture(autouse=True)
+def workdir(tmp_path, monkeypatch):
+    # 스냅샷은 data/.cache 아래 상대 경로에 기록됨
+    monkeypatch.chdir(tmp_path)
+
+def test_forced_refresh_does_not_join_inflight_revalidate():
+    sheet = {"daily": pd.DataFrame({"Title": ["v1"]})}
+    entered, release = threading.Event(), threading.Event()
+    block = {"next": False}
+
+    def fetch(keys):
+        return {key: sheet[key].copy() for key in keys}
+
+    def revision():
+        # 사전 갱신이 수정 시각 조회 중에 멈춰 있는 상황
+        if block["next"]:
+            block["next"] = False
+            entered.set()
+            release.wait(5)
+        return "rev-1"
+
+    store = SheetStore(fetch, revision=revision)
+    assert store.get("daily").loc[0, "Title"] == "v1"
+
+    block["next"] = True
+    prefetch = threading.Thread(target=store.revalidate, args=(["daily"],))
+    prefetch.start()
+    assert entered.wait(5)
+
+    sheet["daily"] = pd.DataFrame({"Title": ["v2"]})
+    forced = {}
+    saver = threading.Thread(target=lambda: forced.update(df=store.get("daily", refresh=True)))
+    saver.start()
+    saver.join(2)
+    finished = not saver.is_alive()
+    release.set()
+    prefetch.join(5)
+    saver.join(5)
+
+    assert finished, "강제 새로고침이 진행 중인 사전 갱신을 기다림"
+    assert forced["df"].loc[0, "Title"] == "v2"
+
+def test_evict_drops_memory_snapshot_and_shared_copies():
+    sheet = {"daily": pd.DataFrame({"Title": ["v1"]})}
+    shared = SharedCache(MemoryBackend())
+    store = SheetStore(lambda keys: {key: sheet[key].copy() for key in keys}, shared=shared)
+    store.get("daily")
+    assert os.path.exists(_snapshot_path("daily"))
+    assert shared.get_frame(_shared_key("daily")) is not None
+
+    sheet["daily"] = pd.DataFrame({"Title": ["v2"]})
+    store.evict("daily")
+
+    assert not os.path.exists(_snapshot_path("daily"))
+    assert shared.get_frame(_shared_key("daily")) is None
+    # 만료(invalidate)와 달리 기존 사본을 돌려주지 않고 바로 다시 읽음
+    assert store.get("daily").loc[0, "Title"] == "v2"
+
+def test_write_results_publish_only_confirmed_saves(monkeypatch):
+    sheet = {"daily": pd.DataFrame({"Title": ["v1"]})}
+    store = SheetStore(lambda keys: {key: sheet[key].copy() for key in keys})
+    monkeypatch.setattr(sheet_store, "get_sheet_store", lambda: store)
+    queue = SimpleNamespace(pending=lambda worksheet: 0)
+    store.get("daily")
+
+    sheet["daily"] = pd.DataFrame({"Title": ["saved"]})
+    write_queue._on_result(queue, SimpleNamespace(worksheet="daily", status="done"))
+    assert store.get("daily").loc[0, "Title"] == "saved"
+
+    calls = []
+    monkeypatch.setattr(store, "evict", calls.append)
+    write_queue._on_result(queue, SimpleNamespace(worksheet="daily", status="conflict"))
+    assert calls == ["daily"]
+
+class QuickLockCache(SharedCache):
+    """잠금 대기 시간을 줄인 공유 캐시 (다른 레플리카가 잠금을 쥐고 있는 상황 재현용)"""
+
+    def leader(self, name, ttl=60.0, wait=0.2):
+        return super().leader(name, ttl=ttl, wait=wait)
+
+def hold_lock(shared: SharedCache, name: str):
+    assert shared.backend.try_lock(f"{shared.namespace}lock:{name}", "other-replica", 60)
+
+def test_lock_timeout_keeps_local_copy_instead_of_downloading():
+    fetches = []
+    shared = QuickLockCache(MemoryBackend())
+    store = SheetStore(lambda keys: fetches.append(keys) or {k: pd.DataFrame({"Title": ["v1"]}) for k in keys}, ttl=0, shared=shared)
+    store.get("daily")
+    shared.delete(_shared_key("daily"))
+    hold_lock(shared, "sheets:daily")
+
+    frames = store.revalidate(["daily"])
+
+    assert len(fetches) == 1
+    assert frames["daily"].loc[0, "Title"] == "v1"
+
+def test_lock_timeout_adopts_copy_published_while_waiting():
+    fetches = []
+    shared = QuickLockCache(MemoryBackend())
+    store = SheetStore(lambda keys: fetches.append(keys) or {k: pd.DataFrame({"Title": ["mine"]}) for k in keys}, shared=shared)
+    hold_lock(shared, "sheets:daily")
+
+    def publish():
+        df = pd.DataFrame({"Title": ["theirs"]})
+        df.attrs.update(fetched_at=time.time(), version="x")
+        shared.put_frame(_shared_key("daily"), df, ttl=60, version="x")
+
+    timer = threading.Timer(0.05, publish)
+    timer.start()
+    df = store.get("daily")
+    timer.join()
+
+    assert fetches == []
+    assert df.loc[0, "Title"] == "theirs"
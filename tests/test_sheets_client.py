@@ -0,0 +1,47 @@
+# tests/test_sheets_client.py
+from types import SimpleNamespace
+from utils.sheets_client import SheetsClient
+
+class RecordingWorksheet:
+    """요청 순서만 기록하는 gspread Worksheet 대역"""
+
+    def __init__(self, calls: list):
+        self.id, self.title, self.row_count, self.col_count = 7, "daily", 100, 5
+        self.calls = calls
+
+    def clear(self):
+        self.calls.append(("clear",))
+
+    def update(self, range_name, values, value_input_option):
+        self.calls.append(("update", range_name, values))
+
+    def batch_clear(self, ranges):
+        self.calls.append(("batch_clear", ranges))
+
+class RecordingClient(SheetsClient):
+    def __init__(self, grid=(1000, 26)):
+        super().__init__({}, reads_per_minute=0, writes_per_minute=0)
+        self.calls = []
+        self.ws = RecordingWorksheet(self.calls)
+        rows, cols = grid
+        meta = {"sheets": [{"properties": {"sheetId": 7, "gridProperties": {"rowCount": rows, "columnCount": cols}}}]}
+        self.sheet = SimpleNamespace(fetch_sheet_metadata=lambda params=None: meta)
+
+    def spreadsheet(self):
+        return self.sheet
+
+    def worksheet(self, name, create=False):
+        return self.ws
+
+def test_write_values_overwrites_then_clears_trailing_cells():
+    client = RecordingClient()
+    client.write_values("daily", [["Date", "Title"], ["2025-06-01", "a"], ["2025-06-02"]])
+
+    assert [c[0] for c in client.calls] == ["update", "batch_clear"]
+    assert client.calls[0] == ("update", "A1", [["Date", "Title"], ["2025-06-01", "a"], ["2025-06-02", ""]])
+    assert client.calls[1] == ("batch_clear", ["A4:Z1000", "C1:Z3"])
+
+def test_write_values_skips_clear_when_block_fills_grid():
+    client = RecordingClient(grid=(2, 2))
+    client.write_values("daily", [["Date", "Title"], ["2025-06-01", "a"]])
+    assert [c[0] for c in client.calls] == ["update"]
@@ -0,0 +1,38 @@
+# tests/test_workbook_cache.py
+from datetime import date
+import pytest
+from utils.workbook_cache import sheet_fingerprints
+
+openpyxl = pytest.importorskip("openpyxl")
+
+def write_book(path, a_rows, b_rows, a_date_format="yyyy-mm-dd"):
+    wb = openpyxl.Workbook()
+    a = wb.active
+    a.title = "A"
+    for row in a_rows:
+        a.append(row)
+    a["C1"] = date(2025, 6, 1)
+    a["C1"].number_format = a_date_format
+    b = wb.create_sheet("B")
+    for row in b_rows:
+        b.append(row)
+    wb.save(path)
+    return sheet_fingerprints(str(path))
+
+def test_string_edit_in_one_sheet_keeps_other_fingerprints(tmp_path):
+    a_rows = [["level", "cost"], ["Lv.1", 10]]
+    before = write_book(tmp_path / "v1.xlsx", a_rows, [["name"], ["alpha"]])
+    after = write_book(tmp_path / "v2.xlsx", a_rows, [["name"], ["beta"], ["gamma"]])
+
+    assert after["A"] == before["A"]
+    assert after["B"] != before["B"]
+
+def test_own_string_and_number_format_changes_rebuild(tmp_path):
+    b_rows = [["name"], ["alpha"]]
+    base = write_book(tmp_path / "v1.xlsx", [["level"], ["Lv.1"]], b_rows)
+    renamed = write_book(tmp_path / "v2.xlsx", [["level"], ["Lv.2"]], b_rows)
+    reformatted = write_book(tmp_path / "v3.xlsx", [["level"], ["Lv.1"]], b_rows, a_date_format="mm/dd")
+
+    assert renamed["A"] != base["A"]
+    assert reformatted["A"] != base["A"]
+    assert renamed["B"] == base["B"] == reformatted["B"]
@@ -0,0 +1,192 @@
+# tests/test_write_queue.py
+import os
+from types import SimpleNamespace
+import pytest
+import utils.sheets_client as sheets_client
+import utils.write_queue as write_queue
+from benchmarks.fake_sheets import FakeSheetsClient
+from utils.sheet_diff import plan_save, saved_frame
+from utils.write_queue import CLAIMED_DIR, WriteQueue, push_plans
+
+GRID = [["Date", "Title", "N"]] + [[f"2025-06-{i + 1:02d}", f"t{i}", i] for i in range(5)]
+
+class HTTPError(Exception):
+    """gspread APIError처럼 response.status_code / headers를 가진 오류"""
+
+    def __init__(self, code: int, headers: dict = None):
+        super().__init__(f"HTTP {code}")
+        self.response = SimpleNamespace(status_code=code, headers=headers or {})
+
+@pytest.fixture
+def client(monkeypatch):
+    client = FakeSheetsClient({"daily": [list(row) for row in GRID]})
+    monkeypatch.setattr(sheets_client, "get_sheets_client", lambda: client)
+    return client
+
+@pytest.fixture
+def journal(tmp_path):
+    return str(tmp_path / "write_queue")
+
+@pytest.fixture
+def results():
+    return []
+
+def make_queue(journal, results, push=push_plans, **kwargs) -> WriteQueue:
+    return WriteQueue(push, journal_dir=journal, on_result=results.append, min_interval=0, **kwargs)
+
+def edit(client, **cells):
+    """시트를 읽고 (행 라벨, 컬럼)=값으로 고친 저장 계획과 반영 후 예상 DataFrame"""
+    loaded = client.read_one("daily")
+    base = loaded.copy()
+    edited = base.copy()
+    for key, value in cells.items():
+        label, col = key.split("_", 1)
+        edited.loc[int(label[1:]), col] = value
+    return plan_save(loaded, base, edited), saved_frame(loaded, base, edited)
+
+def test_submit_process_read_back(client, journal, results):
+    queue = make_queue(journal, results)
+    plan, expected = edit(client, r1_Title="B", r3_N=30)
+    job = queue.submit("daily", plan.to_dict())
+
+    assert client.sheet.requests == 1  # 접수만으로는 원격 요청 없음
+    assert queue.pending("daily") == 1
+    assert os.path.exists(queue._path(job.id))
+
+    assert queue.process() == 0.0
+    assert [(j.id, j.status) for j in results] == [(job.id, "done")]
+    assert queue.pending() == 0 and queue.recent()[0].id == job.id
+    assert not os.path.exists(queue._path(job.id))
+    assert client.read_one("daily").astype(str).equals(expected.astype(str))
+
+def test_merged_batch_isolates_conflict(client, journal, results):
+    queue = make_queue(journal, results)
+    plans = [edit(client, **{f"r{label}_Title": f"edit{label}"})[0] for label in (0, 1, 2)]
+    jobs = [queue.submit("daily", plan.to_dict()) for plan in plans]
+    # 다른 사용자가 두 번째 저장의 행을 먼저 수정
+    client.sheet.grids["daily"][2][1] = "other"
+    client.sheet.touch()
+
+    queue.process()
+
+    assert {j.id: j.status for j in results} == {jobs[0].id: "done", jobs[1].id: "conflict"}
+    assert "3" in jobs[1].last_error
+    assert [row[1] for row in client.sheet.grids["daily"][1:4]] == ["edit0", "other", "t2"]
+    # 세 번째 저장은 충돌한 저장 뒤에서 보류
+    assert [(j.id, j.status) for j in queue.jobs()] == [(jobs[1].id, "conflict"), (jobs[2].id, "pending")]
+    assert queue.blocked() == [jobs[2].id]
+
+def test_conflicting_head_blocks_queued_job(client, journal, results):
+    queue = make_queue(journal, results)
+    plan, after = edit(client, r1_Title="mine")
+    head = queue.submit("daily", plan.to_dict())
+    client.sheet.grids["daily"][2][1] = "theirs"
+    client.sheet.touch()
+    queue.process()
+    assert head.status == "conflict"
+
+    # 앞 저장의 낙관적 결과(after) 위에서 만든 저장: 앞 저장 없이 반영하면 안 됨
+    base = after.copy()
+    edited = base.copy()
+    edited.loc[99] = ["2025-06-30", "appended", 9]
+    behind = queue.submit("daily", plan_save(after, base, edited).to_dict())
+    requests = client.sheet.requests
+
+    assert queue.process() is None
+    assert client.sheet.requests == requests
+    assert behind.status == "pending" and queue.blocked() == [behind.id]
+    assert queue.flush(1)
+
+    # 관리자가 충돌한 저장을 취소하면 보류가 풀림
+    queue.discard(head.id)
+    assert queue.blocked() == []
+    queue.process()
+    assert behind.id not in [j.id for j in queue.jobs()]
+
+def test_failed_head_blocks_until_retried(client, journal, results):
+    calls = []
+
+    def push(worksheet, plans):
+        calls.append(len(plans))
+        if len(calls) == 1:
+            raise HTTPError(400)
+        push_plans(worksheet, plans)
+
+    queue = make_queue(journal, results, push=push)
+    head = queue.submit("daily", edit(client, r0_Title="A")[0].to_dict())
+    queue.process()
+    assert head.status == "failed"
+
+    behind = queue.submit("daily", edit(client, r4_Title="B")[0].to_dict())
+    assert queue.process() is None and calls == [1]
+
+    queue.retry(head.id)
+    queue.process()
+    assert calls == [1, 2]
+    assert [j.status for j in results[-2:]] == ["done", "done"]
+    assert [row[1] for row in (client.sheet.grids["daily"][1], client.sheet.grids["daily"][5])] == ["A", "B"]
+
+def test_quota_error_honours_retry_after(client, journal, results, monkeypatch):
+    def throttled(worksheet, plans):
+        raise HTTPError(429, {"Retry-After": "120"})
+
+    queue = make_queue(journal, results, push=throttled)
+    job = queue.submit("daily", edit(client, r0_Title="x")[0].to_dict())
+
+    assert queue.process() == 0.0
+    assert job.status == "retrying" and job.attempts == 1
+    assert job.next_try >= queue._paused_until
+    # 대기열 전체가 Retry-After 동안 멈춤
+    assert queue.process() > 100
+    assert results == []
+
+def test_permanent_error_fails_job(client, journal, results):
+    def rejected(worksheet, plans):
+        raise HTTPError(400)
+
+    queue = make_queue(journal, results, push=rejected)
+    job = queue.submit("daily", edit(client, r0_Title="x")[0].to_dict())
+    queue.process()
+    assert job.status == "failed" and results == [job]
+
+def test_replay_after_restart(client, journal, results):
+    first = make_queue(journal, results)
+    plan_a, _ = edit(client, r0_Title="A")
+    plan_b, _ = edit(client, r4_N=40)
+    ids = [first.submit("daily", plan.to_dict()).id for plan in (plan_a, plan_b)]
+    first.stop()
+
+    restarted = make_queue(journal, results)
+    assert [(j.id, j.status) for j in restarted.jobs()] == [(i, "pending") for i in ids]
+    restarted.process()
+    assert restarted.pending() == 0
+    grid = client.sheet.grids["daily"]
+    assert grid[1][1] == "A" and str(grid[5][2]) == "40"
+
+def test_replica_leaves_live_claims_and_adopts_dead_ones(client, journal, results):
+    owner = make_queue(journal, results, owner="host-a-1")
+    job = owner.submit("daily", edit(client, r0_Title="A")[0].to_dict())
+
+    replica = make_queue(journal, results, owner="host-b-1")
+    assert replica.jobs() == []
+
+    # host-a의 하트비트가 끊김 → 다음 복제본이 이어받음
+    survivor = make_queue(journal, results, owner="host-c-1", claim_ttl=0)
+    assert [j.id for j in survivor.jobs()] == [job.id]
+    assert os.listdir(os.path.join(journal, CLAIMED_DIR)) == ["host-c-1"]
+
+    # 뒤늦게 깨어난 원래 주인은 반영하지 않고 내려놓음
+    owner.process()
+    assert owner.jobs() == [] and results == []
+    survivor.process()
+    assert [(j.id, j.status) for j in results] == [(job.id, "done")]
+    assert client.sheet.grids["daily"][1][1] == "A"
+
+def test_unclaimed_legacy_journal_is_claimed(client, journal, results):
+    legacy = make_queue(journal, results, owner="old-1")
+    job = legacy.submit("daily", edit(client, r2_Title="L")[0].to_dict())
+    os.replace(legacy._path(job.id), os.path.join(journal, f"{job.id}.json"))
+
+    queue = make_queue(journal, results, owner="new-1")
+    assert [j.id for j in queue.jobs()] == [job.id]
+    assert write_queue._journal_files(journal) == []
@@ -0,0 +1,72 @@
+# utils/calc_tables.py
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+
+# 데이터 미준비 표시 값
+MISSING_MARKERS = ["-1", ""]
+
+@dataclass(frozen=True)
+class RangeTable:
+    """레벨 구간 합계 계산용 누적합 테이블"""
+    labels: list                 # 레벨 값 (시트 순서, 선택 목록용)
+    positions: dict              # 레벨 값 → 누적합 행 위치
+    val_cols: List[str]
+    cumsum: np.ndarray           # (행, 자원) 0~i행 누적합
+    missing_cumsum: np.ndarray   # 0~i행 중 데이터 미준비 행 개수
+    ordinal: bool                # True: 시트 순서 비교, False: 레벨 숫자 비교
+
+def build_range_table(df: pd.DataFrame, lvl_col: str, val_cols: List[str]) -> RangeTable:
+    """
+    레벨 컬럼과 자원 컬럼으로 누적합 테이블 생성
+    """
+    labels = df[lvl_col].tolist()
+    ordinal = not pd.api.types.is_numeric_dtype(df[lvl_col])
+
+    if ordinal:
+        ordered = df.reset_index(drop=True)
+        positions: dict = {}
+        for i, lvl in enumerate(labels):
+            positions.setdefault(lvl, i)
+    else:
+        # 숫자 레벨: 레벨 순 정렬 후 같은 레벨의 마지막 행까지 포함
+        ordered = df.sort_values(lvl_col, kind="stable").reset_index(drop=True)
+        positions = {lvl: i for i, lvl in enumerate(ordered[lvl_col].tolist())}
+
+    raw = ordered[val_cols]
+    values = raw.apply(pd.to_numeric, errors="coerce")
+    missing = (
+        raw.astype(str).isin(MISSING_MARKERS)
+        | values.eq(-1)
+        | (values.isna() & raw.notna())
+    ).any(axis=1).to_numpy()
+
+    return RangeTable(
+        labels=labels,
+        positions=positions,
+        val_cols=list(val_cols),
+        cumsum=np.cumsum(values.fillna(0).to_numpy(dtype=np.float64), axis=0),
+        missing_cumsum=np.cumsum(missing, dtype=np.int64),
+        ordinal=ordinal,
+    )
+
+def range_cost(table: RangeTable, i_curr: int, i_tgt: int) -> Optional[Dict[str, float]]:
+    """(현재, 목표] 구간 자원 합계. 빈 구간이거나 미준비 데이터가 있으면 None"""
+    if i_tgt <= i_curr or table.missing_cumsum[i_tgt] != table.missing_cumsum[i_curr]:
+        return None
+    need = table.cumsum[i_tgt] - table.cumsum[i_curr]
+    return dict(zip(table.val_cols, need.tolist()))
+
+def range_costs(table: RangeTable, i_curr: np.ndarray, i_tgt: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    여러 (현재, 목표] 구간의 자원 합계를 한 번에 (range_cost의 벡터 버전)
+
+    Returns:
+        (합계 배열 (구간 수, 자원 수), 유효 여부). 목표가 현재보다 낮거나 미준비 데이터가
+        있는 구간은 유효하지 않고 합계는 0. 현재 = 목표는 유효하며 합계 0.
+    """
+    ok = (i_tgt >= i_curr) & (table.missing_cumsum[i_tgt] == table.missing_cumsum[i_curr])
+    need = table.cumsum[i_tgt] - table.cumsum[i_curr]
+    need[~ok] = 0.0
+    return need, ok
@@ -0,0 +1,70 @@
+# utils/dashboard_view.py
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Tuple
+import pandas as pd
+from utils.data_extract import format_content_display
+from utils.schedule_index import lookup_day
+from utils.shared_frames import freeze
+
+# (섹션 키, 제목, 표시 아이콘, 복사용 제목, 복사용 아이콘)
+DASHBOARD_SECTIONS = [
+    ("notice",   "📢 공지사항", "📣", "공지사항", "📢"),
+    ("schedule", "📅 오늘 일정", "⏰", "오늘 일정", "📅"),
+    ("duel",     "⚔️ 연맹대결", "🏆", "연맹대결", "⚔️"),
+    ("event",    "📜 이벤트",   "🎯", "이벤트",   "📜"),
+    ("package",  "💰 패키지",   "💰", "패키지",   "💰"),
+]
+
+WEEKDAY_KR = ["월", "화", "수", "목", "금", "토", "일"]
+CALENDAR_DAYS = 7
+
+@dataclass(frozen=True)
+class DashboardView:
+    """
+    하루치 대시보드 화면 데이터 (세션 간 공유, 읽기 전용)
+
+    sections: 섹션 키 → (제목, 아이콘, Markdown 줄). 데이터가 없으면 줄 대신 None
+    calendar: 다음 7일 캘린더 표
+    all_text: 전체 복사용 텍스트
+    """
+    sections: Dict[str, Tuple[str, str, Optional[Tuple[str, ...]]]]
+    calendar: pd.DataFrame
+    all_text: str
+
+def _has_data(lines: list) -> bool:
+    return bool(lines) and "데이터 없음" not in lines[0]
+
+def digest_text(sections: Dict[str, List[str]]) -> str:
+    """하루치 섹션 → 채팅/복사용 텍스트 (내용이 없으면 빈 문자열)"""
+    parts: List[str] = []
+    for key, _, _, copy_title, copy_icon in DASHBOARD_SECTIONS:
+        lines = sections.get(key, [])
+        if _has_data(lines):
+            parts += [f"{copy_icon} {copy_title}"] + lines + [""]
+    return "\n".join(parts)
+
+def build_dashboard_view(index: dict, game_day: date) -> DashboardView:
+    """일정 인덱스에서 선택일의 섹션/캘린더/복사 텍스트를 한 번에 계산"""
+    today = lookup_day(index, game_day)
+
+    sections = {
+        key: (title, icon, tuple(format_content_display(today[key], icon)) if _has_data(today[key]) else None)
+        for key, title, icon, _, _ in DASHBOARD_SECTIONS
+    }
+
+    dates = [game_day + timedelta(days=i) for i in range(1, CALENDAR_DAYS + 1)]
+    week_data = []
+    for fd in dates:
+        items = lookup_day(index, fd)["calendar"]
+        header = f"{fd:%m/%d}({WEEKDAY_KR[fd.weekday()]})"
+        content = "\n".join(items) if items else "-"
+        week_data.append(f"**{header}**\n{content}")
+    calendar = pd.DataFrame(
+        [week_data],
+        index=["다음 주"],
+        columns=[WEEKDAY_KR[fd.weekday()] for fd in dates]
+    )
+
+    all_text = digest_text(today) or "복사할 내용이 없습니다."
+    return DashboardView(sections=sections, calendar=freeze(calendar), all_text=all_text)
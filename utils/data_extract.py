@@ -1,4 +1,5 @@
 # utils/data_extract.py
+import hashlib
 import pandas as pd
 from typing import List, Dict, Union
 
@@ -50,3 +51,16 @@ def extract_section(
 def format_content_display(lines: List[str], icon: str = "•") -> List[str]:
     """각 줄 앞에 아이콘을 붙여 Markdown 표시용 리스트 생성"""
     return [f"{icon} {ln}" for ln in lines if ln.strip()]
+
+def frames_version(*frames: pd.DataFrame) -> str:
+    """DataFrame 내용 기반 버전 해시 (attrs['version']이 있으면 재사용)"""
+    h = hashlib.sha1()
+    for df in frames:
+        version = df.attrs.get("version")
+        if version:
+            h.update(version.encode())
+            continue
+        h.update(repr(list(df.columns)).encode())
+        if not df.empty:
+            h.update(pd.util.hash_pandas_object(df, index=False).values.tobytes())
+    return h.hexdigest()[:16]
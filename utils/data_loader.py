@@ -1,46 +1,38 @@
 # utils/data_loader.py
 import streamlit as st
 import pandas as pd
-from google.oauth2 import service_account
-import gspread
-import os
-from typing import Optional
+import time
+from typing import Dict, List, Optional
+from utils.excel_backup import BACKUP_EXCEL_PATH, get_excel_backup, read_backup
+from utils.flow_control import SingleFlight
+from utils.sheet_store import (
+    WINDOWED_SHEETS, DateRange, concat_pages, format_age, load_snapshot,
+    month_keys, month_span, page_key, save_snapshot, select_months
+)
+from utils.shared_frames import view
+from utils.sheets_client import get_sheets_client
 
-BACKUP_EXCEL_PATH = "data/250628_1800.xlsx"
+# 세션 간 동시 로드 합치기 (같은 워크시트를 읽는 중이면 그 결과를 함께 받음)
+_flights = SingleFlight()
 
-# Google Sheets 클라이언트 (캐시됨)
-@st.cache_resource
-def _init_gs_client() -> Optional[gspread.Client]:
-    """Google Sheets 클라이언트 초기화 (올바른 스코프 포함)"""
-    try:
-        gsheets_config = st.secrets["connections"]["gsheets"]
-        scopes = gsheets_config.get("scopes", [
-            "https://www.googleapis.com/auth/spreadsheets",
-            "https://www.googleapis.com/auth/drive"
-        ])
-        
-        creds = service_account.Credentials.from_service_account_info(
-            gsheets_config,
-            scopes=scopes
-        )
-        return gspread.authorize(creds)
-    except Exception as e:
-        st.warning(f"Google Sheets 클라이언트 초기화 실패: {e}")
-        return None
+def fetch_worksheets(sheet_names: List[str]) -> Dict[str, pd.DataFrame]:
+    """
+    여러 워크시트를 values batchGet 요청 한 번으로 로드 (실패 시 예외)
+
+    다른 세션이 이미 읽고 있는 워크시트는 요청하지 않고 그 결과를 기다린다.
+    결과는 세션마다 얕은 사본.
+    """
+    def fetch(keys):
+        frames = get_sheets_client().read([name for _, name in keys])
+        return {("read", name): df for name, df in frames.items()}
+
+    frames, _ = _flights.do_many([("read", name) for name in sheet_names], fetch)
+    return {name: view(frames[("read", name)]) for name in sheet_names}
 
 def _load_from_gsheets(sheet_name: str) -> Optional[pd.DataFrame]:
     """Google Sheets에서 데이터 로드"""
     try:
-        client = _init_gs_client()
-        if client is None:
-            return None
-            
-        url = st.secrets["connections"]["gsheets"]["spreadsheet"]
-        sh = client.open_by_url(url)
-        ws = sh.worksheet(sheet_name)
-        records = ws.get_all_records()
-        df = pd.DataFrame(records)
-        
+        df = fetch_worksheets([sheet_name])[sheet_name]
         if not df.empty:
             st.success(f"✅ Google Sheets에서 '{sheet_name}' 로드 성공")
         return df
@@ -48,55 +40,113 @@ def _load_from_gsheets(sheet_name: str) -> Optional[pd.DataFrame]:
         st.warning(f"Google Sheets '{sheet_name}' 로드 실패: {e}")
         return None
 
-def _load_from_excel(path: str, sheet_name: str) -> Optional[pd.DataFrame]:
-    """Excel 백업 파일에서 데이터 로드"""
+def _load_from_excel(
+    sheet_name: str,
+    date_col: Optional[str] = None,
+    date_range: Optional[DateRange] = None
+) -> Optional[pd.DataFrame]:
+    """Excel 백업 파일에서 데이터 로드 (date_range를 주면 해당 구간 행만)"""
     try:
-        if not os.path.exists(path):
-            st.error(f"Excel 백업 파일을 찾을 수 없습니다: {path}")
+        df = read_backup(sheet_name, date_col=date_col, date_range=date_range)
+        if df is None:
+            st.error(f"Excel 백업 파일을 찾을 수 없습니다: {BACKUP_EXCEL_PATH}")
             return None
-            
-        df = pd.read_excel(path, sheet_name=sheet_name)
         st.info(f"📁 Excel 백업에서 '{sheet_name}' 로드 성공")
         return df
     except Exception as e:
         st.error(f"Excel '{sheet_name}' 로드 실패: {e}")
         return None
 
-def load_dataframe_with_fallback(sheet_name: str, excel_sheet: str = None) -> pd.DataFrame:
-    """Google Sheets 우선 로드, 실패 시 Excel 폴백"""
-    # Google Sheets 시도
-    df = _load_from_gsheets(sheet_name)
-    
-    # 실패 시 Excel 백업 사용
+def _load_from_snapshot(sheet_name: str) -> Optional[pd.DataFrame]:
+    """마지막으로 성공한 Google Sheets 로드의 로컬 스냅샷"""
+    df = load_snapshot(sheet_name)
+    if df is not None:
+        age = format_age(time.time() - df.attrs["fetched_at"])
+        st.info(f"💾 로컬 스냅샷에서 '{sheet_name}' 로드 ({age})")
+    return df
+
+def _with_fallback(
+    sheet_name: str,
+    df: Optional[pd.DataFrame],
+    excel_sheet: str = None,
+    date_range: Optional[DateRange] = None
+) -> pd.DataFrame:
+    """Google Sheets 결과가 없으면 로컬 스냅샷 → Excel 순으로 폴백 (Excel은 date_range 구간만 읽음)"""
+    if df is not None and not df.empty:
+        save_snapshot(sheet_name, df)
+        return df
+
+    # 실패 시 마지막 스냅샷 사용
+    df = _load_from_snapshot(sheet_name)
+
+    # 스냅샷도 없으면 Excel 백업 사용
     if df is None or df.empty:
-        excel_path = BACKUP_EXCEL_PATH
-        if not os.path.isabs(excel_path):
-            excel_path = os.path.join(os.getcwd(), excel_path)
-        df = _load_from_excel(excel_path, sheet_name=excel_sheet or sheet_name)
-    
+        date_col = WINDOWED_SHEETS.get(sheet_name) if date_range is not None else None
+        df = _load_from_excel(excel_sheet or sheet_name, date_col=date_col, date_range=date_range)
+
     return df if df is not None else pd.DataFrame()
 
+def _load_window(sheet_name: str, date_range: DateRange, excel_sheet: str = None) -> pd.DataFrame:
+    """
+    날짜 구간이 걸친 월의 행만 로드
+
+    Google Sheets → 월 페이지 스냅샷 → 전체 스냅샷 → Excel 순으로 폴백하며,
+    폴백 결과도 같은 월만 남긴다.
+    """
+    date_col = WINDOWED_SHEETS[sheet_name]
+    months = month_keys(*date_range)
+    try:
+        pages, shared = _flights.do(
+            ("months", sheet_name, tuple(months)),
+            lambda: get_sheets_client().read_months(sheet_name, date_col, months)
+        )
+        pages = {month: view(page) for month, page in pages.items()}
+        if not shared:
+            for month, page in pages.items():
+                save_snapshot(page_key(sheet_name, month), page)
+        st.success(f"✅ Google Sheets에서 '{sheet_name}' {months[0]}~{months[-1]} 로드 성공")
+        return concat_pages(list(pages.values()))
+    except Exception as e:
+        st.warning(f"Google Sheets '{sheet_name}' 구간 로드 실패: {e}")
+
+    pages = [load_snapshot(page_key(sheet_name, month)) for month in months]
+    if all(page is not None for page in pages):
+        age = format_age(time.time() - min(page.attrs["fetched_at"] for page in pages))
+        st.info(f"💾 로컬 스냅샷에서 '{sheet_name}' 구간 로드 ({age})")
+        return concat_pages(pages)
+
+    df = _with_fallback(sheet_name, None, excel_sheet, date_range=month_span(months))
+    return select_months(df, date_col, months)
+
+def load_dataframe_with_fallback(
+    sheet_name: str,
+    excel_sheet: str = None,
+    date_range: Optional[DateRange] = None
+) -> pd.DataFrame:
+    """
+    Google Sheets 우선 로드, 실패 시 로컬 스냅샷 → Excel 순으로 폴백
+
+    date_range(시작일, 종료일)를 주면 날짜 구간 워크시트(daily)는
+    해당 구간이 걸친 월의 행만 읽는다.
+    """
+    if date_range is not None and sheet_name in WINDOWED_SHEETS:
+        return _load_window(sheet_name, date_range, excel_sheet)
+    return _with_fallback(sheet_name, _load_from_gsheets(sheet_name), excel_sheet)
+
+def load_dataframes_with_fallback(sheet_names: List[str]) -> Dict[str, pd.DataFrame]:
+    """여러 워크시트를 한 번의 요청으로 로드, 실패한 시트는 개별 폴백"""
+    try:
+        frames = fetch_worksheets(sheet_names)
+        st.success(f"✅ Google Sheets에서 {len(frames)}개 워크시트 일괄 로드 성공")
+    except Exception as e:
+        st.warning(f"Google Sheets 일괄 로드 실패: {e}")
+        frames = {}
+    return {name: _with_fallback(name, frames.get(name)) for name in sheet_names}
+
 def save_dataframe_to_gsheets(df: pd.DataFrame, sheet_name: str) -> bool:
     """데이터프레임을 Google Sheets에 저장"""
     try:
-        client = _init_gs_client()
-        if client is None:
-            st.error("Google Sheets 클라이언트 초기화 실패")
-            return False
-            
-        url = st.secrets["connections"]["gsheets"]["spreadsheet"]
-        sh = client.open_by_url(url)
-        
-        try:
-            ws = sh.worksheet(sheet_name)
-            ws.clear()
-        except gspread.WorksheetNotFound:
-            ws = sh.add_worksheet(title=sheet_name, rows=1000, cols=20)
-        
-        # 헤더 포함하여 업데이트
-        data = [df.columns.tolist()] + df.values.tolist()
-        ws.update(data)
-        
+        get_sheets_client().write(sheet_name, df)
         st.success(f"✅ Google Sheets '{sheet_name}' 저장 성공")
         return True
     except Exception as e:
@@ -104,13 +154,9 @@ def save_dataframe_to_gsheets(df: pd.DataFrame, sheet_name: str) -> bool:
         return False
 
 def get_excel_sheet_names(path: str = BACKUP_EXCEL_PATH) -> list:
-    """Excel 파일의 시트 목록 조회"""
+    """Excel 파일의 시트 목록 조회 (열린 백업 리더 재사용)"""
     try:
-        if not os.path.isabs(path):
-            path = os.path.join(os.getcwd(), path)
-        if not os.path.exists(path):
-            return []
-        xl = pd.ExcelFile(path)
-        return xl.sheet_names
+        backup = get_excel_backup(path)
+        return backup.sheet_names if backup is not None else []
     except Exception:
         return []
@@ -0,0 +1,267 @@
+# utils/excel_backup.py
+import os
+import re
+import threading
+import zipfile
+import xml.etree.ElementTree as ET
+from collections import OrderedDict
+from datetime import date, datetime
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+import streamlit as st
+from pandas.io.parsers import TextParser
+from utils.metrics import track_load
+from utils.shared_frames import freeze, view
+from utils.workbook_cache import sheet_members
+
+# Google Sheets 장애 시 마지막으로 쓰는 Excel 백업
+BACKUP_EXCEL_PATH = "data/data_250628_1800.xlsx"
+
+# 워크북당 보관하는 읽기 결과 수 (시트 × 컬럼 × 날짜 구간)
+RESULT_ENTRIES = 16
+
+DateRange = Tuple[date, date]
+
+_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+_ROW, _C, _V, _IS, _T = (f"{_NS}{tag}" for tag in ("row", "c", "v", "is", "t"))
+_COL = re.compile(r"[A-Z]+")
+# 값 없이 서식만 있는 셀 (<c r="A1" s="3"/>). 행 전체에 서식을 준 시트는 이런 셀이 수십만 개라 파서에 넘기기 전에 제거
+_EMPTY_CELL = re.compile(rb'<c r="[A-Z]+[0-9]+"[^>]*/>')
+_CHUNK = 1 << 16
+
+def _column_index(ref: str) -> int:
+    """셀 주소(A1)의 0부터 시작하는 열 번호"""
+    idx = 0
+    for ch in _COL.match(ref).group():
+        idx = idx * 26 + ord(ch) - 64
+    return idx - 1
+
+def _as_date(value) -> Optional[date]:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value.strip()).date()
+        except ValueError:
+            return None
+    return None
+
+class ExcelBackup:
+    """
+    백업 워크북 스트리밍 리더 (읽기 전용, 워크북 버전당 1개를 세션 간 공유)
+
+    - zip은 한 번만 열고 공유 문자열/날짜 서식/시트 위치도 처음 한 번만 파싱
+    - 시트 XML을 행 단위로 흘려 읽으며 값이 없는 셀(서식만 있는 빈 셀)은 건너뜀
+    - 요청한 컬럼과 날짜 구간에 속하는 행만 남기고, 결과는 고정하여 재사용
+
+    셀 변환과 DataFrame 생성은 pd.read_excel(openpyxl)과 같은 규칙을 따른다.
+    """
+
+    def __init__(self, path: str):
+        from openpyxl.styles.numbers import BUILTIN_FORMATS, is_date_format, is_timedelta_format
+        from openpyxl.utils.datetime import CALENDAR_MAC_1904, WINDOWS_EPOCH
+
+        self.path = path
+        self._lock = threading.Lock()
+        self._zip = zipfile.ZipFile(path)
+        self._members = sheet_members(self._zip)
+        self.sheet_names = list(self._members)
+        self._results: "OrderedDict[tuple, pd.DataFrame]" = OrderedDict()
+
+        workbook = ET.fromstring(self._zip.read("xl/workbook.xml"))
+        pr = workbook.find(f"{_NS}workbookPr")
+        date1904 = pr is not None and pr.get("date1904") in ("1", "true")
+        self._epoch = CALENDAR_MAC_1904 if date1904 else WINDOWS_EPOCH
+
+        # 셀 스타일 번호 → 날짜/기간 서식 여부
+        self._date_styles: set = set()
+        self._timedelta_styles: set = set()
+        if "xl/styles.xml" in self._zip.NameToInfo:
+            styles = ET.fromstring(self._zip.read("xl/styles.xml"))
+            custom = {
+                int(fmt.get("numFmtId")): fmt.get("formatCode", "")
+                for fmt in styles.iter(f"{_NS}numFmt")
+            }
+            xfs = styles.find(f"{_NS}cellXfs")
+            for i, xf in enumerate(xfs if xfs is not None else []):
+                fmt_id = int(xf.get("numFmtId", 0))
+                code = custom.get(fmt_id, BUILTIN_FORMATS.get(fmt_id, "General"))
+                if is_date_format(code):
+                    self._date_styles.add(i)
+                    if is_timedelta_format(code):
+                        self._timedelta_styles.add(i)
+
+        self._strings: List[str] = []
+        if "xl/sharedStrings.xml" in self._zip.NameToInfo:
+            with self._zip.open("xl/sharedStrings.xml") as src:
+                for _, si in ET.iterparse(src):
+                    if si.tag == f"{_NS}si":
+                        self._strings.append("".join(t.text or "" for t in si.iter(_T)))
+                        si.clear()
+
+    def _cell(self, c: ET.Element):
+        """셀 값 (값이 없으면 None, 숫자는 정수면 int)"""
+        from openpyxl.utils.datetime import from_excel
+
+        kind = c.get("t", "n")
+        if kind == "inlineStr":
+            node = c.find(_IS)
+            return "".join(t.text or "" for t in node.iter(_T)) if node is not None else None
+        raw = c.findtext(_V)
+        if not raw:
+            return None
+        if kind == "s":
+            return self._strings[int(raw)]
+        if kind == "str":
+            return raw
+        if kind == "b":
+            return bool(int(raw))
+        if kind == "e":
+            return np.nan
+        if kind == "d":
+            return datetime.fromisoformat(raw)
+
+        number = float(raw)
+        style = int(c.get("s", 0))
+        if style in self._date_styles:
+            try:
+                return from_excel(number, self._epoch, timedelta=style in self._timedelta_styles)
+            except (OverflowError, ValueError):
+                return np.nan
+        return int(number) if number.is_integer() else number
+
+    def _elements(self, member: str):
+        """시트 XML을 조각 단위로 압축 해제하며 빈 셀을 걷어내고 파싱 (완성된 요소 순서대로)"""
+        parser = ET.XMLPullParser(events=("end",))
+        pending = b""
+        with self._zip.open(member) as src:
+            for chunk in iter(lambda: src.read(_CHUNK), b""):
+                buf = pending + chunk
+                cut = buf.rfind(b">") + 1
+                pending = buf[cut:]
+                parser.feed(_EMPTY_CELL.sub(b"", buf[:cut]))
+                for _, elem in parser.read_events():
+                    yield elem
+        parser.feed(pending)
+        parser.close()
+        for _, elem in parser.read_events():
+            yield elem
+
+    def _rows(self, sheet: str):
+        """(시트 행 번호, 값이 있는 셀 {열 번호: 값}) (값이 하나도 없는 행은 건너뜀)"""
+        member = self._members.get(sheet)
+        if member is None:
+            raise ValueError(f"Worksheet named '{sheet}' not found")
+        row_no = 0
+        for elem in self._elements(member):
+            if elem.tag != _ROW:
+                continue
+            ref = elem.get("r")
+            row_no = int(ref) if ref else row_no + 1
+            cells: Dict[int, object] = {}
+            col = -1
+            for c in elem.iter(_C):
+                ref = c.get("r")
+                col = _column_index(ref) if ref else col + 1
+                value = self._cell(c)
+                if value is not None:
+                    cells[col] = value
+            elem.clear()
+            if cells:
+                yield row_no, cells
+
+    def _read(
+        self,
+        sheet: str,
+        columns: Optional[List[str]],
+        date_col: Optional[str],
+        date_range: Optional[DateRange]
+    ) -> pd.DataFrame:
+        # read_excel처럼 1행부터 채움 (중간의 빈 행은 빈 행으로 유지, 끝의 빈 행은 버림)
+        sheet_rows: List[Dict[int, object]] = []
+        for row_no, cells in self._rows(sheet):
+            sheet_rows.extend({} for _ in range(row_no - 1 - len(sheet_rows)))
+            sheet_rows.append(cells)
+        if not sheet_rows:
+            return pd.DataFrame()
+        first, rows = sheet_rows[0], sheet_rows[1:]
+        header = [first.get(i, "") for i in range(max(first) + 1 if first else 0)]
+        keep = None if columns is None else [header.index(c) for c in columns if c in header]
+
+        date_idx = header.index(date_col) if date_col in header else None
+        if date_range is not None and date_idx is not None:
+            start, end = sorted(date_range)
+            in_range = lambda cells: (d := _as_date(cells.get(date_idx))) is not None and start <= d <= end
+        else:
+            in_range = None
+
+        data = [cells for cells in rows if in_range is None or in_range(cells)]
+        if keep is None:
+            width = max([len(header)] + [max(cells) + 1 for cells in data if cells])
+            keep = range(width)
+            header = header + [""] * (width - len(header))
+        return TextParser(
+            [[header[i] for i in keep]] + [[cells.get(i, "") for i in keep] for cells in data],
+            header=0
+        ).read()
+
+    def read(
+        self,
+        sheet: str,
+        columns: Optional[List[str]] = None,
+        date_col: Optional[str] = None,
+        date_range: Optional[DateRange] = None
+    ) -> pd.DataFrame:
+        """
+        시트 읽기 (결과는 공유 사본의 view)
+
+        columns: 남길 컬럼 (없는 이름은 무시, None이면 전체)
+        date_col/date_range: 날짜 컬럼 값이 구간(양 끝 포함)에 드는 행만
+        """
+        key = (sheet, tuple(columns) if columns is not None else None, date_col, date_range)
+        with self._lock:
+            df = self._results.get(key)
+            if df is None:
+                df = freeze(self._read(sheet, columns, date_col, date_range))
+                self._results[key] = df
+                while len(self._results) > RESULT_ENTRIES:
+                    self._results.popitem(last=False)
+            else:
+                self._results.move_to_end(key)
+        return view(df)
+
+@st.cache_resource(max_entries=2, show_spinner=False)
+def _open_backup(path: str, mtime_ns: int) -> ExcelBackup:
+    return ExcelBackup(path)
+
+def get_excel_backup(path: str = BACKUP_EXCEL_PATH) -> Optional[ExcelBackup]:
+    """백업 워크북 리더 (파일이 없으면 None, 파일이 바뀌면 새로 열림)"""
+    if not os.path.isabs(path):
+        path = os.path.join(os.getcwd(), path)
+    if not os.path.exists(path):
+        return None
+    return _open_backup(path, os.stat(path).st_mtime_ns)
+
+def read_backup(
+    sheet: str,
+    columns: Optional[List[str]] = None,
+    date_col: Optional[str] = None,
+    date_range: Optional[DateRange] = None,
+    path: str = BACKUP_EXCEL_PATH
+) -> Optional[pd.DataFrame]:
+    """
+    백업 워크북에서 시트 읽기 (파일이 없으면 None, 읽기 실패 시 예외)
+
+    attrs: fetched_at = 백업 파일 수정 시각, source = "excel"
+    """
+    backup = get_excel_backup(path)
+    if backup is None:
+        return None
+    with track_load("excel", sheet) as rec:
+        df = backup.read(sheet, columns, date_col, date_range)
+        rec.update(rows=len(df))
+    df.attrs.update(fetched_at=os.path.getmtime(backup.path), source="excel")
+    return df
@@ -0,0 +1,131 @@
+# utils/flow_control.py
+import threading
+import time
+from typing import Callable, Dict, Hashable, List, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+class RateLimited(Exception):
+    """요청 한도 대기 시간이 max_wait를 넘어 요청을 보내지 않음"""
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
+
+class SingleFlight:
+    """
+    같은 키의 동시 호출을 한 번의 실행으로 합침
+
+    먼저 온 호출(leader)만 실제로 실행하고, 실행 중에 들어온 같은 키의 호출은
+    그 결과(또는 예외)를 그대로 받는다. 실행이 끝나면 키는 바로 비워지므로 결과를
+    캐시하지는 않는다 (캐시는 호출 측 책임).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> Tuple[T, bool]:
+        """
+        Returns:
+            (결과, 다른 호출의 결과를 받았는지 여부)
+        """
+        result = self.do_many([key], lambda keys: {key: fn()})
+        return result[0][key], key in result[1]
+
+    def do_many(
+        self,
+        keys: List[Hashable],
+        fn: Callable[[List[Hashable]], Dict[Hashable, T]]
+    ) -> Tuple[Dict[Hashable, T], List[Hashable]]:
+        """
+        여러 키를 한 번에 (이미 실행 중인 키는 기다리고 나머지만 fn(키 목록)으로 실행)
+
+        Returns:
+            ({키: 결과}, 다른 호출의 결과를 받은 키 목록)
+        """
+        with self._lock:
+            theirs = {k: self._calls[k] for k in keys if k in self._calls}
+            mine = {k: _Call() for k in dict.fromkeys(keys) if k not in theirs}
+            self._calls.update(mine)
+
+        results: Dict[Hashable, T] = {}
+        if mine:
+            try:
+                results = fn(list(mine))
+                for k, call in mine.items():
+                    call.result = results.get(k)
+            except BaseException as e:
+                for call in mine.values():
+                    call.error = e
+                raise
+            finally:
+                with self._lock:
+                    for k in mine:
+                        self._calls.pop(k, None)
+                for call in mine.values():
+                    call.done.set()
+
+        for k, call in theirs.items():
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            results[k] = call.result
+        return {k: results[k] for k in keys}, list(theirs)
+
+class TokenBucket:
+    """
+    요청 한도용 토큰 버킷 (rate개/초로 채워지고 최대 capacity개까지 모음)
+
+    acquire()는 토큰이 생길 때까지 기다리며, 기다릴 시간이 max_wait를 넘으면
+    기다리지 않고 RateLimited를 던진다. rate가 0 이하면 제한 없음.
+    """
+
+    def __init__(self, rate: float, capacity: float, max_wait: float = 10.0):
+        self.rate = rate
+        self.capacity = max(1.0, capacity)
+        self.max_wait = max_wait
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _fill(self, now: float):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """
+        토큰 사용 (필요하면 대기)
+
+        Returns:
+            대기한 시간 (초)
+        """
+        if self.rate <= 0:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            self._fill(now)
+            # 먼저 예약하고 모자란 만큼 기다림 (동시 호출은 순서대로 뒤에 줄을 섬)
+            wait = max(0.0, (tokens - self._tokens) / self.rate)
+            if wait > self.max_wait:
+                raise RateLimited(f"요청 한도 대기 {wait:.1f}초 > {self.max_wait:.0f}초")
+            self._tokens -= tokens
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    def drain(self):
+        """원격에서 한도 초과(429)를 받았을 때 모아 둔 토큰을 비움 (이후 요청은 rate 속도로만)"""
+        with self._lock:
+            self._fill(time.monotonic())
+            self._tokens = min(self._tokens, 0.0)
+
+    @property
+    def available(self) -> float:
+        with self._lock:
+            self._fill(time.monotonic())
+            return self._tokens
@@ -0,0 +1,33 @@
+# utils/fragments.py
+import functools
+from typing import Callable, TypeVar
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+from utils.metrics import METRICS
+
+F = TypeVar("F", bound=Callable)
+
+def panel(label: str) -> Callable[[F], F]:
+    """
+    독립적으로 다시 실행되는 화면 영역 (st.fragment)
+
+    영역 안의 위젯이 바뀌면 앱 전체(헤더/사이드바/데이터 로드) 대신 이 함수만 다시 실행된다.
+    실행 시간은 render_seconds{page=label}로 기록.
+    bare 모드(벤치마크 등 ScriptRunContext 없음)에서는 st.fragment가 아무것도 그리지 않으므로 일반 함수로 실행.
+    """
+    def decorate(fn: F) -> F:
+        @functools.wraps(fn)
+        def timed(*args, **kwargs):
+            with METRICS.timer("render_seconds", page=label):
+                return fn(*args, **kwargs)
+
+        fragment = st.fragment(timed)
+
+        @functools.wraps(fn)
+        def run(*args, **kwargs):
+            if get_script_run_ctx(suppress_warning=True) is None:
+                return timed(*args, **kwargs)
+            return fragment(*args, **kwargs)
+
+        return run  # type: ignore[return-value]
+    return decorate
@@ -0,0 +1,19 @@
+# utils/game_time.py
+from datetime import date, datetime, timedelta, timezone
+from typing import Optional
+
+# 한국 시간대
+KST = timezone(timedelta(hours=9))
+# 게임 서버 시간 = 한국시간 - 11시간 (KST 11시에 게임 날짜가 바뀜)
+SERVER_OFFSET = timedelta(hours=11)
+
+def kst_now() -> datetime:
+    return datetime.now(timezone.utc).astimezone(KST)
+
+def server_now(now: Optional[datetime] = None) -> datetime:
+    """게임 서버 시간 (now: 기준 시각, 기본 현재)"""
+    return (now or kst_now()).astimezone(KST) - SERVER_OFFSET
+
+def game_day(now: Optional[datetime] = None) -> date:
+    """현재 게임 날짜 (KST 11시 전이면 전날, 서버 시간대와 무관)"""
+    return server_now(now).date()
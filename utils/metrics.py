@@ -0,0 +1,247 @@
+# utils/metrics.py
+import bisect
+import math
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Deque, Dict, Iterable, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# 지연 시간 히스토그램 구간 (초)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# 분위수 계산용 최근 표본 수
+RECENT_SAMPLES = 512
+
+# 페이지 렌더링 p95 목표 (초)
+RENDER_SLO_SECONDS = float(os.environ.get("PZTK_RENDER_SLO", 2.0))
+# Prometheus 텍스트 파일 출력 경로 (node_exporter textfile collector용, 비우면 비활성)
+METRICS_TEXTFILE = os.environ.get("PZTK_METRICS_FILE", "")
+TEXTFILE_INTERVAL = 15.0
+
+PREFIX = "pztk_"
+
+Labels = Tuple[Tuple[str, str], ...]
+
+def _labels(labels: dict) -> Labels:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+def _format_labels(labels: Labels, extra: Iterable[Tuple[str, str]] = ()) -> str:
+    items = list(labels) + list(extra)
+    if not items:
+        return ""
+    escaped = (v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, v in items)
+    return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(items, escaped)) + "}"
+
+class Histogram:
+    """누적 구간 카운트 + 최근 표본 (분위수 표시용)"""
+
+    def __init__(self):
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.recent: Deque[float] = deque(maxlen=RECENT_SAMPLES)
+        self.last_at = 0.0
+
+    def observe(self, value: float):
+        self.buckets[bisect.bisect_left(LATENCY_BUCKETS, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.recent.append(value)
+        self.last_at = time.time()
+
+    def quantile(self, q: float) -> float:
+        if not self.recent:
+            return math.nan
+        ordered = sorted(self.recent)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+class MetricsRegistry:
+    """
+    프로세스 내 지표 집계 (히스토그램/카운터/게이지)
+
+    모든 세션과 백그라운드 스레드가 같은 객체에 기록한다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._hist: Dict[Tuple[str, Labels], Histogram] = {}
+        self._counters: Dict[Tuple[str, Labels], float] = {}
+        self._gauges: Dict[Tuple[str, Labels], float] = {}
+        self._help: Dict[str, str] = {}
+        self._written_at = 0.0
+
+    def describe(self, name: str, text: str):
+        self._help[name] = text
+
+    def observe(self, name: str, value: float, **labels):
+        key = (name, _labels(labels))
+        with self._lock:
+            hist = self._hist.get(key)
+            if hist is None:
+                hist = self._hist[key] = Histogram()
+            hist.observe(value)
+
+    def inc(self, name: str, value: float = 1.0, **labels):
+        key = (name, _labels(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0.0) + value
+
+    def set(self, name: str, value: float, **labels):
+        with self._lock:
+            self._gauges[(name, _labels(labels))] = value
+
+    @contextmanager
+    def timer(self, name: str, **labels):
+        """블록 실행 시간(초)을 히스토그램에 기록 (예외가 나도 기록)"""
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - t0, **labels)
+
+    def reset(self):
+        with self._lock:
+            self._hist.clear()
+            self._counters.clear()
+            self._gauges.clear()
+
+    def histograms(self, name: str) -> "pd.DataFrame":
+        """히스토그램 요약 (라벨별 호출 수, 평균/p50/p95/최대, 마지막 기록 시각)"""
+        import pandas as pd
+        with self._lock:
+            rows = [
+                {
+                    **dict(labels),
+                    "calls": h.count,
+                    "mean_ms": h.sum / h.count * 1000 if h.count else math.nan,
+                    "p50_ms": h.quantile(0.5) * 1000,
+                    "p95_ms": h.quantile(0.95) * 1000,
+                    "max_ms": max(h.recent) * 1000 if h.recent else math.nan,
+                    "last": time.strftime("%H:%M:%S", time.localtime(h.last_at)),
+                }
+                for (n, labels), h in self._hist.items() if n == name
+            ]
+        return pd.DataFrame(rows)
+
+    def values(self, name: str, gauge: bool = False) -> "pd.DataFrame":
+        """카운터(또는 게이지) 값 목록"""
+        import pandas as pd
+        with self._lock:
+            source = self._gauges if gauge else self._counters
+            rows = [{**dict(labels), "value": v} for (n, labels), v in source.items() if n == name]
+        return pd.DataFrame(rows)
+
+    def to_prometheus(self) -> str:
+        """Prometheus 텍스트 형식 출력"""
+        lines: List[str] = []
+        with self._lock:
+            families: Dict[str, List[str]] = {}
+
+            for (name, labels), h in sorted(self._hist.items()):
+                out = families.setdefault(f"{name}\thistogram", [])
+                cumulative = 0
+                for bound, count in zip(LATENCY_BUCKETS, h.buckets):
+                    cumulative += count
+                    out.append(f"{PREFIX}{name}_bucket{_format_labels(labels, [('le', repr(bound))])} {cumulative}")
+                out.append(f"{PREFIX}{name}_bucket{_format_labels(labels, [('le', '+Inf')])} {h.count}")
+                out.append(f"{PREFIX}{name}_sum{_format_labels(labels)} {h.sum:.6f}")
+                out.append(f"{PREFIX}{name}_count{_format_labels(labels)} {h.count}")
+            for kind, source in (("counter", self._counters), ("gauge", self._gauges)):
+                for (name, labels), value in sorted(source.items()):
+                    families.setdefault(f"{name}\t{kind}", []).append(
+                        f"{PREFIX}{name}{_format_labels(labels)} {value:g}"
+                    )
+
+            for family, samples in families.items():
+                name, kind = family.split("\t")
+                if name in self._help:
+                    lines.append(f"# HELP {PREFIX}{name} {self._help[name]}")
+                lines.append(f"# TYPE {PREFIX}{name} {kind}")
+                lines.extend(samples)
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self, path: str = METRICS_TEXTFILE, min_interval: float = TEXTFILE_INTERVAL):
+        """Prometheus 텍스트 파일 갱신 (경로가 없으면 무시, min_interval초 이내 재호출은 생략)"""
+        now = time.time()
+        if not path or now - self._written_at < min_interval:
+            return
+        self._written_at = now
+        tmp = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.write(self.to_prometheus())
+            os.replace(tmp, path)
+        except OSError:
+            pass
+
+METRICS = MetricsRegistry()
+METRICS.describe("load_seconds", "Loader call latency in seconds")
+METRICS.describe("load_rows_total", "Rows returned by loaders")
+METRICS.describe("load_bytes_total", "Approximate bytes read by loaders")
+METRICS.describe("load_errors_total", "Failed loader calls")
+METRICS.describe("cache_requests_total", "Cache lookups by result (hit, stale, miss)")
+METRICS.describe("cache_age_seconds", "Age of the cached copy served by the last lookup")
+METRICS.describe("render_seconds", "Page render time in seconds")
+METRICS.describe("stage_seconds", "Time spent in named hot-path stages")
+
+def frame_bytes(values: List[list]) -> int:
+    """values API 결과의 대략적인 크기 (셀 문자열 길이 합)"""
+    return sum(len(str(cell)) for row in values for cell in row)
+
+def observe_load(loader: str, sheet: str, seconds: float, rows: int = 0, nbytes: int = 0, ok: bool = True):
+    """로더 호출 1회 기록"""
+    METRICS.observe("load_seconds", seconds, loader=loader, sheet=sheet)
+    if ok:
+        METRICS.inc("load_rows_total", rows, loader=loader, sheet=sheet)
+        METRICS.inc("load_bytes_total", nbytes, loader=loader, sheet=sheet)
+    else:
+        METRICS.inc("load_errors_total", loader=loader, sheet=sheet)
+
+@contextmanager
+def track_load(loader: str, sheet: str):
+    """
+    로더 호출 시간 기록용 블록
+
+        with track_load("excel", name) as rec:
+            df = ...
+            rec.update(rows=len(df), nbytes=...)
+
+    블록에서 예외가 나면 오류로 기록하고 다시 던진다.
+    """
+    rec = {"rows": 0, "nbytes": 0}
+    t0 = time.perf_counter()
+    try:
+        yield rec
+    except Exception:
+        observe_load(loader, sheet, time.perf_counter() - t0, ok=False)
+        raise
+    observe_load(loader, sheet, time.perf_counter() - t0, rec["rows"], rec["nbytes"])
+
+def record_cache(cache: str, key: str, result: str, age: Optional[float] = None):
+    """캐시 조회 결과 기록 (result: hit | stale | miss | not_modified | coalesced | shared)"""
+    METRICS.inc("cache_requests_total", cache=cache, key=key, result=result)
+    if age is not None:
+        METRICS.set("cache_age_seconds", age, cache=cache, key=key)
+
+_probe = threading.local()
+_built_at: Dict[str, float] = {}
+
+def mark_miss(cache: str):
+    """st.cache_* 함수 본문에서 호출 (본문이 실행됐다 = 캐시 미스)"""
+    _probe.missed = True
+    _built_at[cache] = time.time()
+
+@contextmanager
+def cache_probe(cache: str, key: str = ""):
+    """st.cache_* 함수 호출을 감싸 hit/miss와 캐시 나이를 기록"""
+    _probe.missed = False
+    yield
+    built = _built_at.get(cache)
+    record_cache(
+        cache, key, "miss" if _probe.missed else "hit",
+        age=time.time() - built if built is not None else None
+    )
@@ -0,0 +1,142 @@
+# utils/roster_plan.py
+import io
+from dataclasses import dataclass
+from typing import Dict, List
+import numpy as np
+import pandas as pd
+from utils.calc_tables import RangeTable, range_costs
+
+# 명단 컬럼 → 허용하는 헤더 이름 (대소문자/공백/기호 무시)
+ROSTER_COLUMNS: Dict[str, List[str]] = {
+    "member":   ["member", "name", "멤버", "이름", "닉네임"],
+    "category": ["category", "카테고리", "항목"],
+    "current":  ["current", "from", "현재", "현재레벨"],
+    "target":   ["target", "to", "목표", "목표레벨"],
+}
+
+STATUS_OK = "정상"
+STATUS_UNKNOWN_CATEGORY = "카테고리 없음"
+STATUS_UNKNOWN_LEVEL = "레벨 없음"
+STATUS_BELOW = "목표가 현재보다 낮음"
+STATUS_MISSING = "데이터 미준비"
+
+def _norm_name(name) -> str:
+    """이름 비교용 (소문자, 글자/숫자만)"""
+    return "".join(ch for ch in str(name).lower() if ch.isalnum())
+
+@dataclass(frozen=True)
+class RosterPlan:
+    """
+    명단 일괄 계산 결과
+
+    rows: 입력 행 + status + 자원 컬럼 (정상이 아닌 행은 자원 0)
+    members: 멤버별 자원 합계 (정상 행만, rows = 계산한 행 수)
+    totals: 연맹 전체 자원 합계
+    resources: 결과에 나오는 자원 컬럼 (카테고리 순서)
+    """
+    rows: pd.DataFrame
+    members: pd.DataFrame
+    totals: pd.Series
+    resources: List[str]
+
+    @property
+    def issues(self) -> pd.DataFrame:
+        """정상이 아닌 행"""
+        return self.rows[self.rows["status"] != STATUS_OK]
+
+def read_roster(data: bytes, name: str) -> pd.DataFrame:
+    """
+    업로드한 CSV/Excel(첫 시트)을 member/category/current/target 표로 변환
+
+    CSV는 UTF-8(BOM 포함)과 CP949(한글 Excel 저장)를 모두 읽는다.
+
+    Raises:
+        ValueError: 필수 컬럼이 없음
+    """
+    if name.lower().endswith((".xlsx", ".xlsm", ".xls")):
+        df = pd.read_excel(io.BytesIO(data), dtype=object)
+    else:
+        try:
+            df = pd.read_csv(io.BytesIO(data), dtype=str, encoding="utf-8-sig", skipinitialspace=True)
+        except UnicodeDecodeError:
+            df = pd.read_csv(io.BytesIO(data), dtype=str, encoding="cp949", skipinitialspace=True)
+
+    aliases = {_norm_name(a): col for col, names in ROSTER_COLUMNS.items() for a in names}
+    df = df.rename(columns={c: aliases[_norm_name(c)] for c in df.columns if _norm_name(c) in aliases})
+    missing = [c for c in ROSTER_COLUMNS if c not in df.columns]
+    if missing:
+        raise ValueError(f"필수 컬럼이 없습니다: {', '.join(missing)} (필요: {', '.join(ROSTER_COLUMNS)})")
+    df = df[list(ROSTER_COLUMNS)].dropna(how="all").reset_index(drop=True)
+    df["member"] = df["member"].astype(str).str.strip()
+    return df
+
+def _positions(table: RangeTable, values: pd.Series) -> pd.Series:
+    """레벨 값 → 누적합 행 위치 (없는 레벨은 NaN)"""
+    if table.ordinal:
+        # 업로드 값은 문자열이므로 레벨 이름도 문자열로 맞춰 비교 (숫자가 섞인 이름 컬럼 대비)
+        return values.astype(str).str.strip().map({str(k).strip(): v for k, v in table.positions.items()})
+    return pd.to_numeric(values, errors="coerce").map(table.positions)
+
+def plan_roster(roster: pd.DataFrame, tables: Dict[str, RangeTable], categories: Dict[str, str]) -> RosterPlan:
+    """
+    명단 전체의 필요 자원을 카테고리별 한 번의 배열 연산으로 계산
+
+    Args:
+        roster: read_roster 결과
+        tables: 카테고리 키 → 누적합 테이블
+        categories: 표시 이름 → 카테고리 키 (키 자체도 이름으로 허용)
+    """
+    lookup = {_norm_name(name): key for name, key in categories.items()}
+    lookup.update({_norm_name(key): key for key in tables})
+    # 고유값만 정규화 (Arrow 문자열 정규식은 한글을 \w로 보지 않아 파이썬에서 처리)
+    keys = roster["category"].map({c: lookup.get(_norm_name(c)) for c in roster["category"].unique()})
+
+    resources: List[str] = []
+    for table in tables.values():
+        resources += [c for c in table.val_cols if c not in resources]
+    res_pos = {c: i for i, c in enumerate(resources)}
+
+    n = len(roster)
+    need = np.zeros((n, len(resources)), dtype=np.float64)
+    status = np.full(n, STATUS_UNKNOWN_CATEGORY, dtype=object)
+    used: set = set()
+
+    for key, idx in keys.groupby(keys, sort=False).indices.items():
+        table = tables.get(key)
+        if table is None:
+            continue
+        cur = _positions(table, roster["current"].iloc[idx]).to_numpy(dtype=np.float64)
+        tgt = _positions(table, roster["target"].iloc[idx]).to_numpy(dtype=np.float64)
+        known = ~(np.isnan(cur) | np.isnan(tgt))
+        status[idx[~known]] = STATUS_UNKNOWN_LEVEL
+
+        rows = idx[known]
+        i_curr, i_tgt = cur[known].astype(np.int64), tgt[known].astype(np.int64)
+        costs, ok = range_costs(table, i_curr, i_tgt)
+        status[rows] = np.where(ok, STATUS_OK, np.where(i_tgt < i_curr, STATUS_BELOW, STATUS_MISSING))
+        cols = [res_pos[c] for c in table.val_cols]
+        need[np.ix_(rows, cols)] = costs
+        if ok.any():
+            used.update(table.val_cols)
+
+    resources = [c for c in resources if c in used]
+    amounts = pd.DataFrame(need[:, [res_pos[c] for c in resources]], columns=resources)
+    out = roster.assign(category_key=keys, status=status)
+    out = pd.concat([out, amounts], axis=1)
+
+    ok_rows = out[out["status"] == STATUS_OK]
+    members = ok_rows.groupby("member", sort=True)[resources].sum()
+    members.insert(0, "rows", ok_rows.groupby("member", sort=True).size())
+    return RosterPlan(rows=out, members=members, totals=amounts.sum(), resources=resources)
+
+def roster_template(tables: Dict[str, RangeTable]) -> bytes:
+    """업로드 양식 CSV (카테고리마다 예시 1행, Excel에서 한글이 깨지지 않도록 BOM 포함)"""
+    rows = [
+        {"member": "멤버1", "category": key, "current": t.labels[0], "target": t.labels[min(5, len(t.labels) - 1)]}
+        for key, t in tables.items() if t.labels
+    ]
+    return to_csv_bytes(pd.DataFrame(rows, columns=list(ROSTER_COLUMNS)))
+
+def to_csv_bytes(df: pd.DataFrame, index: bool = False) -> bytes:
+    """다운로드용 CSV (UTF-8 BOM)"""
+    return df.to_csv(index=index).encode("utf-8-sig")
@@ -0,0 +1,200 @@
+# utils/schedule_export.py
+import hashlib
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, Iterator, List, Optional, TextIO, Tuple
+import pandas as pd
+from utils.dashboard_view import DASHBOARD_SECTIONS, WEEKDAY_KR, digest_text
+from utils.schedule_index import CALENDAR_ITEMS, SECTIONS, recurring_keys
+
+# column/seq: 줄이 나온 시트 컬럼과 (날짜, 섹션, 컬럼) 안에서의 순번 (ICS UID용)
+EXPORT_COLUMNS = ["date", "section", "column", "seq", "line"]
+# 섹션 출력 순서 (대시보드 섹션 → 캘린더 항목)
+SECTION_ORDER = list(SECTIONS) + ["calendar"]
+
+# str.splitlines()와 같은 줄 구분 문자
+_LINE_BREAKS = r"\r\n|[\n\r\v\f\x1c\x1d\x1e\x85\u2028\u2029]"
+
+ICS_PRODID = "-//PZTK777//Schedule Export//KO"
+
+def _long_cells(df: pd.DataFrame, keys: pd.Series, suffix: str) -> pd.DataFrame:
+    """키별 첫 번째 행의 접미사 컬럼 셀 → (key, column, text) 긴 표 (빈 셀 제외)"""
+    cols = [c for c in df.columns if isinstance(c, str) and c.endswith(suffix)]
+    if not cols or df.empty:
+        return pd.DataFrame(columns=["key", "column", "text"])
+    wide = df[cols].assign(key=keys.to_numpy())
+    wide = wide[wide["key"].notna()].drop_duplicates("key", keep="first")
+    long = wide.melt(id_vars="key", var_name="column", value_name="text")
+    return long[long["text"].notna()]
+
+def expand_schedule(
+    daily: pd.DataFrame,
+    weekly: pd.DataFrame,
+    monthly: pd.DataFrame,
+    note: pd.DataFrame,
+    start: date,
+    end: date
+) -> pd.DataFrame:
+    """
+    날짜 구간(양 끝 포함)의 daily + weekly + monthly + note 일정을 한 번에 펼침
+
+    schedule_index의 하루치 병합 규칙과 같은 결과를 날짜별 반복 없이 계산한다.
+    섹션 줄은 섹션 안에서 중복 제거 후 정렬, 캘린더 줄("라벨: 내용")은 항목 순서대로.
+
+    Returns:
+        date / section / column / seq / line 긴 표 (날짜 → SECTION_ORDER → 줄 순서)
+    """
+    days = pd.date_range(start, end, freq="D")
+    if days.empty:
+        return pd.DataFrame(columns=EXPORT_COLUMNS)
+    calendar = pd.DataFrame({
+        "date": days,
+        "weekday": (days.dayofweek + 1).astype("float64"),
+        "mod": ((days.isocalendar().week.to_numpy().astype("int64") - 1) % 4).astype("float64"),
+    })
+
+    # 시트별로 (key, column, text)를 만든 뒤 날짜에 붙임 (note는 모든 날짜)
+    daily_keys = (
+        pd.to_datetime(daily["Date"], errors="coerce").dt.normalize().astype(calendar["date"].dtype)
+        if "Date" in daily.columns else pd.Series(dtype=calendar["date"].dtype)
+    )
+    parts = []
+    for cells, key_col in (
+        (_long_cells(daily, daily_keys, "_daily"), "date"),
+        (_long_cells(weekly, recurring_keys(weekly, "weekday"), "_weekly"), "weekday"),
+        (_long_cells(monthly, recurring_keys(monthly, "mod(weeknum,4)"), "_monthly"), "mod"),
+    ):
+        if not cells.empty:
+            keys = cells["key"].astype(calendar[key_col].dtype)
+            left = calendar[list(dict.fromkeys(["date", key_col]))]
+            parts.append(left.merge(cells.assign(key=keys), left_on=key_col, right_on="key"))
+    if not note.empty:
+        cells = _long_cells(note.iloc[:1], pd.Series([0]), "_contd")
+        if not cells.empty:
+            parts.append(calendar[["date"]].merge(cells, how="cross"))
+    if not parts:
+        return pd.DataFrame(columns=EXPORT_COLUMNS)
+
+    cells = pd.concat([p[["date", "column", "text"]] for p in parts], ignore_index=True)
+    lines = (
+        cells.assign(line=cells["text"].astype(str).str.split(_LINE_BREAKS, regex=True))
+        .explode("line")
+    )
+    lines["line"] = lines["line"].astype(str).str.strip()
+    lines = lines[lines["line"] != ""][["date", "column", "line"]]
+
+    section_of = {col: name for name, cols in SECTIONS.items() for col in cols}
+    sections = lines.assign(section=lines["column"].map(section_of)).dropna(subset=["section"])
+    sections = sections.drop_duplicates(["date", "section", "line"]).assign(item=0)
+
+    item_of = {col: (i, label) for i, (label, col) in enumerate(CALENDAR_ITEMS)}
+    items = lines[lines["column"].isin(item_of)].drop_duplicates(["date", "column", "line"])
+    # 캘린더는 항목 순서 → 항목 안에서 내용 순서 (라벨이 같아도 항목별로 정렬)
+    items = items.assign(
+        section="calendar",
+        item=items["column"].map(lambda c: item_of[c][0]),
+        order=items["line"],
+        line=items["column"].map(lambda c: item_of[c][1]) + ": " + items["line"],
+    )
+
+    out = pd.concat([sections.assign(order=sections["line"]), items], ignore_index=True)
+    out["section"] = pd.Categorical(out["section"], categories=SECTION_ORDER, ordered=True)
+    out = out.sort_values(["date", "section", "item", "order"], kind="stable", ignore_index=True)
+    out["date"] = out["date"].dt.date
+    out["section"] = out["section"].astype(str)
+    out["seq"] = out.groupby(["date", "section", "column"], sort=False).cumcount()
+    return out[EXPORT_COLUMNS]
+
+def iter_days(expanded: pd.DataFrame, start: date, end: date) -> Iterator[Tuple[date, Dict[str, List[str]]]]:
+    """날짜별 (날짜, {섹션: 줄 목록}) (줄이 없는 섹션/날짜도 빈 목록으로)"""
+    by_day: Dict[date, Dict[str, List[str]]] = {}
+    for day, section, line in zip(expanded["date"], expanded["section"], expanded["line"]):
+        by_day.setdefault(day, {}).setdefault(section, []).append(line)
+    day = start
+    while day <= end:
+        sections = by_day.get(day, {})
+        yield day, {name: sections.get(name, []) for name in SECTION_ORDER}
+        day += timedelta(days=1)
+
+def day_header(day: date) -> str:
+    return f"{day:%m/%d}({WEEKDAY_KR[day.weekday()]})"
+
+def write_csv(expanded: pd.DataFrame, fp: TextIO):
+    """섹션 줄 CSV (date, weekday, section, title, line / 캘린더 줄 제외)"""
+    titles = {key: copy_title for key, _, _, copy_title, _ in DASHBOARD_SECTIONS}
+    rows = expanded[expanded["section"].isin(titles)]
+    out = pd.DataFrame({
+        "date": rows["date"],
+        "weekday": [WEEKDAY_KR[d.weekday()] for d in rows["date"]],
+        "section": rows["section"],
+        "title": rows["section"].map(titles),
+        "line": rows["line"],
+    })
+    out.to_csv(fp, index=False, lineterminator="\n")
+
+def write_digest(expanded: pd.DataFrame, fp: TextIO, start: date, end: date, skip_empty: bool = True) -> int:
+    """
+    날짜별 채팅용 텍스트 (대시보드 '전체 내용 복사'와 같은 형식, 날짜 머리말 포함)
+
+    Returns:
+        쓴 날짜 수
+    """
+    written = 0
+    for day, sections in iter_days(expanded, start, end):
+        text = digest_text(sections)
+        if not text and skip_empty:
+            continue
+        fp.write(f"🗓️ {day_header(day)}\n{text or '일정 없음'}\n\n")
+        written += 1
+    return written
+
+def _ics_escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,").replace("\n", "\\n")
+
+def _ics_fold(line: str) -> str:
+    """RFC 5545 줄 접기 (75옥텟, UTF-8 문자 중간에서 자르지 않음)"""
+    out, chunk, size = [], [], 0
+    for ch in line:
+        n = len(ch.encode("utf-8"))
+        if size + n > (75 if not out else 74):
+            out.append("".join(chunk))
+            chunk, size = [], 0
+        chunk.append(ch)
+        size += n
+    out.append("".join(chunk))
+    return "\r\n ".join(out)
+
+def write_ics(
+    expanded: pd.DataFrame,
+    fp: TextIO,
+    name: str = "PZTK #777 일정",
+    stamp: Optional[datetime] = None
+) -> int:
+    """
+    캘린더 줄 → 하루 종일 VEVENT
+
+    UID는 (날짜, 시트 컬럼, 항목 안 순번)에서 만들고 내용은 SUMMARY에만 넣는다.
+    내용을 고친 뒤 다시 내보내면 캘린더 앱에서 중복 없이 같은 일정이 갱신된다.
+
+    Returns:
+        쓴 일정 수
+    """
+    stamp = (stamp or datetime.now(timezone.utc)).strftime("%Y%m%dT%H%M%SZ")
+    fp.write("\r\n".join([
+        "BEGIN:VCALENDAR", "VERSION:2.0", f"PRODID:{ICS_PRODID}", "CALSCALE:GREGORIAN",
+        _ics_fold(f"X-WR-CALNAME:{_ics_escape(name)}"), "X-WR-TIMEZONE:Asia/Seoul",
+    ]) + "\r\n")
+    rows = expanded[expanded["section"] == "calendar"]
+    for day, column, seq, line in zip(rows["date"], rows["column"], rows["seq"], rows["line"]):
+        uid = hashlib.sha1(f"{day.isoformat()}|{column}|{seq}".encode("utf-8")).hexdigest()[:20]
+        fp.write("\r\n".join([
+            "BEGIN:VEVENT",
+            f"UID:{uid}@pztk777",
+            f"DTSTAMP:{stamp}",
+            f"DTSTART;VALUE=DATE:{day:%Y%m%d}",
+            f"DTEND;VALUE=DATE:{day + timedelta(days=1):%Y%m%d}",
+            _ics_fold(f"SUMMARY:{_ics_escape(line)}"),
+            "TRANSP:TRANSPARENT",
+            "END:VEVENT",
+        ]) + "\r\n")
+    fp.write("END:VCALENDAR\r\n")
+    return len(rows)
@@ -0,0 +1,103 @@
+# utils/schedule_index.py
+from datetime import date
+from typing import Dict, List, Optional
+import pandas as pd
+from utils.data_extract import sort_content
+
+# 대시보드 섹션별 병합 컬럼
+SECTIONS: Dict[str, List[str]] = {
+    "notice":   ["notice_weekly", "notice_daily", "notice_contd"],
+    "schedule": ["schedule_weekly", "schedule_daily", "schedule_contd"],
+    "duel":     ["duel_weekly", "duel_daily", "duel_contd"],
+    "event":    ["event_weekly", "event_daily", "event_contd", "event_monthly"],
+    "package":  ["package_weekly", "package_daily", "package_contd", "package_monthly"],
+}
+
+# 7일 캘린더 항목 (한글 라벨, 컬럼)
+CALENDAR_ITEMS = [
+    ("일정", "schedule_daily"),
+    ("일정", "schedule_weekly"),
+    ("일정", "schedule_monthly"),
+    ("공지", "notice_daily"),
+    ("열차", "train_daily"),
+    ("훈련", "excercise_daily"),
+]
+
+def _row_cells(row: dict, suffix: str) -> Dict[str, str]:
+    """행에서 해당 시트 접미사 컬럼의 값만 문자열로 추출"""
+    return {
+        col: str(val) for col, val in row.items()
+        if isinstance(col, str) and col.endswith(suffix) and pd.notna(val)
+    }
+
+def recurring_keys(df: pd.DataFrame, col: str) -> pd.Series:
+    """
+    반복 일정 키 컬럼(weekday, mod(weeknum,4))을 정수로 정규화 (대시보드 인덱스/내보내기 공용)
+
+    Sheets를 거치며 텍스트가 된 값("1", " 2 ", "3.0")도 숫자 키와 같게 보고,
+    정수가 아닌 값은 결측으로 둔다.
+    """
+    if col not in df.columns:
+        return pd.Series(dtype="Int64")
+    values = df[col].map(lambda v: v.strip() if isinstance(v, str) else v)
+    numbers = pd.to_numeric(values, errors="coerce")
+    return numbers.where(numbers % 1 == 0).astype("Int64")
+
+def _rows_by_key(df: pd.DataFrame, keys: pd.Series, suffix: str) -> dict:
+    """키별 첫 번째 행 → 셀 맵"""
+    out: dict = {}
+    for key, row in zip(keys, df.to_dict("records")):
+        if pd.isna(key) or key in out:
+            continue
+        out[key] = _row_cells(row, suffix)
+    return out
+
+def _resolve(index: dict, day: date) -> Dict[str, List[str]]:
+    """daily + weekly + monthly + note 셀을 병합하여 하루치 섹션 생성"""
+    cells: Dict[str, str] = {}
+    cells.update(index["note"])
+    cells.update(index["monthly"].get((day.isocalendar().week - 1) % 4, {}))
+    cells.update(index["weekly"].get(day.isoweekday(), {}))
+    cells.update(index["daily"].get(day, {}))
+
+    resolved = {
+        name: sort_content([cells[c] for c in cols if c in cells])
+        for name, cols in SECTIONS.items()
+    }
+    resolved["calendar"] = [
+        f"{label}: {line}"
+        for label, col in CALENDAR_ITEMS if col in cells
+        for line in sort_content([cells[col]])
+    ]
+    return resolved
+
+def build_schedule_index(
+    daily: pd.DataFrame,
+    weekly: pd.DataFrame,
+    monthly: pd.DataFrame,
+    note: pd.DataFrame
+) -> dict:
+    """
+    날짜 → 섹션별 일정 라인 인덱스 생성 (데이터 버전당 1회)
+    """
+    if "Date" in daily.columns:
+        dates = pd.to_datetime(daily["Date"], errors="coerce").dt.date
+        daily_rows = _rows_by_key(daily, dates, "_daily")
+    else:
+        daily_rows = {}
+
+    index = {
+        "daily": daily_rows,
+        "weekly": _rows_by_key(weekly, recurring_keys(weekly, "weekday"), "_weekly"),
+        "monthly": _rows_by_key(monthly, recurring_keys(monthly, "mod(weeknum,4)"), "_monthly"),
+        "note": _row_cells(note.iloc[0].to_dict(), "_contd") if not note.empty else {},
+    }
+    index["days"] = {d: _resolve(index, d) for d in daily_rows}
+    return index
+
+def lookup_day(index: dict, day: date) -> Dict[str, List[str]]:
+    """하루치 섹션 조회 (daily 범위 밖의 날짜는 반복 일정만으로 생성)"""
+    resolved: Optional[Dict[str, List[str]]] = index["days"].get(day)
+    if resolved is None:
+        resolved = _resolve(index, day)
+    return resolved
@@ -0,0 +1,340 @@
+# utils/shared_cache.py
+import io
+import logging
+import os
+import pickle
+import re
+import sqlite3
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Dict, Iterator, Optional, Tuple
+import pandas as pd
+import streamlit as st
+from utils.metrics import METRICS, record_cache
+
+logger = logging.getLogger(__name__)
+
+# 공유 캐시 주소 (비우면 사용 안 함)
+#   memory                  프로세스 내부 (테스트/벤치마크용 대역)
+#   sqlite:///data/.cache/shared.sqlite   같은 호스트의 여러 프로세스 (절대 경로는 sqlite:////var/...)
+#   redis://host:6379/0     여러 호스트 (redis 패키지 필요)
+SHARED_CACHE_URL = os.environ.get("PZTK_SHARED_CACHE", "")
+SQLITE_DEFAULT_PATH = "data/.cache/shared.sqlite"
+
+# 키 앞에 붙는 이름공간 (pickle 형식이 다른 pandas 버전끼리는 공유하지 않음)
+SHARED_CACHE_NAMESPACE = f"pztk:v1:pd{pd.__version__}:"
+
+# 원격 로드 잠금: 잠금 유지 시간(초, 보유 프로세스가 죽어도 이후 풀림), 다른 프로세스를 기다리는 최대 시간
+LOCK_TTL = 60.0
+LOCK_WAIT = float(os.environ.get("PZTK_SHARED_CACHE_LOCK_WAIT", 15))
+LOCK_POLL = 0.2
+
+METRICS.describe("shared_cache_errors_total", "Shared cache backend errors (treated as misses)")
+
+@dataclass(frozen=True)
+class CacheItem:
+    """저장된 값 (expires_at 0이면 만료 없음)"""
+    value: bytes
+    version: str
+    stored_at: float
+    expires_at: float = 0.0
+
+class CacheBackend(ABC):
+    """
+    프로세스 간 공유 캐시 저장소
+
+    키 → (값, 버전, 저장 시각, 만료 시각)과 만료 시간이 있는 잠금만 제공한다.
+    값 직렬화/버전 비교/오류 처리는 SharedCache가 맡는다.
+    """
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[CacheItem]:
+        ...
+
+    @abstractmethod
+    def set(self, key: str, value: bytes, version: str, ttl: float):
+        ...
+
+    @abstractmethod
+    def delete(self, key: str, prefix: bool = False):
+        """키 삭제 (prefix=True면 해당 접두사로 시작하는 키 모두)"""
+        ...
+
+    @abstractmethod
+    def try_lock(self, name: str, token: str, ttl: float) -> bool:
+        """잠금 획득 시도 (대기하지 않음)"""
+        ...
+
+    @abstractmethod
+    def unlock(self, name: str, token: str):
+        """token으로 얻은 잠금만 해제"""
+        ...
+
+class MemoryBackend(CacheBackend):
+    """프로세스 내부 저장소 (테스트/벤치마크에서 여러 레플리카를 흉내 낼 때 같은 인스턴스를 공유)"""
+
+    def __init__(self):
+        self._items: Dict[str, CacheItem] = {}
+        self._locks: Dict[str, Tuple[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[CacheItem]:
+        with self._lock:
+            item = self._items.get(key)
+            if item is not None and item.expires_at and item.expires_at <= time.time():
+                del self._items[key]
+                return None
+            return item
+
+    def set(self, key: str, value: bytes, version: str, ttl: float):
+        now = time.time()
+        with self._lock:
+            self._items[key] = CacheItem(value, version, now, now + ttl if ttl > 0 else 0.0)
+
+    def delete(self, key: str, prefix: bool = False):
+        with self._lock:
+            for k in [k for k in self._items if (k.startswith(key) if prefix else k == key)]:
+                del self._items[k]
+
+    def try_lock(self, name: str, token: str, ttl: float) -> bool:
+        now = time.time()
+        with self._lock:
+            held = self._locks.get(name)
+            if held is not None and held[1] > now:
+                return False
+            self._locks[name] = (token, now + ttl)
+            return True
+
+    def unlock(self, name: str, token: str):
+        with self._lock:
+            if self._locks.get(name, ("",))[0] == token:
+                del self._locks[name]
+
+class SQLiteBackend(CacheBackend):
+    """SQLite 파일 저장소 (같은 호스트의 여러 프로세스가 공유, WAL 모드)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        with self._conn() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries "
+                "(key TEXT PRIMARY KEY, value BLOB, version TEXT, stored_at REAL, expires_at REAL)"
+            )
+            conn.execute("CREATE TABLE IF NOT EXISTS locks (name TEXT PRIMARY KEY, token TEXT, expires_at REAL)")
+
+    def _conn(self) -> sqlite3.Connection:
+        """스레드별 연결 (with 블록 = 트랜잭션)"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10)
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> Optional[CacheItem]:
+        row = self._conn().execute(
+            "SELECT value, version, stored_at, expires_at FROM entries WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None or (row[3] and row[3] <= time.time()):
+            return None
+        return CacheItem(*row)
+
+    def set(self, key: str, value: bytes, version: str, ttl: float):
+        now = time.time()
+        with self._conn() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?)",
+                (key, sqlite3.Binary(value), version, now, now + ttl if ttl > 0 else 0.0)
+            )
+            # 만료된 항목 정리 (쓰기 때만)
+            conn.execute("DELETE FROM entries WHERE expires_at > 0 AND expires_at <= ?", (now,))
+
+    def delete(self, key: str, prefix: bool = False):
+        with self._conn() as conn:
+            if prefix:
+                escaped = key.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+                conn.execute("DELETE FROM entries WHERE key LIKE ? ESCAPE '\\'", (escaped + "%",))
+            else:
+                conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+
+    def try_lock(self, name: str, token: str, ttl: float) -> bool:
+        now = time.time()
+        with self._conn() as conn:
+            conn.execute("DELETE FROM locks WHERE name = ? AND expires_at <= ?", (name, now))
+            cur = conn.execute("INSERT OR IGNORE INTO locks VALUES (?, ?, ?)", (name, token, now + ttl))
+            return cur.rowcount == 1
+
+    def unlock(self, name: str, token: str):
+        with self._conn() as conn:
+            conn.execute("DELETE FROM locks WHERE name = ? AND token = ?", (name, token))
+
+class RedisBackend(CacheBackend):
+    """Redis 호환 서버 저장소 (여러 호스트의 레플리카가 공유, redis 패키지는 처음 연결할 때 import)"""
+
+    # 내 token일 때만 삭제 (다른 프로세스가 다시 얻은 잠금은 건드리지 않음)
+    _UNLOCK = "if redis.call('get', KEYS[1]) == ARGV[1] then return redis.call('del', KEYS[1]) end return 0"
+
+    def __init__(self, url: str):
+        import redis
+        self._redis = redis.Redis.from_url(url)
+
+    def get(self, key: str) -> Optional[CacheItem]:
+        value, version, stored_at = self._redis.hmget(key, "value", "version", "stored_at")
+        if value is None:
+            return None
+        return CacheItem(value, (version or b"").decode(), float(stored_at or 0))
+
+    def set(self, key: str, value: bytes, version: str, ttl: float):
+        pipe = self._redis.pipeline()
+        pipe.delete(key)
+        pipe.hset(key, mapping={"value": value, "version": version, "stored_at": time.time()})
+        if ttl > 0:
+            pipe.pexpire(key, int(ttl * 1000))
+        pipe.execute()
+
+    def delete(self, key: str, prefix: bool = False):
+        if not prefix:
+            self._redis.delete(key)
+            return
+        pattern = re.sub(r"([*?\[\]\\])", r"\\\1", key) + "*"
+        keys = list(self._redis.scan_iter(match=pattern, count=500))
+        if keys:
+            self._redis.delete(*keys)
+
+    def try_lock(self, name: str, token: str, ttl: float) -> bool:
+        return bool(self._redis.set(name, token, nx=True, px=int(ttl * 1000)))
+
+    def unlock(self, name: str, token: str):
+        self._redis.eval(self._UNLOCK, 1, name, token)
+
+def sqlite_path(url: str) -> str:
+    """
+    sqlite: 주소 → 파일 경로 (SQLAlchemy와 같은 규칙, 경로가 없으면 SQLITE_DEFAULT_PATH)
+
+        sqlite:///data/.cache/shared.sqlite    상대 경로 (작업 디렉터리 기준)
+        sqlite:////var/cache/pztk.sqlite       절대 경로
+    """
+    rest = url[len("sqlite:"):]
+    if rest.startswith("//"):
+        # '//' 뒤는 호스트(비어 있어야 함), 그다음 '/' 하나는 구분자라 경로에 포함하지 않음
+        host, _, rest = rest[2:].partition("/")
+        if host:
+            raise ValueError(f"sqlite 주소에는 호스트를 지정할 수 없습니다: {url}")
+    return rest or SQLITE_DEFAULT_PATH
+
+def open_backend(url: str) -> Optional[CacheBackend]:
+    """주소 → 저장소 (빈 주소는 None)"""
+    if not url:
+        return None
+    if url == "memory":
+        return MemoryBackend()
+    if url.startswith("sqlite:"):
+        return SQLiteBackend(sqlite_path(url))
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        return RedisBackend(url)
+    raise ValueError(f"지원하지 않는 공유 캐시 주소: {url}")
+
+class SharedCache:
+    """
+    레플리카 간 공유 캐시 (DataFrame 값, 버전, TTL, 원격 로드 잠금)
+
+    저장소 오류는 경고만 남기고 미스로 처리한다 (공유 캐시가 죽어도 각 프로세스는 혼자 동작).
+    값은 pickle이므로 신뢰하는 저장소에만 연결한다.
+    """
+
+    def __init__(self, backend: CacheBackend, namespace: str = SHARED_CACHE_NAMESPACE):
+        self.backend = backend
+        self.namespace = namespace
+
+    def _failed(self, op: str, key: str, e: Exception):
+        METRICS.inc("shared_cache_errors_total", op=op)
+        logger.warning(f"공유 캐시 {op} 실패 ({key}): {e}")
+
+    def get_frame(self, key: str, version: Optional[str] = None) -> Optional[pd.DataFrame]:
+        """저장된 DataFrame (없거나 만료/버전 불일치면 None)"""
+        try:
+            item = self.backend.get(self.namespace + key)
+        except Exception as e:
+            self._failed("get", key, e)
+            return None
+        if item is None or (version is not None and item.version != version):
+            record_cache("shared_cache", key, "miss" if item is None else "stale")
+            return None
+        try:
+            df = pickle.loads(item.value)
+        except Exception as e:
+            self._failed("decode", key, e)
+            return None
+        df.attrs.pop("frozen", None)  # 읽기 전용 표시는 프로세스마다 다시 적용
+        record_cache("shared_cache", key, "hit", age=time.time() - item.stored_at)
+        return df
+
+    def put_frame(self, key: str, df: pd.DataFrame, ttl: float, version: str = ""):
+        try:
+            buf = io.BytesIO()
+            pickle.dump(df, buf, protocol=pickle.HIGHEST_PROTOCOL)
+            self.backend.set(self.namespace + key, buf.getvalue(), version, ttl)
+        except Exception as e:
+            self._failed("set", key, e)
+
+    def delete(self, key: str, prefix: bool = False):
+        try:
+            self.backend.delete(self.namespace + key, prefix=prefix)
+        except Exception as e:
+            self._failed("delete", key, e)
+
+    @contextmanager
+    def leader(self, name: str, ttl: float = LOCK_TTL, wait: float = LOCK_WAIT) -> Iterator[bool]:
+        """
+        여러 프로세스 중 한 곳만 작업하도록 잠금
+
+        잠금을 얻으면 True, 다른 프로세스가 wait초 넘게 갖고 있으면 False. 저장소 오류 시에도 True (혼자 동작).
+        기다리는 동안 다른 프로세스가 작업을 끝냈을 수 있으므로 호출 측은 블록 안에서
+        공유 캐시를 다시 보고, 그래도 없을 때만 직접 작업한다.
+        """
+        lock_key = f"{self.namespace}lock:{name}"
+        token = uuid.uuid4().hex
+        deadline = time.monotonic() + wait
+        acquired = False
+        try:
+            while not self.backend.try_lock(lock_key, token, ttl):
+                if time.monotonic() >= deadline:
+                    break
+                time.sleep(LOCK_POLL)
+            else:
+                acquired = True
+        except Exception as e:
+            self._failed("lock", name, e)
+            acquired = None
+
+        if acquired is None:
+            yield True
+            return
+        if not acquired:
+            record_cache("shared_cache", name, "coalesced")
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            try:
+                self.backend.unlock(lock_key, token)
+            except Exception as e:
+                self._failed("unlock", name, e)
+
+@st.cache_resource
+def get_shared_cache() -> Optional[SharedCache]:
+    """PZTK_SHARED_CACHE로 설정한 공유 캐시 (설정이 없거나 연결 실패 시 None)"""
+    try:
+        backend = open_backend(SHARED_CACHE_URL)
+    except Exception as e:
+        logger.error(f"공유 캐시 연결 실패 ({SHARED_CACHE_URL}): {e}")
+        return None
+    return SharedCache(backend) if backend is not None else None
@@ -0,0 +1,117 @@
+# utils/shared_frames.py
+from typing import Dict, Mapping
+import numpy as np
+import pandas as pd
+
+# pandas 2.x는 Copy-on-Write를 켜야 얕은 사본(view)에 쓴 값이 공유 원본에 반영되지 않음 (3.0부터 기본)
+if int(pd.__version__.split(".")[0]) < 3:
+    pd.set_option("mode.copy_on_write", True)
+
+# 고유값 비율이 이 값 이하인 문자열 컬럼은 category로 저장
+CATEGORY_MAX_RATIO = 0.5
+CATEGORY_MIN_ROWS = 8
+
+_INT32 = np.iinfo(np.int32)
+
+def _compact_numeric(values: pd.Series) -> pd.Series:
+    """정수는 범위가 맞으면 int32, 실수는 손실 없을 때만 float32"""
+    if values.isna().any():
+        if pd.api.types.is_float_dtype(values):
+            as32 = values.astype(np.float32)
+            return as32 if np.array_equal(as32.to_numpy(np.float64), values.to_numpy(np.float64), equal_nan=True) else values
+        return values
+    if pd.api.types.is_float_dtype(values):
+        if not (values == values.round()).all():
+            as32 = values.astype(np.float32)
+            return as32 if (as32.astype(np.float64) == values).all() else values
+        values = values.astype(np.int64)
+    if len(values) and _INT32.min <= values.min() and values.max() <= _INT32.max:
+        return values.astype(np.int32)
+    return values.astype(np.int64)
+
+def _is_number(val) -> bool:
+    try:
+        float(val)
+        return True
+    except (TypeError, ValueError):
+        return False
+
+def _compact_column(col: pd.Series, categories: bool) -> pd.Series:
+    if pd.api.types.is_bool_dtype(col) or isinstance(col.dtype, pd.CategoricalDtype):
+        return col
+    if pd.api.types.is_numeric_dtype(col):
+        return _compact_numeric(col)
+    if not (pd.api.types.is_object_dtype(col) or pd.api.types.is_string_dtype(col)):
+        return col
+
+    # 문자열/혼합 컬럼: 값이 모두 숫자로 바뀌면 숫자 컬럼으로 (첫 값이 문자면 바로 건너뜀)
+    present = col.notna()
+    texts = col[present]
+    if len(texts) and _is_number(texts.iloc[-1]):
+        numbers = pd.to_numeric(texts, errors="coerce")
+        if numbers.notna().all():
+            return _compact_numeric(pd.to_numeric(col, errors="coerce"))
+
+    if (
+        categories
+        and len(col) >= CATEGORY_MIN_ROWS
+        and texts.nunique() <= CATEGORY_MAX_RATIO * len(col)
+        and (pd.api.types.is_string_dtype(col) or texts.map(type).eq(str).all())
+    ):
+        return col.astype("category")
+    return col
+
+def compact_frame(df: pd.DataFrame, header_row: bool = False, categories: bool = False) -> pd.DataFrame:
+    """
+    메모리 절약용 dtype 변환 (값은 그대로)
+
+    - 숫자 컬럼: int32 / 손실 없는 float32
+    - categories=True: 반복이 많은 문자열 컬럼은 category
+      (그룹/필터용 이름 컬럼에 유리, 셀 단위로 읽는 일정 텍스트는 object가 더 빠름)
+    - header_row=True: 0행(한글 표시명)을 attrs['labels']로 분리하여
+      레벨/자원 컬럼이 숫자 dtype이 되도록 함
+    """
+    attrs = dict(df.attrs)
+    df = df.copy(deep=False)
+    df.attrs = {}  # 컬럼 연산마다 attrs를 deepcopy하지 않도록
+    if header_row and not df.empty:
+        attrs["labels"] = {c: str(v) for c, v in df.iloc[0].items() if pd.notna(v)}
+        df = df.iloc[1:].reset_index(drop=True)
+    out = pd.DataFrame({c: _compact_column(df[c], categories) for c in df.columns}, index=df.index)
+    out.attrs = attrs
+    return out
+
+def _root(arr: np.ndarray) -> np.ndarray:
+    while isinstance(arr.base, np.ndarray):
+        arr = arr.base
+    return arr
+
+def freeze(df: pd.DataFrame) -> pd.DataFrame:
+    """공유 원본으로 고정 (numpy 버퍼를 읽기 전용으로 바꿔 제자리 수정 차단)"""
+    if df.attrs.get("frozen"):
+        return df
+    for col in df.columns:
+        series = df[col]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            arr = series.array.codes
+        elif isinstance(series.dtype, np.dtype):
+            arr = series.to_numpy(copy=False)
+        else:
+            continue  # Arrow 기반 문자열 등은 원래 불변
+        _root(arr).flags.writeable = False
+    df.attrs["frozen"] = True
+    return df
+
+def view(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    공유 원본의 얕은 사본 (복사 없음)
+
+    Copy-on-Write로 view에 쓰면 그 컬럼만 복사되고 원본과 다른 세션은 영향 없음.
+    """
+    return df.copy(deep=False)
+
+def freeze_all(frames: Mapping[str, pd.DataFrame]) -> Dict[str, pd.DataFrame]:
+    return {key: freeze(df) for key, df in frames.items()}
+
+def views(frames: Mapping[str, pd.DataFrame]) -> Dict[str, pd.DataFrame]:
+    return {key: view(df) for key, df in frames.items()}
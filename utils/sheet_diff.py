@@ -0,0 +1,309 @@
+# utils/sheet_diff.py
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+import pandas as pd
+from gspread.utils import rowcol_to_a1
+from utils.sheets_client import SheetsClient, cell_value, frame_to_values, values_to_frame
+
+# 헤더가 1행이므로 DataFrame 행 라벨 + 2 = 시트 행 번호
+HEADER_ROWS = 1
+
+class SheetConflictError(Exception):
+    """로드 이후 다른 사용자가 같은 행을 수정함"""
+
+    def __init__(self, rows: List[int]):
+        super().__init__(f"다른 사용자가 수정한 행: {', '.join(map(str, rows))}")
+        self.rows = rows
+
+@dataclass
+class SheetDiff:
+    """편집 전후 셀 단위 변경분"""
+    updates: List[Tuple[str, List[list]]] = field(default_factory=list)  # (A1 범위, 값)
+    touched: List[int] = field(default_factory=list)    # 수정/삭제된 기존 시트 행
+    appended: List[list] = field(default_factory=list)  # 새 행 값
+    structural: bool = False                            # 컬럼 구성 변경 (전체 저장 필요)
+
+def _sheet_row(label) -> int:
+    return int(label) + HEADER_ROWS + 1
+
+def _norm(val):
+    """비교용 값 (숫자 문자열/정수/실수를 같은 값으로 취급)"""
+    val = cell_value(val)
+    if isinstance(val, bool):
+        return val
+    if isinstance(val, (int, float)):
+        return float(val)
+    if isinstance(val, str):
+        try:
+            return float(val)
+        except ValueError:
+            return val.strip()
+    return val
+
+def _runs(positions: List[int]) -> List[Tuple[int, int]]:
+    """정렬된 번호 목록을 연속 구간 (시작, 끝) 목록으로 묶음"""
+    runs: List[Tuple[int, int]] = []
+    for p in positions:
+        if runs and p == runs[-1][1] + 1:
+            runs[-1] = (runs[-1][0], p)
+        else:
+            runs.append((p, p))
+    return runs
+
+def _sheet_cols(base: pd.DataFrame) -> List[int]:
+    cols = base.attrs.get("sheet_cols")
+    return cols if cols and len(cols) == len(base.columns) else list(range(1, len(base.columns) + 1))
+
+def _structural(base: pd.DataFrame, edited: pd.DataFrame) -> bool:
+    """컬럼 구성이 바뀌었거나 행 라벨이 중복되어 셀 단위 저장이 불가능함"""
+    return list(edited.columns) != list(base.columns) or not base.index.is_unique or not edited.index.is_unique
+
+def compute_diff(base: pd.DataFrame, edited: pd.DataFrame) -> SheetDiff:
+    """
+    편집기에 표시한 base와 편집 결과 edited의 셀 단위 차이
+
+    - 수정된 셀: 행별 연속 열 구간으로 묶어 범위 갱신
+    - 삭제된 행: 해당 행을 빈칸으로 덮어씀 (행 번호가 밀리지 않도록 삭제하지 않음)
+    - 추가된 행: appended에 모아 두고 저장 시점의 마지막 행 뒤에 기록
+    """
+    if _structural(base, edited):
+        return SheetDiff(structural=True)
+
+    cols = _sheet_cols(base)
+    diff = SheetDiff()
+    edited_rows = dict(zip(edited.index, edited.itertuples(index=False, name=None)))
+
+    for label, row in zip(base.index, base.itertuples(index=False, name=None)):
+        sheet_row = _sheet_row(label)
+        new_row = edited_rows.get(label)
+        if new_row is None:
+            diff.touched.append(sheet_row)
+            for start, end in _runs(cols):
+                diff.updates.append((
+                    f"{rowcol_to_a1(sheet_row, start)}:{rowcol_to_a1(sheet_row, end)}",
+                    [[""] * (end - start + 1)]
+                ))
+            continue
+
+        changed = [i for i, (old, new) in enumerate(zip(row, new_row)) if _norm(old) != _norm(new)]
+        if not changed:
+            continue
+        diff.touched.append(sheet_row)
+        for start, end in _runs(changed):
+            diff.updates.append((
+                f"{rowcol_to_a1(sheet_row, cols[start])}:{rowcol_to_a1(sheet_row, cols[end])}",
+                [[cell_value(v) for v in new_row[start:end + 1]]]
+            ))
+
+    base_labels = set(base.index)
+    for label, row in zip(edited.index, edited.itertuples(index=False, name=None)):
+        if label not in base_labels and any(_norm(v) != "" for v in row):
+            diff.appended.append([cell_value(v) for v in row])
+    return diff
+
+def merge_page(full: pd.DataFrame, page_base: pd.DataFrame, page_edited: pd.DataFrame) -> pd.DataFrame:
+    """
+    편집기에 보여 준 일부 행/열(page_base)의 편집 결과를 전체 DataFrame에 반영
+
+    - 수정: 같은 라벨 행의 보이는 컬럼만 갱신
+    - 삭제: page_base에 있었는데 page_edited에 없는 행 제거
+    - 추가: 전체의 마지막 라벨 다음 번호로 끝에 붙임 (숨긴 컬럼은 빈칸)
+
+    결과는 compute_diff/plan_save에 전체 편집 결과(edited)로 그대로 넘길 수 있다.
+    """
+    cols = list(page_base.columns)
+    in_page = page_edited.index.isin(page_base.index) & page_edited.index.notna()
+    kept = page_edited[in_page]
+    added = page_edited[~in_page]
+    deleted = page_base.index.difference(kept.index)
+
+    out = full.drop(index=deleted)
+    for col in cols:
+        values = kept[col]
+        try:
+            out.loc[values.index, col] = values
+        except (TypeError, ValueError):
+            # 편집으로 값의 종류가 바뀐 컬럼 (숫자 컬럼에 문자 입력 등)
+            out[col] = out[col].astype(object)
+            out.loc[values.index, col] = values.astype(object)
+
+    if len(added):
+        start = int(full.index.max()) + 1 if len(full) else 0
+        added = added.reindex(columns=full.columns).set_axis(range(start, start + len(added)))
+        out = pd.concat([out, added]) if len(out) else added
+    out.attrs = dict(full.attrs)
+    return out
+
+@dataclass
+class SavePlan:
+    """
+    저장 한 번의 내용 (JSON으로 저장 가능한 값만 사용, 쓰기 대기열 저널에 그대로 기록)
+
+    updates: (A1 범위, 값) 목록. full이 있으면 무시하고 시트 전체를 full로 교체
+    expected: 시트 행 → 로드 시점 값 (충돌 검사용, 추가될 위치는 빈 행 [])
+    cols: 각 컬럼의 시트 열 번호
+    """
+    updates: List[Tuple[str, List[list]]] = field(default_factory=list)
+    expected: Dict[int, list] = field(default_factory=dict)
+    cols: List[int] = field(default_factory=list)
+    full: Optional[List[list]] = None
+
+    @property
+    def empty(self) -> bool:
+        return self.full is None and not self.updates
+
+    def to_dict(self) -> dict:
+        return {
+            "updates": [[rng, values] for rng, values in self.updates],
+            "expected": {str(row): values for row, values in self.expected.items()},
+            "cols": self.cols,
+            "full": self.full,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "SavePlan":
+        return cls(
+            updates=[(rng, values) for rng, values in data.get("updates", [])],
+            expected={int(row): values for row, values in data.get("expected", {}).items()},
+            cols=list(data.get("cols", [])),
+            full=data.get("full"),
+        )
+
+def merge_plans(plans: List[SavePlan]) -> SavePlan:
+    """
+    같은 워크시트의 연속된 저장을 batchUpdate 한 번으로 합침 (full 저장은 합치지 않음)
+
+    행마다 가장 먼저 건드린 저장의 기대값만 남긴다. 뒤 저장의 기대값은 앞 저장이
+    반영된 상태를 가정하므로, 합친 요청 전의 시트와 비교할 대상이 아니다.
+    """
+    merged = SavePlan(cols=plans[0].cols)
+    for plan in plans:
+        merged.updates.extend(plan.updates)
+        for row, values in plan.expected.items():
+            merged.expected.setdefault(row, values)
+    return merged
+
+def plan_save(loaded: pd.DataFrame, base: pd.DataFrame, edited: pd.DataFrame) -> SavePlan:
+    """
+    편집 결과를 저장 계획으로 변환 (원격 요청 없음)
+
+    Args:
+        loaded: 시트에서 읽은 원본 (충돌 검사 기준)
+        base: 편집기에 표시한 DataFrame (loaded와 같은 행 라벨)
+        edited: 편집 결과
+    """
+    diff = compute_diff(base, edited)
+    cols = _sheet_cols(base)
+    if diff.structural:
+        return SavePlan(cols=cols, full=frame_to_values(edited))
+    if not diff.updates and not diff.appended:
+        return SavePlan(cols=cols)
+
+    touched = set(diff.touched)
+    expected = {row: [] for row in diff.touched}
+    for label, row in zip(loaded.index, loaded.itertuples(index=False, name=None)):
+        if _sheet_row(label) in touched:
+            expected[_sheet_row(label)] = [cell_value(v) for v in row]
+
+    updates = list(diff.updates)
+    if diff.appended:
+        start = _sheet_row(loaded.index.max()) + 1 if not loaded.empty else HEADER_ROWS + 1
+        end = start + len(diff.appended) - 1
+        expected.update({row: [] for row in range(start, end + 1)})
+        if cols == list(range(cols[0], cols[-1] + 1)):
+            updates.append((
+                f"{rowcol_to_a1(start, cols[0])}:{rowcol_to_a1(end, cols[-1])}",
+                diff.appended
+            ))
+        else:
+            for i, row in enumerate(diff.appended):
+                for c, v in zip(cols, row):
+                    updates.append((rowcol_to_a1(start + i, c), [[v]]))
+    return SavePlan(updates=updates, expected=expected, cols=cols)
+
+def saved_frame(loaded: pd.DataFrame, base: pd.DataFrame, edited: pd.DataFrame) -> pd.DataFrame:
+    """
+    저장이 반영된 뒤 시트를 다시 읽은 것과 같은 DataFrame
+
+    기존 행은 라벨 유지(삭제 행은 빈 행이 되어 빠짐), 추가 행은 마지막 행 다음 번호.
+    컬럼 구성이 바뀐 저장은 전체를 다시 쓰므로 0부터 다시 매긴다.
+    """
+    if _structural(base, edited):
+        return values_to_frame(frame_to_values(edited))
+    base_labels = set(base.index)
+    next_label = int(loaded.index.max()) + 1 if not loaded.empty else 0
+    labels = []
+    for label in edited.index:
+        if label in base_labels:
+            labels.append(int(label))
+        else:
+            labels.append(next_label)
+            next_label += 1
+    df = values_to_frame(frame_to_values(edited), index=labels)
+    df.attrs["sheet_cols"] = _sheet_cols(base)
+    return df
+
+def find_conflicts(client: SheetsClient, worksheet: str, plan: SavePlan) -> List[int]:
+    """
+    계획 작성 이후 수정/추가된 행 목록
+
+    기대값이 있는 행의 현재 값만 요청 한 번으로 다시 읽어 비교한다.
+    """
+    if not plan.expected:
+        return []
+    cols = plan.cols
+    last_col = max(cols) if cols else 1
+    run_list = _runs(sorted(plan.expected))
+    ranges = [f"{rowcol_to_a1(a, 1)}:{rowcol_to_a1(b, last_col)}" for a, b in run_list]
+    current = client.read_ranges(worksheet, ranges)
+
+    conflicts: List[int] = []
+    for (start, end), values in zip(run_list, current):
+        for sheet_row in range(start, end + 1):
+            i = sheet_row - start
+            cur = values[i] if i < len(values) else []
+            cur_vals = [_norm(cur[c - 1]) if c - 1 < len(cur) else "" for c in cols]
+            old = plan.expected[sheet_row]
+            old_vals = [_norm(v) for v in old] if old else [""] * len(cols)
+            if cur_vals != old_vals:
+                conflicts.append(sheet_row)
+    return conflicts
+
+def apply_plan(client: SheetsClient, worksheet: str, plan: SavePlan) -> int:
+    """
+    충돌 검사 후 저장 (batchUpdate 한 번, 컬럼 구성 변경은 전체 저장)
+
+    Returns:
+        저장한 범위 수 (전체 저장은 -1)
+
+    Raises:
+        SheetConflictError: 계획 작성 이후 다른 사용자가 같은 행을 수정함
+    """
+    if plan.full is not None:
+        client.write_values(worksheet, plan.full)
+        return -1
+    if not plan.updates:
+        return 0
+    conflicts = find_conflicts(client, worksheet, plan)
+    if conflicts:
+        raise SheetConflictError(conflicts)
+    client.update_ranges(worksheet, plan.updates)
+    return len(plan.updates)
+
+def save_changes(
+    client: SheetsClient,
+    worksheet: str,
+    loaded: pd.DataFrame,
+    base: pd.DataFrame,
+    edited: pd.DataFrame
+) -> int:
+    """
+    변경된 범위만 batchUpdate 한 번으로 즉시 저장 (대기열을 거치지 않음)
+
+    Returns:
+        저장한 범위 수 (컬럼 구성이 바뀐 경우 전체 저장 후 -1)
+
+    Raises:
+        SheetConflictError: 로드 이후 다른 사용자가 같은 행을 수정함
+    """
+    return apply_plan(client, worksheet, plan_save(loaded, base, edited))
@@ -0,0 +1,599 @@
+# utils/sheet_store.py
+import atexit
+import logging
+import os
+import random
+import threading
+import time
+import hashlib
+from collections import OrderedDict
+from contextlib import nullcontext
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+import streamlit as st
+import pandas as pd
+from utils.data_extract import frames_version
+from utils.excel_backup import read_backup
+from utils.flow_control import SingleFlight
+from utils.game_time import game_day
+from utils.metrics import record_cache, track_load
+from utils.shared_cache import SharedCache, get_shared_cache
+from utils.shared_frames import freeze, view
+from utils.sheets_client import get_sheets_client
+from utils.workbook_cache import write_frame
+
+logger = logging.getLogger(__name__)
+
+# 워크시트 스냅샷 저장 위치
+SNAPSHOT_DIR = "data/.cache/snapshots"
+
+# 워크시트 캐시 TTL 및 사전 갱신 설정 (환경 변수, 간격 0이면 비활성)
+SHEET_TTL = 900
+PREFETCH_SHEETS = ["daily", "weekly", "monthly", "note"]
+PREFETCH_INTERVAL = float(os.environ.get("PZTK_PREFETCH_INTERVAL", 780))
+PREFETCH_JITTER = float(os.environ.get("PZTK_PREFETCH_JITTER", 30))
+
+# 날짜 구간 단위로 읽는 워크시트 {워크시트: 날짜 컬럼} (월 단위 페이지로 캐시)
+WINDOWED_SHEETS = {"daily": "Date"}
+# 메모리에 유지하는 월 페이지 수 (초과 시 오래 안 쓴 페이지부터 해제, 스냅샷은 유지)
+MAX_WINDOW_PAGES = 6
+# 사전 갱신 시 미리 읽어 둘 구간 (오늘 전후 일수)
+PREFETCH_WINDOW = (-1, 8)
+
+# 조건부 갱신: 스프레드시트 수정 시각이 같아도 이 시간(초)이 지나면 다시 내려받음
+# (수식 재계산처럼 수정 시각에 잡히지 않는 변경 대비)
+REVISION_MAX_AGE = float(os.environ.get("PZTK_REVISION_MAX_AGE", 6 * 3600))
+
+# 공유 캐시(레플리카 간)에 워크시트를 보관하는 시간. 가져다 쓰는 기준은 TTL (fetched_at이 TTL 이내인 사본만)
+SHARED_SHEET_TTL = 24 * 3600
+
+DateRange = Tuple[date, date]
+
+def _snapshot_path(worksheet: str) -> str:
+    return os.path.join(SNAPSHOT_DIR, f"{worksheet}.pkl")
+
+def save_snapshot(worksheet: str, df: pd.DataFrame):
+    """가져온 워크시트를 로컬 스냅샷으로 저장"""
+    write_frame(_snapshot_path(worksheet), df)
+
+def load_snapshot(worksheet: str) -> Optional[pd.DataFrame]:
+    """로컬 스냅샷 로드 (attrs['fetched_at']에 저장 시각 기록)"""
+    path = _snapshot_path(worksheet)
+    try:
+        if not os.path.exists(path):
+            return None
+        with track_load("snapshot", worksheet) as rec:
+            df = pd.read_pickle(path)
+            rec.update(rows=len(df), nbytes=os.path.getsize(path))
+        df.attrs.update(fetched_at=os.path.getmtime(path), source="snapshot")
+        return df
+    except Exception as e:
+        logger.warning(f"스냅샷 '{worksheet}' 로드 실패: {e}")
+        return None
+
+def month_keys(start: date, end: date) -> List[str]:
+    """구간에 걸친 월 목록 (YYYY-MM)"""
+    if end < start:
+        start, end = end, start
+    months, (y, m) = [], (start.year, start.month)
+    while (y, m) <= (end.year, end.month):
+        months.append(f"{y:04d}-{m:02d}")
+        y, m = (y + 1, 1) if m == 12 else (y, m + 1)
+    return months
+
+def month_span(months: List[str]) -> DateRange:
+    """월 목록(YYYY-MM)의 첫날 ~ 마지막 달 말일"""
+    y, m = map(int, months[-1].split("-"))
+    after = date(y + 1, 1, 1) if m == 12 else date(y, m + 1, 1)
+    return date.fromisoformat(f"{months[0]}-01"), after - timedelta(days=1)
+
+def page_key(worksheet: str, month: str) -> str:
+    """월 페이지 캐시 키"""
+    return f"{worksheet}@{month}"
+
+def select_months(df: pd.DataFrame, date_col: str, months: List[str]) -> pd.DataFrame:
+    """전체 사본에서 해당 월 행만 선택 (스냅샷/Excel 폴백용)"""
+    if df.empty or date_col not in df.columns:
+        return df
+    dates = pd.to_datetime(df[date_col], errors="coerce")
+    month_of = dates.dt.year * 100 + dates.dt.month
+    return df[month_of.isin([int(m.replace("-", "")) for m in months])]
+
+def concat_pages(pages: List[pd.DataFrame]) -> pd.DataFrame:
+    """월 페이지를 하나의 DataFrame으로 합침 (버전은 페이지 버전 조합, 기준 시각은 가장 오래된 페이지)"""
+    pages = [p for p in pages if not p.columns.empty]
+    if not pages:
+        return pd.DataFrame()
+    df = pd.concat(pages) if len(pages) > 1 else pages[0].copy()
+    oldest = min(pages, key=lambda p: p.attrs.get("fetched_at", 0))
+    versions = "|".join(str(p.attrs.get("version", "")) for p in pages)
+    df.attrs = {
+        "fetched_at": oldest.attrs.get("fetched_at", 0),
+        "source": oldest.attrs.get("source", "sheets"),
+        "version": hashlib.sha1(versions.encode()).hexdigest(),
+        "sheet_cols": pages[0].attrs.get("sheet_cols"),
+    }
+    return df
+
+def format_age(seconds: float) -> str:
+    """경과 시간을 한글로 표시"""
+    if seconds < 60:
+        return "방금"
+    if seconds < 3600:
+        return f"{int(seconds // 60)}분 전"
+    if seconds < 86400:
+        return f"{int(seconds // 3600)}시간 전"
+    return f"{int(seconds // 86400)}일 전"
+
+@dataclass
+class SheetEntry:
+    """캐시된 워크시트 (fetched_at: 최신임을 마지막으로 확인한 시각, downloaded_at: 실제로 내려받은 시각)"""
+    data: pd.DataFrame
+    fetched_at: float
+    version: str
+    revision: Optional[str] = None
+    downloaded_at: float = 0.0
+
+class SheetStore:
+    """
+    워크시트 캐시 (메모리 + 디스크 스냅샷, stale-while-revalidate)
+
+    - TTL 이내: 메모리 사본 반환
+    - TTL 초과 또는 스냅샷만 있음: 기존 사본을 즉시 반환하고 백그라운드에서 갱신
+    - 아무 사본도 없음: 동기 로드
+
+    원격 로드는 요청된 워크시트 전체를 한 번에 가져오는 일괄 함수
+    (fetch(워크시트 목록) -> {워크시트: DataFrame})로 수행한다.
+
+    windowed에 등록된 워크시트는 date_range를 주면 해당 월 페이지만
+    fetch_months(워크시트, 월 목록) -> {월: DataFrame}으로 읽어 캐시한다.
+
+    revision(스프레드시트 수정 시각 조회)을 주면 만료/사전 갱신은 조건부로 동작한다.
+    수정 시각이 사본을 받을 때와 같으면 내려받지 않고 사본의 유효 기간만 연장한다.
+
+    원격 로드가 실패했는데 사본도 스냅샷도 없으면 fallback(워크시트, 날짜 구간)으로
+    Excel 백업을 읽어 메모리에만 둔다 (백업 시각 기준이라 계속 만료 상태로 재시도됨).
+
+    같은 키의 원격 로드가 이미 진행 중이면 새로 요청하지 않고 그 결과를 함께 받는다
+    (캐시 만료 직후 여러 세션이 동시에 미스를 내도 요청은 한 번).
+
+    shared(공유 캐시)를 주면 미스/만료 갱신 전에 다른 레플리카가 TTL 이내에 받아 둔 사본을 먼저 쓰고,
+    원격 로드는 공유 잠금을 얻은 한 프로세스만 한다 (나머지는 기다렸다가 그 결과를 받음).
+    받아 온 사본과 쓰기 결과(put)는 공유 캐시에 올린다. 사용자가 누른 새로고침은 공유 사본을 쓰지 않는다.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[List[str]], Dict[str, pd.DataFrame]],
+        ttl: float = 900,
+        fetch_months: Optional[Callable[[str, List[str]], Dict[str, pd.DataFrame]]] = None,
+        windowed: Optional[Dict[str, str]] = None,
+        max_pages: int = MAX_WINDOW_PAGES,
+        revision: Optional[Callable[[], str]] = None,
+        revision_max_age: float = REVISION_MAX_AGE,
+        fallback: Optional[Callable[[str, Optional[DateRange]], Optional[pd.DataFrame]]] = None,
+        shared: Optional[SharedCache] = None
+    ):
+        self._fetch = fetch
+        self._shared = shared
+        self._fallback = fallback
+        self._revision = revision
+        self._revision_max_age = revision_max_age
+        self._fetch_months = fetch_months
+        self._windowed = dict(windowed or {}) if fetch_months is not None else {}
+        self._ttl = ttl
+        self._max_pages = max_pages
+        self._entries: Dict[str, SheetEntry] = {}
+        self._pages: "OrderedDict[str, None]" = OrderedDict()
+        self._refreshing: set = set()
+        self._flights = SingleFlight()
+        self._lock = threading.Lock()
+
+    def get(self, worksheet: str, refresh: bool = False, date_range: Optional[DateRange] = None) -> pd.DataFrame:
+        """워크시트 반환 (만료 시 백그라운드 갱신 예약, refresh=True면 즉시 재로드)"""
+        return self.get_many([worksheet], refresh=refresh, date_range=date_range)[worksheet]
+
+    def get_many(
+        self,
+        worksheets: List[str],
+        refresh: bool = False,
+        date_range: Optional[DateRange] = None
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        여러 워크시트를 한 번에 반환
+
+        사본이 없는 워크시트가 하나라도 있으면 요청 전체를 한 번의 일괄 로드로
+        가져와 같은 시점의 데이터로 맞춘다. date_range를 주면 날짜 구간 워크시트는
+        해당 월 페이지만 읽어 합친다.
+        """
+        keys = {ws: self._keys(ws, date_range) for ws in worksheets}
+        return self._assemble(keys, self._get_keys([k for ks in keys.values() for k in ks], refresh))
+
+    def revalidate(self, worksheets: List[str], date_range: Optional[DateRange] = None) -> Dict[str, pd.DataFrame]:
+        """
+        조건부 갱신 (사전 갱신용)
+
+        스프레드시트 수정 시각이 사본과 같으면 내려받지 않고 유효 기간만 연장하며,
+        바뀌었거나 확인할 수 없으면 get_many(refresh=True)처럼 다시 로드한다.
+        """
+        keys = {ws: self._keys(ws, date_range) for ws in worksheets}
+        return self._assemble(keys, self._refresh([k for ks in keys.values() for k in ks], conditional=True, shared=True))
+
+    @staticmethod
+    def _assemble(keys: Dict[str, List[str]], frames: Dict[str, pd.DataFrame]) -> Dict[str, pd.DataFrame]:
+        return {
+            ws: view(frames[ks[0]]) if ks == [ws] else concat_pages([frames[k] for k in ks])
+            for ws, ks in keys.items()
+        }
+
+    def _keys(self, worksheet: str, date_range: Optional[DateRange]) -> List[str]:
+        if date_range is None or worksheet not in self._windowed:
+            return [worksheet]
+        return [page_key(worksheet, m) for m in month_keys(*date_range)]
+
+    def _get_keys(self, keys: List[str], refresh: bool) -> Dict[str, pd.DataFrame]:
+        if refresh:
+            return self._refresh(keys)
+
+        entries: Dict[str, SheetEntry] = {}
+        for key in keys:
+            entry = self._entries.get(key) or self._restore(key)
+            if entry is None:
+                for k in keys:
+                    record_cache("sheet_store", k, "miss")
+                return self._refresh(keys, shared=True)
+            entries[key] = entry
+        self._touch(keys)
+
+        now = time.time()
+        stale = [key for key, entry in entries.items() if now - entry.fetched_at > self._ttl]
+        for key, entry in entries.items():
+            record_cache("sheet_store", key, "stale" if key in stale else "hit", age=now - entry.fetched_at)
+        if stale:
+            self.refresh_async(stale)
+        return {key: entry.data for key, entry in entries.items()}
+
+    def _touch(self, keys: List[str]):
+        """월 페이지 사용 순서 갱신, 한도를 넘으면 오래 안 쓴 페이지를 메모리에서 해제"""
+        with self._lock:
+            for key in keys:
+                if "@" in key:
+                    self._pages[key] = None
+                    self._pages.move_to_end(key)
+            while len(self._pages) > max(self._max_pages, sum("@" in k for k in keys)):
+                old, _ = self._pages.popitem(last=False)
+                self._entries.pop(old, None)
+
+    def version(self, worksheet: str) -> Optional[str]:
+        """메모리 사본의 데이터 버전"""
+        entry = self._entries.get(worksheet)
+        return entry.version if entry is not None else None
+
+    def _worksheet_keys(self, worksheet: str) -> List[str]:
+        """워크시트와 메모리에 있는 그 월 페이지 키"""
+        return [key for key in list(self._entries) if key == worksheet or key.startswith(page_key(worksheet, ""))]
+
+    def reload(self, worksheet: str) -> Dict[str, pd.DataFrame]:
+        """
+        시트 반영이 확정된 저장 뒤: 워크시트(와 캐시된 월 페이지)를 바로 다시 내려받아
+        메모리/스냅샷/공유 캐시에 게시 (조건부 갱신/공유 사본을 거치지 않음)
+        """
+        keys = self._worksheet_keys(worksheet)
+        return self._refresh(keys or [worksheet])
+
+    def evict(self, worksheet: str):
+        """
+        해당 워크시트(월 페이지 포함)의 메모리 사본/스냅샷/공유 사본 삭제
+
+        invalidate와 달리 기존 사본을 다시 내주지 않으므로 다음 요청은 시트에서 새로 읽는다
+        (반영되지 않은 저장 내용이 남아 있을 수 있는 경우용).
+        """
+        prefix = page_key(worksheet, "")
+        with self._lock:
+            for key in self._worksheet_keys(worksheet):
+                self._entries.pop(key, None)
+                self._pages.pop(key, None)
+        try:
+            names = os.listdir(SNAPSHOT_DIR)
+        except FileNotFoundError:
+            names = []
+        for name in names:
+            if name == f"{worksheet}.pkl" or (name.startswith(prefix) and name.endswith(".pkl")):
+                try:
+                    os.remove(os.path.join(SNAPSHOT_DIR, name))
+                except OSError as e:
+                    logger.warning(f"스냅샷 '{name}' 삭제 실패: {e}")
+        if self._shared is not None:
+            self._shared.delete(_shared_key(worksheet))
+            self._shared.delete(_shared_key(prefix), prefix=True)
+
+    def invalidate(self, worksheet: str):
+        """해당 워크시트(월 페이지 포함)만 만료 처리 (다음 요청 시 기존 사본 반환 후 백그라운드에서 다시 로드)"""
+        for key, entry in list(self._entries.items()):
+            if key == worksheet or key.startswith(f"{worksheet}@"):
+                entry.fetched_at = 0.0
+                entry.revision = None
+        # 다른 레플리카도 공유 사본 대신 다시 로드하도록
+        if self._shared is not None:
+            self._shared.delete(_shared_key(worksheet))
+            self._shared.delete(_shared_key(page_key(worksheet, "")), prefix=True)
+
+    def refresh_async(self, worksheets: List[str]):
+        """백그라운드 일괄 갱신 (이미 갱신 중인 워크시트는 제외)"""
+        with self._lock:
+            todo = [ws for ws in worksheets if ws not in self._refreshing]
+            self._refreshing.update(todo)
+        if not todo:
+            return
+
+        def run():
+            try:
+                self._refresh(todo, conditional=True, shared=True)
+            finally:
+                with self._lock:
+                    self._refreshing.difference_update(todo)
+
+        threading.Thread(target=run, name=f"sheet-refresh-{'-'.join(todo)}", daemon=True).start()
+
+    def _read_revision(self) -> Optional[str]:
+        if self._revision is None:
+            return None
+        try:
+            return self._revision()
+        except Exception as e:
+            logger.warning(f"스프레드시트 수정 시각 조회 실패: {e}")
+            return None
+
+    def _not_modified(self, keys: List[str], revision: Optional[str]) -> Dict[str, pd.DataFrame]:
+        """수정 시각이 사본과 같은 키는 내려받지 않고 유효 기간만 연장 (스냅샷 시각도 갱신)"""
+        if revision is None:
+            return {}
+        now = time.time()
+        kept: Dict[str, pd.DataFrame] = {}
+        for key in keys:
+            entry = self._entries.get(key) or self._restore(key)
+            if entry is None or entry.revision != revision or now - entry.downloaded_at > self._revision_max_age:
+                continue
+            entry.fetched_at = now
+            entry.data.attrs["fetched_at"] = now
+            try:
+                os.utime(_snapshot_path(key))
+            except OSError:
+                pass
+            record_cache("sheet_store", key, "not_modified")
+            self._publish(key, entry.data)
+            kept[key] = entry.data
+        return kept
+
+    def _refresh(self, worksheets: List[str], conditional: bool = False, shared: bool = False) -> Dict[str, pd.DataFrame]:
+        """
+        원격 일괄 로드 후 메모리/스냅샷 갱신. 실패한 워크시트는 기존 사본(없으면 빈 DataFrame)
+
+        conditional=True면 수정 시각이 사본과 같은 워크시트는 내려받지 않는다.
+        shared=True면 공유 캐시의 TTL 이내 사본을 먼저 쓴다.
+        다른 요청이 같은 방식(conditional/shared)으로 이미 갱신 중인 키는 그 결과를 기다려 받는다
+        (강제 새로고침이 진행 중인 조건부 재검증/공유 캐시 조회에 합류하지 않도록 방식까지 키에 포함).
+        """
+        mode = (conditional, shared)
+
+        def load(keys: List[tuple]) -> Dict[tuple, pd.DataFrame]:
+            loaded = self._load([key for key, _ in keys], conditional, shared)
+            return {(key, mode): df for key, df in loaded.items()}
+
+        flights, joined = self._flights.do_many([(key, mode) for key in worksheets], load)
+        for key, _ in joined:
+            record_cache("sheet_store", key, "coalesced")
+        self._touch(list(worksheets))
+        return {key: flights[(key, mode)] for key in worksheets}
+
+    def _load(self, worksheets: List[str], conditional: bool, shared: bool) -> Dict[str, pd.DataFrame]:
+        # 다른 레플리카가 받아 둔 사본이 있으면 수정 시각 조회도 하지 않음
+        use_shared = shared and self._shared is not None
+        result = self._adopt(worksheets) if use_shared else {}
+        todo = [key for key in worksheets if key not in result]
+        if not todo:
+            return result
+
+        revision = None
+        if conditional:
+            revision = self._read_revision()
+            result.update(self._not_modified(todo, revision))
+            todo = [key for key in todo if key not in result]
+        if todo:
+            # 공유 캐시가 있으면 레플리카 중 한 곳만 내려받고, 나머지는 잠금을 기다렸다가 그 결과를 받음
+            lead = self._shared.leader("sheets:" + ",".join(sorted(todo))) if use_shared else nullcontext(True)
+            with lead as acquired:
+                if use_shared:
+                    # 잠금을 얻었든 대기 시간이 지났든 그동안 다른 레플리카가 올린 사본을 먼저 확인
+                    result.update(self._adopt(todo))
+                    todo = [key for key in todo if key not in result]
+                if todo and not acquired:
+                    # 다른 레플리카가 아직 내려받는 중: 가진 사본이 있으면 그대로 쓰고 다음 갱신에 맡김 (없을 때만 직접 로드)
+                    result.update({key: self._entries[key].data for key in todo if key in self._entries})
+                    todo = [key for key in todo if key not in result]
+                    if todo:
+                        logger.info(f"공유 캐시 잠금 대기 시간 초과, 직접 로드: {todo}")
+                if todo:
+                    if not conditional:
+                        revision = self._read_revision()
+                    result.update(self._download(todo, revision))
+        return {key: result[key] for key in worksheets}
+
+    def _download(self, todo: List[str], revision: Optional[str]) -> Dict[str, pd.DataFrame]:
+        frames: Dict[str, pd.DataFrame] = {}
+        plain = [ws for ws in todo if "@" not in ws]
+        months: Dict[str, List[str]] = {}
+        for key in todo:
+            if "@" in key:
+                ws, month = key.split("@", 1)
+                months.setdefault(ws, []).append(month)
+
+        if plain:
+            try:
+                frames.update(self._fetch(plain))
+            except Exception as e:
+                logger.error(f"워크시트 {plain} 로드 실패: {e}")
+        for ws, ms in months.items():
+            try:
+                frames.update({page_key(ws, m): df for m, df in self._fetch_months(ws, ms).items()})
+            except Exception as e:
+                logger.error(f"워크시트 '{ws}' {ms} 구간 로드 실패: {e}")
+
+        fetched_at = time.time()
+        result: Dict[str, pd.DataFrame] = {}
+        for worksheet in todo:
+            df = frames.get(worksheet)
+            if df is None:
+                entry = self._entries.get(worksheet) or self._from_backup(worksheet)
+                result[worksheet] = entry.data if entry is not None else pd.DataFrame()
+                continue
+            df.attrs.update(
+                fetched_at=fetched_at, downloaded_at=fetched_at, source="sheets",
+                version=frames_version(df), revision=revision
+            )
+            save_snapshot(worksheet, df)
+            self._publish(worksheet, df)
+            result[worksheet] = self._store(worksheet, df).data
+        return result
+
+    def _publish(self, key: str, df: pd.DataFrame):
+        """받아 온 사본을 다른 레플리카와 공유"""
+        if self._shared is not None:
+            self._shared.put_frame(_shared_key(key), df, ttl=SHARED_SHEET_TTL, version=df.attrs.get("version", ""))
+
+    def _adopt(self, keys: List[str]) -> Dict[str, pd.DataFrame]:
+        """다른 레플리카가 TTL 이내에 받아 둔 사본 중 내 사본보다 새로운 것을 가져옴 (스냅샷도 갱신)"""
+        adopted: Dict[str, pd.DataFrame] = {}
+        now = time.time()
+        for key in keys:
+            df = self._shared.get_frame(_shared_key(key))
+            if df is None:
+                continue
+            fetched_at = df.attrs.get("fetched_at", 0.0)
+            current = self._entries.get(key)
+            if now - fetched_at > self._ttl or (current is not None and fetched_at <= current.fetched_at):
+                continue
+            if "version" not in df.attrs:
+                df.attrs["version"] = frames_version(df)
+            save_snapshot(key, df)
+            record_cache("sheet_store", key, "shared")
+            adopted[key] = self._store(key, df).data
+        return adopted
+
+    def _from_backup(self, key: str) -> Optional[SheetEntry]:
+        """Excel 백업으로 메모리 사본 생성 (스냅샷으로는 저장하지 않음)"""
+        if self._fallback is None:
+            return None
+        worksheet, _, month = key.partition("@")
+        try:
+            df = self._fallback(worksheet, month_span([month]) if month else None)
+        except Exception as e:
+            logger.warning(f"워크시트 '{key}' Excel 백업 로드 실패: {e}")
+            return None
+        if df is None:
+            return None
+        df.attrs["version"] = frames_version(df)
+        return self._store(key, df)
+
+    def _restore(self, worksheet: str) -> Optional[SheetEntry]:
+        """로컬 스냅샷에서 메모리 사본 복원"""
+        snapshot = load_snapshot(worksheet)
+        if snapshot is None:
+            return None
+        if "version" not in snapshot.attrs:
+            snapshot.attrs["version"] = frames_version(snapshot)
+        return self._store(worksheet, snapshot)
+
+    def _store(self, worksheet: str, df: pd.DataFrame) -> SheetEntry:
+        """공유 원본으로 고정하여 저장 (요청마다 얕은 사본만 반환)"""
+        df = freeze(df)
+        entry = SheetEntry(
+            data=df,
+            fetched_at=df.attrs["fetched_at"],
+            version=df.attrs["version"],
+            revision=df.attrs.get("revision"),
+            downloaded_at=df.attrs.get("downloaded_at", df.attrs["fetched_at"])
+        )
+        self._entries[worksheet] = entry
+        return entry
+
+class SheetPrefetcher:
+    """
+    만료 전에 워크시트를 미리 갱신하는 백그라운드 스케줄러
+
+    시작 즉시 한 번 갱신(워밍업)한 뒤 interval ± jitter 초마다 다시 갱신한다.
+    interval을 TTL보다 짧게 두면 사용자 요청이 원격 로드를 기다리지 않는다.
+    갱신은 조건부(SheetStore.revalidate)라 시트가 그대로면 수정 시각 조회 1회로 끝난다.
+    """
+
+    def __init__(
+        self,
+        store: SheetStore,
+        worksheets: List[str],
+        interval: float,
+        jitter: float = 0.0,
+        window: Optional[Tuple[int, int]] = None
+    ):
+        self._store = store
+        self._worksheets = list(worksheets)
+        self._window = window
+        self._interval = interval
+        self._jitter = jitter
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="sheet-prefetch", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        """스케줄러 종료 (진행 중인 로드가 끝날 때까지 최대 timeout초 대기)"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self):
+        while not self._stop.is_set():
+            date_range = None
+            if self._window is not None:
+                # 대시보드 기본 날짜와 같은 기준 (서버 시간대가 아닌 KST 11시 기준 게임 날짜)
+                today = game_day()
+                date_range = (today + timedelta(days=self._window[0]), today + timedelta(days=self._window[1]))
+            self._store.revalidate(self._worksheets, date_range=date_range)
+            delay = self._interval + random.uniform(-self._jitter, self._jitter)
+            self._stop.wait(max(1.0, delay))
+
+def _shared_key(key: str) -> str:
+    return f"sheet:{key}"
+
+def _fetch_worksheets(worksheets: List[str]) -> Dict[str, pd.DataFrame]:
+    return get_sheets_client().read(worksheets)
+
+def _fetch_months(worksheet: str, months: List[str]) -> Dict[str, pd.DataFrame]:
+    return get_sheets_client().read_months(worksheet, WINDOWED_SHEETS[worksheet], months)
+
+def _fetch_revision() -> str:
+    return get_sheets_client().revision()
+
+def _backup_frame(worksheet: str, date_range: Optional[DateRange]) -> Optional[pd.DataFrame]:
+    date_col = WINDOWED_SHEETS.get(worksheet) if date_range is not None else None
+    return read_backup(worksheet, date_col=date_col, date_range=date_range)
+
+@st.cache_resource
+def get_sheet_store() -> SheetStore:
+    """워크시트 캐시 객체 반환 (싱글톤, TTL 만료 전 사전 갱신 시작)"""
+    store = SheetStore(
+        _fetch_worksheets, ttl=SHEET_TTL, fetch_months=_fetch_months, windowed=WINDOWED_SHEETS,
+        revision=_fetch_revision, fallback=_backup_frame, shared=get_shared_cache()
+    )
+    if PREFETCH_INTERVAL > 0:
+        prefetcher = SheetPrefetcher(
+            store, PREFETCH_SHEETS, PREFETCH_INTERVAL, PREFETCH_JITTER, window=PREFETCH_WINDOW
+        )
+        prefetcher.start()
+        atexit.register(prefetcher.stop)
+    return store
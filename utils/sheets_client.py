@@ -0,0 +1,305 @@
+# utils/sheets_client.py
+import os
+import re
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+import streamlit as st
+import pandas as pd
+from pandas.io.parsers import TextParser
+from utils.flow_control import RateLimited, TokenBucket
+from utils.metrics import METRICS, frame_bytes, track_load
+
+# gspread/google-auth는 첫 요청 시 import (Sheets를 쓰지 않는 페이지의 시작 시간 단축)
+if TYPE_CHECKING:
+    import gspread
+    from google.oauth2 import service_account
+
+DEFAULT_SCOPES = [
+    "https://www.googleapis.com/auth/spreadsheets",
+    "https://www.googleapis.com/auth/drive",
+]
+
+# 만료 전 토큰 갱신 여유 시간
+TOKEN_REFRESH_MARGIN = timedelta(minutes=5)
+
+# Sheets API 할당량 (사용자당 분당 읽기/쓰기 요청 60회). 순간적으로 BURST개까지 몰아 보내고
+# 그 뒤로는 분당 한도 속도로 보내며, MAX_WAIT초 넘게 기다려야 하면 보내지 않고 RateLimited
+SHEETS_READS_PER_MINUTE = float(os.environ.get("PZTK_SHEETS_READS_PER_MINUTE", 60))
+SHEETS_WRITES_PER_MINUTE = float(os.environ.get("PZTK_SHEETS_WRITES_PER_MINUTE", 60))
+SHEETS_BURST = float(os.environ.get("PZTK_SHEETS_BURST", 10))
+SHEETS_MAX_WAIT = float(os.environ.get("PZTK_SHEETS_MAX_WAIT", 10))
+
+def values_to_frame(values: List[list], index: Optional[List[int]] = None) -> pd.DataFrame:
+    """
+    values API 결과(첫 행 헤더)를 DataFrame으로 변환 (GSheetsConnection.read와 같은 규칙)
+
+    index를 주면 데이터 행의 라벨로 사용 (부분 로드 시 시트 행 번호 - 2)
+    """
+    if not values:
+        return pd.DataFrame()
+    width = max(len(row) for row in values)
+    rows = [list(row) + [""] * (width - len(row)) for row in values]
+    df = TextParser(rows, header=0).read()
+    if index is not None:
+        df.index = index
+    df = df.dropna(how="all", axis=0)
+    unnamed = [c for c in df.columns if str(c).startswith("Unnamed:") and df[c].isna().all()]
+    # 행 라벨 + 2 = 시트 행 번호, sheet_cols = 각 컬럼의 시트 열 번호 (부분 저장용)
+    df.attrs["sheet_cols"] = [i + 1 for i, c in enumerate(df.columns) if c not in unnamed]
+    return df.drop(columns=unnamed)
+
+def cell_value(val):
+    """values API 업로드용 셀 값 (NaN → 빈칸, 날짜 → ISO 문자열, numpy → 파이썬 타입)"""
+    if val is None or (not isinstance(val, (list, tuple)) and pd.isna(val)):
+        return ""
+    if hasattr(val, "isoformat"):
+        return val.isoformat(sep=" ") if isinstance(val, datetime) else val.isoformat()
+    if hasattr(val, "item"):
+        return val.item()
+    return val
+
+def frame_to_values(df: pd.DataFrame) -> List[list]:
+    """DataFrame을 헤더 포함 2차원 리스트로 변환"""
+    return [[str(c) for c in df.columns]] + [
+        [cell_value(v) for v in row] for row in df.itertuples(index=False, name=None)
+    ]
+
+def _quote(worksheet: str) -> str:
+    return "'{}'".format(worksheet.replace("'", "''"))
+
+class SheetsClient:
+    """
+    Google Sheets 공용 클라이언트
+
+    - 서비스 계정 인증 세션 1개를 재사용하고 만료 전에 토큰을 미리 갱신
+    - Spreadsheet/Worksheet 핸들을 캐시하여 로드/저장마다 메타데이터 요청을 하지 않음
+    - 읽기는 values batchGet 한 번으로 여러 워크시트를 가져옴
+    - 요청마다 읽기/쓰기 토큰 버킷을 거쳐 할당량(429)에 걸리기 전에 속도를 맞춤
+      (reads/writes_per_minute가 0이면 제한 없음)
+    """
+
+    def __init__(
+        self,
+        config: dict,
+        reads_per_minute: float = SHEETS_READS_PER_MINUTE,
+        writes_per_minute: float = SHEETS_WRITES_PER_MINUTE,
+        burst: float = SHEETS_BURST,
+        max_wait: float = SHEETS_MAX_WAIT
+    ):
+        self._config = dict(config)
+        self._buckets = {
+            "read": TokenBucket(reads_per_minute / 60, burst, max_wait),
+            "write": TokenBucket(writes_per_minute / 60, burst, max_wait),
+        }
+        self._lock = threading.RLock()
+        self._creds: Optional["service_account.Credentials"] = None
+        self._client: Optional["gspread.Client"] = None
+        self._spreadsheet: Optional["gspread.Spreadsheet"] = None
+        self._worksheets: Dict[str, "gspread.Worksheet"] = {}
+        self._date_cols: Dict[str, int] = {}
+
+    @contextmanager
+    def _quota(self, kind: str, requests: int = 1):
+        """할당량 토큰을 받고 요청 (429 응답이면 버킷을 비워 이후 요청 속도를 낮춤)"""
+        try:
+            waited = self._buckets[kind].acquire(requests)
+        except RateLimited:
+            METRICS.inc("sheets_throttled_total", kind=kind, reason="local")
+            raise
+        if waited:
+            METRICS.observe("sheets_quota_wait_seconds", waited, kind=kind)
+        try:
+            yield
+        except Exception as e:
+            if getattr(getattr(e, "response", None), "status_code", None) == 429:
+                self._buckets[kind].drain()
+                METRICS.inc("sheets_throttled_total", kind=kind, reason="remote")
+            raise
+
+    def _ensure_token(self):
+        """토큰이 없거나 곧 만료되면 미리 갱신"""
+        from google.auth.transport.requests import Request
+        creds = self._creds
+        if creds.expiry is None or creds.expiry - datetime.utcnow() < TOKEN_REFRESH_MARGIN:
+            creds.refresh(Request())
+
+    def client(self) -> "gspread.Client":
+        with self._lock:
+            if self._client is None:
+                import gspread
+                from google.oauth2 import service_account
+                self._creds = service_account.Credentials.from_service_account_info(
+                    self._config,
+                    scopes=self._config.get("scopes", DEFAULT_SCOPES)
+                )
+                self._client = gspread.authorize(self._creds)
+            self._ensure_token()
+            return self._client
+
+    def spreadsheet(self) -> "gspread.Spreadsheet":
+        client = self.client()
+        with self._lock:
+            if self._spreadsheet is None:
+                self._spreadsheet = client.open_by_url(self._config["spreadsheet"])
+            return self._spreadsheet
+
+    def worksheet(self, name: str, create: bool = False) -> "gspread.Worksheet":
+        """워크시트 핸들 (첫 요청 시 전체 목록을 한 번에 조회하여 캐시)"""
+        import gspread
+        sh = self.spreadsheet()
+        with self._lock:
+            if name not in self._worksheets:
+                self._worksheets = {ws.title: ws for ws in sh.worksheets()}
+            if name not in self._worksheets:
+                if not create:
+                    raise gspread.WorksheetNotFound(name)
+                self._worksheets[name] = sh.add_worksheet(title=name, rows=1000, cols=20)
+            return self._worksheets[name]
+
+    def invalidate(self):
+        """핸들 캐시 초기화 (시트 구조 변경 후)"""
+        with self._lock:
+            self._spreadsheet = None
+            self._worksheets = {}
+
+    def revision(self) -> str:
+        """
+        스프레드시트 수정 시각 (Drive files.get의 modifiedTime)
+
+        값을 내려받지 않고 변경 여부만 확인하는 용도. 어느 워크시트든 수정되면 바뀐다.
+        """
+        with track_load("sheets_revision", "drive"):
+            return self.spreadsheet().get_lastUpdateTime()
+
+    def read(self, worksheets: List[str]) -> Dict[str, pd.DataFrame]:
+        """여러 워크시트를 values batchGet 요청 한 번으로 로드 (실패 시 예외)"""
+        with self._quota("read"), track_load("sheets", ",".join(worksheets)) as rec:
+            resp = self.spreadsheet().values_batch_get(
+                [_quote(name) for name in worksheets],
+                params={
+                    "valueRenderOption": "UNFORMATTED_VALUE",
+                    "dateTimeRenderOption": "FORMATTED_STRING",
+                }
+            )
+            values = [vr.get("values", []) for vr in resp.get("valueRanges", [])]
+            frames = {name: values_to_frame(v) for name, v in zip(worksheets, values)}
+            rec.update(rows=sum(len(df) for df in frames.values()), nbytes=sum(map(frame_bytes, values)))
+        return frames
+
+    def read_one(self, worksheet: str) -> pd.DataFrame:
+        return self.read([worksheet])[worksheet]
+
+    def read_ranges(self, worksheet: str, ranges: List[str]) -> List[List[list]]:
+        """워크시트의 여러 A1 범위를 요청 한 번으로 조회 (범위별 2차원 리스트)"""
+        with self._quota("read"), track_load("sheets_range", worksheet) as rec:
+            resp = self.spreadsheet().values_batch_get(
+                [f"{_quote(worksheet)}!{rng}" for rng in ranges],
+                params={
+                    "valueRenderOption": "UNFORMATTED_VALUE",
+                    "dateTimeRenderOption": "FORMATTED_STRING",
+                }
+            )
+            values = [vr.get("values", []) for vr in resp.get("valueRanges", [])]
+            rec.update(rows=sum(map(len, values)), nbytes=sum(map(frame_bytes, values)))
+        return values
+
+    def _date_column(self, worksheet: str, date_col: str) -> Tuple[list, List[list]]:
+        """헤더 행과 날짜 컬럼 값 (열 위치는 캐시, 헤더가 바뀌면 다시 찾음)"""
+        from gspread.utils import rowcol_to_a1
+        col = self._date_cols.get(worksheet, 1)
+        letter = re.sub(r"\d", "", rowcol_to_a1(1, col))
+        header, dates = self.read_ranges(worksheet, ["1:1", f"{letter}2:{letter}"])
+        header = header[0] if header else []
+        if col <= len(header) and header[col - 1] == date_col:
+            return header, dates
+
+        if date_col not in header:
+            raise KeyError(f"'{worksheet}' 시트에 '{date_col}' 컬럼이 없습니다")
+        self._date_cols[worksheet] = header.index(date_col) + 1
+        return self._date_column(worksheet, date_col)
+
+    def read_months(self, worksheet: str, date_col: str, months: List[str]) -> Dict[str, pd.DataFrame]:
+        """
+        날짜 컬럼 기준 월(YYYY-MM) 단위로 필요한 행만 로드
+
+        헤더+날짜 컬럼 조회 1회, 해당 월들의 행 구간 조회 1회로 끝난다.
+        반환 DataFrame의 행 라벨은 전체 로드와 같다 (시트 행 번호 - 2).
+        """
+        header, dates = self._date_column(worksheet, date_col)
+        parsed = pd.to_datetime(pd.Series([row[0] if row else "" for row in dates], dtype=object), errors="coerce")
+        month_of = parsed.dt.year * 100 + parsed.dt.month
+
+        rows_by_month = {m: [i + 2 for i in month_of.index[month_of == int(m.replace("-", ""))]] for m in months}
+        wanted = {m: rows for m, rows in rows_by_month.items() if rows}
+        ranges = [f"{min(rows)}:{max(rows)}" for rows in wanted.values()]
+        fetched = dict(zip(wanted, self.read_ranges(worksheet, ranges))) if ranges else {}
+
+        frames: Dict[str, pd.DataFrame] = {}
+        for month in months:
+            rows = wanted.get(month, [])
+            block = fetched.get(month, [])
+            first = min(rows) if rows else 0
+            picked = [block[r - first] if r - first < len(block) else [] for r in rows]
+            frames[month] = values_to_frame([header] + picked, index=[r - 2 for r in rows])
+        return frames
+
+    def update_ranges(self, worksheet: str, updates: List[Tuple[str, List[list]]]):
+        """여러 A1 범위를 values batchUpdate 요청 한 번으로 저장"""
+        with self._quota("write"):
+            self.spreadsheet().values_batch_update(body={
+                "valueInputOption": "USER_ENTERED",
+                "data": [
+                    {"range": f"{_quote(worksheet)}!{rng}", "values": values}
+                    for rng, values in updates
+                ],
+            })
+
+    def write(self, worksheet: str, df: pd.DataFrame):
+        """워크시트 전체를 DataFrame 내용으로 교체 (없으면 생성)"""
+        self.write_values(worksheet, frame_to_values(df))
+
+    def _grid_size(self, ws: "gspread.Worksheet") -> Tuple[int, int]:
+        """워크시트 격자 크기 (행, 열). 캐시된 핸들의 값은 이후 쓰기로 늘어났을 수 있어 다시 조회"""
+        with self._quota("read"):
+            meta = self.spreadsheet().fetch_sheet_metadata({"fields": "sheets.properties"})
+        for sheet in meta.get("sheets", []):
+            props = sheet.get("properties", {})
+            if props.get("sheetId") == ws.id:
+                grid = props.get("gridProperties", {})
+                return grid.get("rowCount", ws.row_count), grid.get("columnCount", ws.col_count)
+        return ws.row_count, ws.col_count
+
+    def write_values(self, worksheet: str, values: List[list]):
+        """
+        워크시트 전체를 values(첫 행 헤더)로 교체 (없으면 생성)
+
+        새 내용을 먼저 덮어쓴 뒤 그 범위 밖(아래 행/오른쪽 열)만 지운다.
+        전체를 지우고 다시 쓰면 그 사이 읽는 쪽에 빈 시트가 보이므로 clear()를 쓰지 않는다.
+        """
+        from gspread.utils import rowcol_to_a1
+        ws = self.worksheet(worksheet, create=True)
+        rows, cols = self._grid_size(ws)
+        height = len(values)
+        width = max((len(row) for row in values), default=0)
+        values = [list(row) + [""] * (width - len(row)) for row in values]
+
+        trailing = []
+        if rows > height and cols:
+            trailing.append(f"A{height + 1}:{rowcol_to_a1(rows, cols)}")
+        if cols > width and height:
+            trailing.append(f"{rowcol_to_a1(1, width + 1)}:{rowcol_to_a1(height, cols)}")
+        with self._quota("write", requests=bool(values) + bool(trailing)):
+            if values:
+                ws.update(range_name="A1", values=values, value_input_option="USER_ENTERED")
+            if trailing:
+                ws.batch_clear(trailing)
+
+METRICS.describe("sheets_quota_wait_seconds", "Time spent waiting for a Sheets API quota token")
+METRICS.describe("sheets_throttled_total", "Sheets requests refused locally or answered with HTTP 429")
+
+@st.cache_resource
+def get_sheets_client() -> SheetsClient:
+    """공용 Google Sheets 클라이언트 (프로세스당 1개)"""
+    return SheetsClient(dict(st.secrets["connections"]["gsheets"]))
@@ -0,0 +1,56 @@
+# utils/startup.py
+import importlib
+import logging
+import os
+import threading
+import time
+from types import ModuleType
+from typing import Dict
+from utils.metrics import METRICS
+
+logger = logging.getLogger(__name__)
+
+_IMPORTED_AT = time.perf_counter()
+_lock = threading.Lock()
+_first_render: Dict[str, float] = {}
+_served = False
+
+METRICS.describe("startup_import_seconds", "Cold import time of each page module")
+METRICS.describe("startup_first_render_seconds", "Duration of the first render of each page in this process")
+METRICS.describe("startup_time_to_first_render_seconds", "Process start to end of the first page served")
+
+def process_age() -> float:
+    """프로세스 시작 후 경과 시간 (리눅스는 /proc 기준, 그 외에는 이 모듈 import 시점 기준)"""
+    try:
+        with open("/proc/self/stat") as f:
+            start_ticks = int(f.read().rsplit(")", 1)[1].split()[19])
+        with open("/proc/uptime") as f:
+            uptime = float(f.read().split()[0])
+        return max(0.0, uptime - start_ticks / os.sysconf("SC_CLK_TCK"))
+    except (OSError, ValueError, IndexError, AttributeError):
+        return time.perf_counter() - _IMPORTED_AT
+
+def import_page(module: str) -> ModuleType:
+    """페이지 모듈 import (첫 import 시간 기록)"""
+    t0 = time.perf_counter()
+    page = importlib.import_module(module)
+    elapsed = time.perf_counter() - t0
+    if elapsed > 0.001:
+        METRICS.set("startup_import_seconds", elapsed, page=module)
+    return page
+
+def record_render(page: str, seconds: float):
+    """페이지별 첫 렌더링 시간, 프로세스의 첫 응답까지 걸린 시간 기록"""
+    global _served
+    with _lock:
+        if page in _first_render:
+            return
+        _first_render[page] = seconds
+        first_served = not _served
+        _served = True
+
+    METRICS.set("startup_first_render_seconds", seconds, page=page)
+    if first_served:
+        age = process_age()
+        METRICS.set("startup_time_to_first_render_seconds", age, page=page)
+        logger.info(f"첫 페이지 '{page}' 렌더링 완료: 프로세스 시작 후 {age:.2f}초 (렌더링 {seconds:.2f}초)")
@@ -0,0 +1,219 @@
+# utils/workbook_cache.py
+import glob
+import hashlib
+import logging
+import os
+import posixpath
+import re
+import threading
+import zipfile
+import xml.etree.ElementTree as ET
+from contextlib import nullcontext
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+import pandas as pd
+from utils.metrics import record_cache, track_load
+from utils.shared_frames import compact_frame
+
+if TYPE_CHECKING:
+    from utils.shared_cache import SharedCache
+
+logger = logging.getLogger(__name__)
+
+# 컴파일된 시트 아티팩트 저장 위치
+CACHE_DIR = "data/.cache/sheets"
+# 공유 캐시에 아티팩트를 보관하는 시간 (키가 원본 지문이라 내용이 바뀌면 새 키)
+SHARED_ARTIFACT_TTL = 7 * 24 * 3600
+
+_NS_MAIN = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+_NS_REL = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+_NS_PKG_REL = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+
+def find_latest_workbook(pattern: str) -> Optional[str]:
+    """패턴에 맞는 파일 중 가장 최신(파일명 날짜 기준) 워크북 경로"""
+    files = sorted(glob.glob(pattern))
+    return files[-1] if files else None
+
+def sheet_members(zf: zipfile.ZipFile) -> Dict[str, str]:
+    """시트명 → 시트 XML의 zip 멤버 경로 (워크북 순서)"""
+    workbook = ET.fromstring(zf.read("xl/workbook.xml"))
+    rels = ET.fromstring(zf.read("xl/_rels/workbook.xml.rels"))
+    targets = {r.get("Id"): r.get("Target") for r in rels.iter(f"{_NS_PKG_REL}Relationship")}
+
+    members: Dict[str, str] = {}
+    for sheet in workbook.iter(f"{_NS_MAIN}sheet"):
+        target = targets.get(sheet.get(f"{_NS_REL}id"), "")
+        member = target.lstrip("/") if target.startswith("/") else posixpath.normpath(f"xl/{target}")
+        if member in zf.NameToInfo:
+            members[sheet.get("name")] = member
+    return members
+
+# 시트 XML에서 셀이 참조하는 공유 문자열 번호 / 스타일 번호 (접두사가 붙은 네임스페이스도 허용)
+_SHARED_STRING_CELL = re.compile(rb'<(?:\w+:)?c\b[^>]*\bt="s"[^>]*>\s*<(?:\w+:)?v>(\d+)</(?:\w+:)?v>')
+_STYLED_CELL = re.compile(rb'<(?:\w+:)?c\b[^>]*\bs="(\d+)"')
+
+def _shared_strings(zf: zipfile.ZipFile) -> List[bytes]:
+    """공유 문자열 항목별 원문 XML (서식 있는 텍스트 포함)"""
+    if "xl/sharedStrings.xml" not in zf.NameToInfo:
+        return []
+    root = ET.fromstring(zf.read("xl/sharedStrings.xml"))
+    return [ET.tostring(si) for si in root.iter(f"{_NS_MAIN}si")]
+
+def _cell_formats(zf: zipfile.ZipFile) -> List[str]:
+    """셀 스타일 번호 → 숫자 서식 (날짜/숫자 해석에 영향을 주는 부분만)"""
+    if "xl/styles.xml" not in zf.NameToInfo:
+        return []
+    root = ET.fromstring(zf.read("xl/styles.xml"))
+    codes = {fmt.get("numFmtId"): fmt.get("formatCode", "") for fmt in root.iter(f"{_NS_MAIN}numFmt")}
+    xfs = root.find(f"{_NS_MAIN}cellXfs")
+    if xfs is None:
+        return []
+    return [f"{xf.get('numFmtId')}:{codes.get(xf.get('numFmtId'), '')}" for xf in xfs.iter(f"{_NS_MAIN}xf")]
+
+def sheet_fingerprints(path: str) -> Dict[str, str]:
+    """
+    시트별 원본 지문 (pandas로 파싱하지 않고 zip 멤버 CRC + 시트가 참조하는 항목만으로 계산)
+
+    시트 XML CRC에 더해 그 시트의 셀이 참조하는 공유 문자열과 숫자 서식만 포함하므로
+    다른 시트에서 문자열/서식을 추가·수정해도 이 시트의 지문은 바뀌지 않는다.
+    """
+    with zipfile.ZipFile(path) as zf:
+        strings = _shared_strings(zf)
+        formats = _cell_formats(zf)
+
+        fingerprints: Dict[str, str] = {}
+        for name, member in sheet_members(zf).items():
+            info = zf.NameToInfo[member]
+            xml = zf.read(member)
+            digest = hashlib.sha1(f"{info.CRC}:{info.file_size}".encode())
+            for i in sorted({int(m) for m in _SHARED_STRING_CELL.findall(xml)}):
+                digest.update(b"|s%d:" % i + (strings[i] if i < len(strings) else b""))
+            for i in sorted({int(m) for m in _STYLED_CELL.findall(xml)}):
+                digest.update(f"|f{i}:{formats[i] if i < len(formats) else ''}".encode())
+            fingerprints[name] = digest.hexdigest()
+        return fingerprints
+
+def _artifact_path(fingerprint: str, options: dict) -> str:
+    key = hashlib.sha1(f"{fingerprint}|{sorted(options.items())!r}".encode()).hexdigest()[:20]
+    return os.path.join(CACHE_DIR, f"{key}.pkl")
+
+def write_frame(path: str, df: pd.DataFrame):
+    """임시 파일에 쓴 뒤 교체 (동시 접근 시 깨진 파일 방지)"""
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        df.to_pickle(tmp)
+        os.replace(tmp, path)
+    except Exception as e:
+        logger.warning(f"프레임 파일 저장 실패 ({path}): {e}")
+
+def load_workbook_sheets(
+    path: str,
+    sheets: Dict[str, str],
+    options: Optional[Dict[str, dict]] = None,
+    compact: Optional[dict] = None,
+    shared: Optional["SharedCache"] = None
+) -> Tuple[Dict[str, pd.DataFrame], Dict[str, str]]:
+    """
+    워크북 시트 로드 (시트 내용 해시로 키잉된 아티팩트 우선)
+
+    - 아티팩트가 있는 시트는 pickle에서 바로 로드
+    - 로컬에 없으면 공유 캐시(shared)의 아티팩트 (다른 레플리카가 파싱한 결과)
+    - 원본이 바뀐(또는 처음 보는) 시트만 워크북을 한 번 열어 파싱 후 아티팩트 저장
+      (공유 캐시가 있으면 파싱은 레플리카 중 한 곳만 하고 결과를 올림)
+
+    Args:
+        path: .xlsx 경로
+        sheets: {키: 시트명}
+        options: {키: read_excel 옵션} (converters 등)
+        compact: 주면 compact_frame(**compact)를 적용한 결과를 아티팩트로 저장
+            (dtype 변환은 시트 버전당 한 번만)
+
+    Returns:
+        ({키: DataFrame}, {키: 오류 메시지})
+    """
+    with track_load("workbook", os.path.basename(path)) as rec:
+        frames, errors = _load_workbook_sheets(path, sheets, options or {}, compact, shared)
+        rec.update(rows=sum(len(df) for df in frames.values()), nbytes=os.path.getsize(path) if os.path.exists(path) else 0)
+    return frames, errors
+
+def _load_workbook_sheets(
+    path: str,
+    sheets: Dict[str, str],
+    options: Dict[str, dict],
+    compact: Optional[dict],
+    shared: Optional["SharedCache"] = None
+) -> Tuple[Dict[str, pd.DataFrame], Dict[str, str]]:
+    frames: Dict[str, pd.DataFrame] = {}
+    errors: Dict[str, str] = {}
+
+    try:
+        fingerprints = sheet_fingerprints(path)
+    except Exception as e:
+        logger.warning(f"워크북 지문 계산 실패 ({path}): {e}")
+        fingerprints = {}
+
+    stale: Dict[str, Optional[str]] = {}
+    for key, sheet in sheets.items():
+        fingerprint = fingerprints.get(sheet)
+        artifact = _artifact_path(fingerprint, {**options.get(key, {}), "compact": compact}) if fingerprint else None
+        if artifact and os.path.exists(artifact):
+            try:
+                frames[key] = pd.read_pickle(artifact)
+                record_cache("calc_artifact", key, "hit")
+                continue
+            except Exception as e:
+                logger.warning(f"시트 아티팩트 로드 실패 ({artifact}): {e}")
+        stale[key] = artifact
+        record_cache("calc_artifact", key, "miss")
+
+    if shared is not None:
+        _from_shared(shared, stale, frames)
+    if not stale:
+        return frames, errors
+
+    # 변경된 시트만 단일 파싱 (다른 레플리카가 파싱 중이면 기다렸다가 그 결과 사용)
+    lead = shared.leader("workbook:" + ",".join(sorted(filter(None, stale.values())))) if shared else nullcontext(True)
+    with lead as acquired:
+        if shared is not None:
+            # 잠금을 얻었든 대기 시간이 지났든 그동안 다른 레플리카가 올린 아티팩트를 먼저 확인
+            _from_shared(shared, stale, frames)
+            if not stale:
+                return frames, errors
+            if not acquired:
+                logger.info(f"공유 캐시 잠금 대기 시간 초과, 직접 파싱: {sorted(stale)}")
+        try:
+            xl = pd.ExcelFile(path)
+        except Exception as e:
+            return frames, {**errors, **{key: str(e) for key in stale}}
+
+        with xl:
+            for key, artifact in stale.items():
+                try:
+                    df = xl.parse(sheets[key], **options.get(key, {}))
+                except Exception as e:
+                    errors[key] = str(e)
+                    continue
+                if compact is not None:
+                    df = compact_frame(df, **compact)
+                frames[key] = df
+                if artifact:
+                    write_frame(artifact, df)
+                    if shared is not None:
+                        shared.put_frame(_shared_key(artifact), df, ttl=SHARED_ARTIFACT_TTL)
+    return frames, errors
+
+def _shared_key(artifact: str) -> str:
+    return f"artifact:{os.path.basename(artifact)}"
+
+def _from_shared(shared: "SharedCache", stale: Dict[str, Optional[str]], frames: Dict[str, pd.DataFrame]):
+    """공유 캐시에 있는 아티팩트를 로컬에도 저장하고 stale에서 제외"""
+    for key, artifact in list(stale.items()):
+        if not artifact:
+            continue
+        df = shared.get_frame(_shared_key(artifact))
+        if df is None:
+            continue
+        write_frame(artifact, df)
+        frames[key] = df
+        del stale[key]
+        record_cache("calc_artifact", key, "shared")
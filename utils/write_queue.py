@@ -0,0 +1,578 @@
+# utils/write_queue.py
+import atexit
+import json
+import logging
+import os
+import random
+import socket
+import threading
+import time
+import uuid
+from dataclasses import asdict, dataclass
+from typing import Callable, Dict, List, Optional
+import streamlit as st
+from utils.metrics import METRICS
+
+logger = logging.getLogger(__name__)
+
+# 대기 중인 저장 저널 위치 (저장 1건 = JSON 파일 1개, 반영되면 삭제)
+JOURNAL_DIR = "data/.cache/write_queue"
+# 처리 중인 저장은 JOURNAL_DIR/claimed/<프로세스>/로 옮겨 두어 다른 복제본이 가져가지 않게 함
+CLAIMED_DIR = "claimed"
+HEARTBEAT_FILE = ".heartbeat"
+# 프로세스 하트비트가 이 시간(초)보다 오래되면 죽은 것으로 보고 그 저장을 다른 프로세스가 이어받음
+CLAIM_TTL = float(os.environ.get("PZTK_WRITE_CLAIM_TTL", 300.0))
+HEARTBEAT_INTERVAL = CLAIM_TTL / 5
+
+# 같은 워크시트의 연속 저장을 batchUpdate 한 번으로 합치는 최대 건수
+MAX_BATCH = 20
+# 쓰기 요청 사이 최소 간격 (초, Sheets 쓰기 할당량 분당 60회 기준)
+WRITE_MIN_INTERVAL = float(os.environ.get("PZTK_WRITE_MIN_INTERVAL", 1.0))
+# 일시적 오류 재시도: 지연 = min(BACKOFF_MAX, BACKOFF_BASE × 2^(시도-1)) × 0.5~1.0
+BACKOFF_BASE = 2.0
+BACKOFF_MAX = 300.0
+MAX_ATTEMPTS = 8
+# 할당량 초과(429) 시 대기열 전체를 멈추는 최소 시간 (초)
+QUOTA_PAUSE = 30.0
+# 화면에 남겨 두는 최근 반영 건수
+RECENT_DONE = 10
+
+# 상태: pending(대기) → retrying(재시도 대기) → done(반영) | conflict(충돌) | failed(실패)
+ACTIVE = ("pending", "retrying")
+
+@dataclass
+class WriteJob:
+    """저장 1건 (plan은 SavePlan.to_dict())"""
+    id: str
+    worksheet: str
+    plan: dict
+    created_at: float
+    status: str = "pending"
+    attempts: int = 0
+    next_try: float = 0.0
+    last_error: str = ""
+    done_at: float = 0.0
+
+    @property
+    def full(self) -> bool:
+        return self.plan.get("full") is not None
+
+def _status_code(e: Exception) -> Optional[int]:
+    response = getattr(e, "response", None)
+    return getattr(response, "status_code", None)
+
+def _retry_after(e: Exception) -> float:
+    headers = getattr(getattr(e, "response", None), "headers", None) or {}
+    try:
+        return float(headers.get("Retry-After", 0))
+    except (TypeError, ValueError):
+        return 0.0
+
+def _owner_id() -> str:
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except (PermissionError, OSError):
+        return True
+    return True
+
+def _journal_files(path: str) -> List[str]:
+    try:
+        return sorted(name for name in os.listdir(path) if name.endswith(".json"))
+    except FileNotFoundError:
+        return []
+
+def backoff_delay(attempts: int) -> float:
+    """attempts번째 실패 후 재시도까지 대기 시간 (지수 증가 + 지터)"""
+    return min(BACKOFF_MAX, BACKOFF_BASE * 2 ** (attempts - 1)) * random.uniform(0.5, 1.0)
+
+class WriteQueue:
+    """
+    R4 저장용 write-behind 대기열 (프로세스당 1개)
+
+    - submit()은 저널 파일을 쓰고 바로 반환 (원격 요청 없음)
+    - 백그라운드 스레드가 워크시트별로 순서대로, 연속 저장은 합쳐서 반영
+    - 일시적 오류/할당량 초과는 지수 백오프로 재시도, 충돌/영구 오류는 멈추고 화면에 표시
+      (그 워크시트의 뒤 저장은 관리자가 다시 시도/취소할 때까지 보류)
+    - 재시작하면 저널에 남은 저장을 이어서 반영
+    - 저장은 처리할 프로세스가 먼저 가져가고(claimed/<프로세스>/로 이동), 다른 복제본은
+      주인이 없거나 주인의 하트비트가 끊긴 저장만 이어받음
+
+    push(worksheet, plans)는 저장 계획 목록을 순서대로 반영하는 함수로,
+    충돌 시 SheetConflictError를 던진다 (저장 계획은 utils.sheet_diff.SavePlan).
+    on_result(job)은 반영/실패가 확정된 저장마다 호출된다.
+    """
+
+    def __init__(
+        self,
+        push: Callable[[str, List[dict]], None],
+        journal_dir: str = JOURNAL_DIR,
+        on_result: Optional[Callable[[WriteJob], None]] = None,
+        min_interval: float = WRITE_MIN_INTERVAL,
+        owner: Optional[str] = None,
+        claim_ttl: float = CLAIM_TTL
+    ):
+        self._push = push
+        self._dir = journal_dir
+        self._owner = owner or _owner_id()
+        self._claimed = os.path.join(journal_dir, CLAIMED_DIR, self._owner)
+        self._claim_ttl = claim_ttl
+        self._last_beat = 0.0
+        self._on_result = on_result
+        self._min_interval = min_interval
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._jobs: Dict[str, WriteJob] = {}
+        self._done: List[WriteJob] = []
+        self._paused_until = 0.0
+        self._last_push = 0.0
+        self._replay()
+
+    # ---- 저널 ----
+
+    def _path(self, job_id: str) -> str:
+        return os.path.join(self._claimed, f"{job_id}.json")
+
+    def _save(self, job: WriteJob):
+        os.makedirs(self._claimed, exist_ok=True)
+        path = self._path(job.id)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(asdict(job), f, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+
+    def _remove(self, job_id: str):
+        try:
+            os.remove(self._path(job_id))
+        except FileNotFoundError:
+            pass
+
+    def _owns(self, job_id: str) -> bool:
+        """저장이 아직 이 프로세스 몫인지 (하트비트가 끊긴 사이 다른 복제본이 이어받았으면 False)"""
+        return os.path.exists(self._path(job_id))
+
+    def _heartbeat(self):
+        os.makedirs(self._claimed, exist_ok=True)
+        with open(os.path.join(self._claimed, HEARTBEAT_FILE), "w", encoding="utf-8") as f:
+            f.write(f"{time.time():.0f}")
+        self._last_beat = time.time()
+
+    def _expired(self, owner: str) -> bool:
+        """다른 프로세스가 죽었는지 (같은 호스트면 PID로, 아니면 하트비트 시각으로 판단)"""
+        host, _, pid = owner.rpartition("-")
+        if host == socket.gethostname() and pid.isdigit() and not _pid_alive(int(pid)):
+            return True
+        path = os.path.join(self._dir, CLAIMED_DIR, owner)
+        try:
+            beat = os.path.getmtime(os.path.join(path, HEARTBEAT_FILE))
+        except FileNotFoundError:
+            try:
+                beat = os.path.getmtime(path)
+            except FileNotFoundError:
+                return False
+        return time.time() - beat > self._claim_ttl
+
+    def _release_expired(self):
+        """죽은 프로세스가 가져간 저장을 주인 없는 상태(JOURNAL_DIR)로 되돌림"""
+        root = os.path.join(self._dir, CLAIMED_DIR)
+        try:
+            owners = os.listdir(root)
+        except FileNotFoundError:
+            return
+        for owner in owners:
+            if owner == self._owner or not self._expired(owner):
+                continue
+            path = os.path.join(root, owner)
+            released = 0
+            for name in _journal_files(path):
+                try:
+                    os.rename(os.path.join(path, name), os.path.join(self._dir, name))
+                    released += 1
+                except FileNotFoundError:
+                    pass  # 다른 프로세스가 먼저 되돌림
+            if released:
+                logger.warning(f"응답 없는 프로세스 '{owner}'의 저장 {released}건을 이어받음")
+            for name in os.listdir(path) if os.path.isdir(path) else []:
+                if not name.endswith(".json"):
+                    try:
+                        os.remove(os.path.join(path, name))
+                    except OSError:
+                        pass
+            try:
+                os.rmdir(path)
+            except OSError:
+                pass
+
+    def _claim(self) -> List[str]:
+        """주인 없는 저장을 이 프로세스 몫으로 옮김 (rename은 원자적이라 한 프로세스만 성공)"""
+        claimed = []
+        for name in _journal_files(self._dir):
+            try:
+                os.rename(os.path.join(self._dir, name), os.path.join(self._claimed, name))
+                claimed.append(name)
+            except FileNotFoundError:
+                pass  # 다른 프로세스가 먼저 가져감
+        return claimed
+
+    def _load(self, names: List[str]) -> int:
+        loaded = 0
+        for name in names:
+            try:
+                with open(os.path.join(self._claimed, name), encoding="utf-8") as f:
+                    job = WriteJob(**json.load(f))
+            except Exception as e:
+                logger.warning(f"저장 대기열 저널 '{name}' 복원 실패: {e}")
+                continue
+            if job.status in ACTIVE:
+                job.next_try = 0.0
+            with self._lock:
+                if job.id in self._jobs:
+                    continue
+                self._jobs[job.id] = job
+            loaded += 1
+        return loaded
+
+    def _replay(self):
+        """
+        저널에 남은 저장 복원
+
+        이전 실행(같은 호스트·PID)이 가져간 저장, 주인 없는 저장, 주인 프로세스가 죽은 저장만
+        가져온다 (살아 있는 다른 복제본이 처리 중인 저장은 건드리지 않음). 처리 중 종료된 저장은 대기 상태로.
+        """
+        self._heartbeat()
+        self._release_expired()
+        claimed = self._claim()
+        loaded = self._load(_journal_files(self._claimed))
+        if loaded:
+            logger.info(f"저장 대기열 복원: {loaded}건 (주인 없는 저장 {len(claimed)}건 포함)")
+        self._update_gauges()
+
+    def _adopt(self):
+        """작업 스레드에서 주기적으로: 하트비트 갱신 + 죽은 프로세스/주인 없는 저장 이어받기"""
+        self._heartbeat()
+        self._release_expired()
+        loaded = self._load(self._claim())
+        if loaded:
+            logger.info(f"저장 대기열: 주인 없는 저장 {loaded}건 이어받음")
+            self._update_gauges()
+
+    # ---- 공개 API ----
+
+    def submit(self, worksheet: str, plan: dict) -> WriteJob:
+        """저장 접수 (저널 기록 후 즉시 반환)"""
+        job = WriteJob(
+            id=f"{time.time_ns():020d}-{uuid.uuid4().hex[:6]}",
+            worksheet=worksheet,
+            plan=plan,
+            created_at=time.time()
+        )
+        self._save(job)
+        with self._lock:
+            self._jobs[job.id] = job
+        METRICS.inc("write_jobs_total", worksheet=worksheet, result="submitted")
+        self._update_gauges()
+        self._wake.set()
+        return job
+
+    def jobs(self) -> List[WriteJob]:
+        """대기/재시도/충돌/실패 중인 저장 (접수 순)"""
+        with self._lock:
+            return sorted(self._jobs.values(), key=lambda j: j.id)
+
+    def recent(self) -> List[WriteJob]:
+        """최근 반영된 저장 (최신 순)"""
+        with self._lock:
+            return list(reversed(self._done))
+
+    def pending(self, worksheet: Optional[str] = None) -> int:
+        """아직 반영되지 않은 저장 수"""
+        with self._lock:
+            return sum(
+                1 for j in self._jobs.values()
+                if j.status in ACTIVE and (worksheet is None or j.worksheet == worksheet)
+            )
+
+    def retry(self, job_id: str):
+        """충돌/실패한 저장을 다시 대기 상태로"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None and not self._owns(job_id):
+                del self._jobs[job_id]  # 다른 프로세스가 이어받은 저장
+                job = None
+            if job is not None:
+                job.status, job.attempts, job.next_try, job.last_error = "pending", 0, 0.0, ""
+        if job is None:
+            self._update_gauges()
+            return
+        self._save(job)
+        self._update_gauges()
+        self._wake.set()
+
+    def discard(self, job_id: str):
+        """저장 취소 (저널에서 삭제)"""
+        with self._lock:
+            job = self._jobs.pop(job_id, None)
+        self._remove(job_id)
+        if job is not None:
+            METRICS.inc("write_jobs_total", worksheet=job.worksheet, result="discarded")
+            if job.status in ACTIVE and self._on_result is not None:
+                job.status = "discarded"
+                self._on_result(job)
+        self._update_gauges()
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="sheet-write-queue", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        """작업 스레드 종료 (진행 중인 쓰기가 끝날 때까지 최대 timeout초 대기, 남은 저장은 저널에 유지)"""
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def flush(self, timeout: float = 30.0) -> bool:
+        """지금 반영할 수 있는 저장이 모두 처리될 때까지 대기 (재시도 대기 중인 저장이 남으면 False, 보류 중인 저장은 제외)"""
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            held = set(self.blocked())
+            with self._lock:
+                waiting = [j for j in self._jobs.values() if j.status in ACTIVE and j.id not in held]
+            if not waiting:
+                return True
+            if all(j.status == "retrying" for j in waiting):
+                return False
+            self._wake.set()
+            time.sleep(0.05)
+        return False
+
+    # ---- 작업 스레드 ----
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.clear()
+            if time.time() - self._last_beat >= HEARTBEAT_INTERVAL:
+                try:
+                    self._adopt()
+                except OSError as e:
+                    logger.warning(f"저장 대기열 저널 확인 실패: {e}")
+            delay = self.process()
+            if delay is None:
+                delay = 60.0
+            delay = min(delay, max(0.0, self._last_beat + HEARTBEAT_INTERVAL - time.time()))
+            if delay > 0:
+                self._wake.wait(delay)
+
+    def _queues(self) -> Dict[str, List[WriteJob]]:
+        """워크시트별 미반영 저장 (접수 순, 충돌/실패 포함)"""
+        queues: Dict[str, List[WriteJob]] = {}
+        for job in sorted(self._jobs.values(), key=lambda j: j.id):
+            queues.setdefault(job.worksheet, []).append(job)
+        return queues
+
+    def _next_batch(self, now: float):
+        """
+        반영할 다음 묶음과, 없으면 다음 재시도까지 남은 시간
+
+        워크시트마다 가장 오래된 미반영 저장(head)만 후보이며, head가 재시도 대기 중이면
+        그 워크시트의 뒤 저장도 기다린다 (순서 보장). 전체 저장은 합치지 않는다.
+        head가 충돌/실패로 멈춰 있으면 뒤 저장은 그 저장이 반영된 상태를 전제로 만든 것이므로
+        관리자가 다시 시도하거나 취소할 때까지 그 워크시트 전체를 보류한다.
+        """
+        wait = None
+        for ws, queue in self._queues().items():
+            head = queue[0]
+            if head.status not in ACTIVE:
+                continue
+            if head.next_try > now:
+                left = head.next_try - now
+                wait = left if wait is None else min(wait, left)
+                continue
+            if head.full:
+                return [head], None
+            batch = [head]
+            for job in queue[1:MAX_BATCH]:
+                if job.full or job.status not in ACTIVE:
+                    break
+                batch.append(job)
+            return batch, None
+        return None, wait
+
+    def blocked(self) -> List[str]:
+        """앞 저장이 충돌/실패해 보류 중인 저장 id"""
+        with self._lock:
+            queues = self._queues()
+        held: List[str] = []
+        for queue in queues.values():
+            stuck = False
+            for job in queue:
+                if job.status not in ACTIVE:
+                    stuck = True
+                elif stuck:
+                    held.append(job.id)
+        return held
+
+    def process(self) -> Optional[float]:
+        """
+        묶음 하나를 반영 (작업 스레드가 반복 호출)
+
+        Returns:
+            바로 다시 호출해도 되면 0, 기다려야 하면 대기 초, 할 일이 없으면 None
+        """
+        now = time.time()
+        if now < self._paused_until:
+            return self._paused_until - now
+        if now - self._last_push < self._min_interval:
+            return self._min_interval - (now - self._last_push)
+        with self._lock:
+            batch, wait = self._next_batch(now)
+        if batch is None:
+            return wait
+        lost = [job for job in batch if not self._owns(job.id)]
+        if lost:
+            # 하트비트가 끊긴 사이 다른 복제본이 이어받은 저장은 그쪽에서 반영
+            with self._lock:
+                for job in lost:
+                    self._jobs.pop(job.id, None)
+            logger.warning(f"워크시트 '{batch[0].worksheet}' 저장 {len(lost)}건을 다른 프로세스가 이어받음")
+            self._update_gauges()
+            return 0.0
+
+        from utils.sheet_diff import SheetConflictError
+
+        worksheet = batch[0].worksheet
+        self._last_push = time.time()
+        try:
+            with METRICS.timer("write_push_seconds", worksheet=worksheet):
+                self._push(worksheet, [job.plan for job in batch])
+        except SheetConflictError as e:
+            if len(batch) > 1:
+                # 어느 저장이 충돌인지 가리도록 한 건씩 다시 반영
+                self._push_each(batch)
+                return 0.0
+            self._finish(batch[0], "conflict", str(e))
+            return 0.0
+        except Exception as e:
+            self._fail(batch, e)
+            return 0.0
+        for job in batch:
+            self._finish(job, "done")
+        logger.info(f"워크시트 '{worksheet}' 저장 {len(batch)}건 반영")
+        return 0.0
+
+    def _push_each(self, batch: List[WriteJob]):
+        from utils.sheet_diff import SheetConflictError
+
+        for job in batch:
+            try:
+                self._push(job.worksheet, [job.plan])
+            except SheetConflictError as e:
+                # 뒤 저장은 이 저장이 반영된 상태를 전제로 하므로 보류 (_next_batch 참고)
+                self._finish(job, "conflict", str(e))
+                return
+            except Exception as e:
+                self._fail([job], e)
+                return
+            self._finish(job, "done")
+
+    def _fail(self, batch: List[WriteJob], e: Exception):
+        """오류 처리: 할당량 초과/일시적 오류는 재시도 예약, 그 밖의 4xx는 실패로 확정"""
+        code = _status_code(e)
+        retryable = code is None or code == 429 or code >= 500
+        now = time.time()
+        if code == 429:
+            pause = max(QUOTA_PAUSE, _retry_after(e), backoff_delay(batch[0].attempts + 1))
+            self._paused_until = now + pause
+            METRICS.inc("write_quota_pauses_total")
+            logger.warning(f"Google Sheets 쓰기 할당량 초과, {pause:.0f}초 대기")
+        for job in batch:
+            job.attempts += 1
+            job.last_error = f"{type(e).__name__}: {e}"
+            if not retryable or job.attempts >= MAX_ATTEMPTS:
+                self._finish(job, "failed", job.last_error)
+                continue
+            job.status = "retrying"
+            job.next_try = max(now + backoff_delay(job.attempts), self._paused_until)
+            self._save(job)
+            METRICS.inc("write_jobs_total", worksheet=job.worksheet, result="retry")
+        if retryable:
+            logger.warning(f"워크시트 '{batch[0].worksheet}' 저장 실패 ({len(batch)}건, 코드 {code}), 재시도 예정: {e}")
+        self._update_gauges()
+
+    def _finish(self, job: WriteJob, status: str, error: str = ""):
+        job.status, job.last_error = status, error or job.last_error
+        if status == "done":
+            job.done_at = time.time()
+            with self._lock:
+                self._jobs.pop(job.id, None)
+                self._done = (self._done + [job])[-RECENT_DONE:]
+            self._remove(job.id)
+            METRICS.observe("write_lag_seconds", job.done_at - job.created_at, worksheet=job.worksheet)
+        else:
+            self._save(job)
+            logger.error(f"워크시트 '{job.worksheet}' 저장 {job.id} 중단 ({status}): {error}")
+        METRICS.inc("write_jobs_total", worksheet=job.worksheet, result=status)
+        self._update_gauges()
+        if self._on_result is not None:
+            try:
+                self._on_result(job)
+            except Exception as e:
+                logger.warning(f"저장 결과 처리 실패: {e}")
+
+    def _update_gauges(self):
+        with self._lock:
+            counts: Dict[str, int] = {s: 0 for s in ACTIVE + ("conflict", "failed")}
+            for job in self._jobs.values():
+                counts[job.status] = counts.get(job.status, 0) + 1
+        for status, n in counts.items():
+            METRICS.set("write_queue_jobs", n, status=status)
+
+METRICS.describe("write_jobs_total", "Write-behind jobs by result")
+METRICS.describe("write_queue_jobs", "Write-behind jobs currently queued, by status")
+METRICS.describe("write_push_seconds", "Time spent pushing a batch of queued writes")
+METRICS.describe("write_lag_seconds", "Delay between accepting a save and applying it")
+METRICS.describe("write_quota_pauses_total", "Times the write queue paused on quota errors")
+
+def push_plans(worksheet: str, plans: List[dict]):
+    """저장 계획들을 충돌 검사 후 한 번에 반영 (전체 저장은 단독으로만 들어옴)"""
+    from utils.sheet_diff import SavePlan, apply_plan, merge_plans
+    from utils.sheets_client import get_sheets_client
+
+    loaded = [SavePlan.from_dict(p) for p in plans]
+    plan = loaded[0] if len(loaded) == 1 else merge_plans(loaded)
+    apply_plan(get_sheets_client(), worksheet, plan)
+
+def _on_result(queue: WriteQueue, job: WriteJob):
+    """
+    반영 결과를 대시보드 캐시에 반영
+
+    편집 화면의 낙관적 사본은 세션에만 두고, 캐시(메모리/스냅샷/공유 캐시)에는 시트 반영이
+    확정된 뒤 실제 시트 내용을 받아 게시한다. 충돌/실패/취소는 반영되지 않은 내용이
+    남지 않도록 사본을 완전히 버린다.
+    """
+    from utils.sheet_store import get_sheet_store
+    store = get_sheet_store()
+    if job.status != "done":
+        store.evict(job.worksheet)
+    elif queue.pending(job.worksheet) == 0:
+        # 같은 워크시트의 뒤 저장이 남아 있으면 마지막 저장이 반영될 때 한 번만 다시 받음
+        store.reload(job.worksheet)
+
+@st.cache_resource
+def get_write_queue() -> WriteQueue:
+    """R4 저장 대기열 (싱글톤, 저널 복원 후 작업 스레드 시작)"""
+    queue = WriteQueue(push_plans, on_result=lambda job: _on_result(queue, job))
+    queue.start()
+    atexit.register(queue.stop)
+    return queue